@@ -0,0 +1,26 @@
+"""query keyset index
+
+Revision ID: 3c1f0d7a9b52
+Revises: 8782f28b170b
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1f0d7a9b52'
+down_revision = '8782f28b170b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_query_created_at_guid', 'query', [sa.text('created_at DESC'), sa.text('guid DESC')], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_query_created_at_guid', table_name='query')
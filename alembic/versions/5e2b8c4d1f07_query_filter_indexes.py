@@ -0,0 +1,35 @@
+"""query filter indexes
+
+Revision ID: 5e2b8c4d1f07
+Revises: 3c1f0d7a9b52
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2b8c4d1f07'
+down_revision = '3c1f0d7a9b52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_sub_query_query_guid'), 'sub_query', ['query_guid'], unique=False)
+    op.create_index(
+        'ix_apartment_input_apartments_guid_segment', 'apartment', ['input_apartments_guid', 'segment'], unique=False
+    )
+    op.create_index(
+        'ix_apartment_input_apartments_guid_walls', 'apartment', ['input_apartments_guid', 'walls'], unique=False
+    )
+    op.create_index(
+        'ix_apartment_input_apartments_guid_floors', 'apartment', ['input_apartments_guid', 'floors'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_apartment_input_apartments_guid_floors', table_name='apartment')
+    op.drop_index('ix_apartment_input_apartments_guid_walls', table_name='apartment')
+    op.drop_index('ix_apartment_input_apartments_guid_segment', table_name='apartment')
+    op.drop_index(op.f('ix_sub_query_query_guid'), table_name='sub_query')
@@ -0,0 +1,51 @@
+"""foreign key indexes
+
+Revision ID: 9a4d6e2c7b18
+Revises: 5e2b8c4d1f07
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4d6e2c7b18'
+down_revision = '5e2b8c4d1f07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_query_guid', table_name='query')
+    op.drop_index('ix_user_guid', table_name='user')
+    op.drop_index('ix_sub_query_guid', table_name='sub_query')
+    op.drop_index('ix_apartment_guid', table_name='apartment')
+    op.drop_index('ix_adjustment_guid', table_name='adjustment')
+    op.create_index(op.f('ix_apartment_standart_object_guid'), 'apartment', ['standart_object_guid'], unique=False)
+    op.create_index(op.f('ix_apartment_analogs_guid'), 'apartment', ['analogs_guid'], unique=False)
+    op.create_index(op.f('ix_apartment_selected_analogs_guid'), 'apartment', ['selected_analogs_guid'], unique=False)
+    op.create_index(op.f('ix_apartment_output_apartments_guid'), 'apartment', ['output_apartments_guid'], unique=False)
+    op.create_index(op.f('ix_adjustment_apartment_guid'), 'adjustment', ['apartment_guid'], unique=False)
+    op.create_index(
+        op.f('ix_adjustment_analog_calculated_guid'), 'adjustment', ['analog_calculated_guid'], unique=False
+    )
+    op.create_index(op.f('ix_adjustment_analog_user_guid'), 'adjustment', ['analog_user_guid'], unique=False)
+    op.create_index(op.f('ix_adjustment_pool_calculated_guid'), 'adjustment', ['pool_calculated_guid'], unique=False)
+    op.create_index(op.f('ix_adjustment_pool_user_guid'), 'adjustment', ['pool_user_guid'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_adjustment_pool_user_guid'), table_name='adjustment')
+    op.drop_index(op.f('ix_adjustment_pool_calculated_guid'), table_name='adjustment')
+    op.drop_index(op.f('ix_adjustment_analog_user_guid'), table_name='adjustment')
+    op.drop_index(op.f('ix_adjustment_analog_calculated_guid'), table_name='adjustment')
+    op.drop_index(op.f('ix_adjustment_apartment_guid'), table_name='adjustment')
+    op.drop_index(op.f('ix_apartment_output_apartments_guid'), table_name='apartment')
+    op.drop_index(op.f('ix_apartment_selected_analogs_guid'), table_name='apartment')
+    op.drop_index(op.f('ix_apartment_analogs_guid'), table_name='apartment')
+    op.drop_index(op.f('ix_apartment_standart_object_guid'), table_name='apartment')
+    op.create_index('ix_adjustment_guid', 'adjustment', ['guid'], unique=True)
+    op.create_index('ix_apartment_guid', 'apartment', ['guid'], unique=True)
+    op.create_index('ix_sub_query_guid', 'sub_query', ['guid'], unique=True)
+    op.create_index('ix_user_guid', 'user', ['guid'], unique=True)
+    op.create_index('ix_query_guid', 'query', ['guid'], unique=True)
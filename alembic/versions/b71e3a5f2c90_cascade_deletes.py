@@ -0,0 +1,41 @@
+"""cascade deletes
+
+Revision ID: b71e3a5f2c90
+Revises: 9a4d6e2c7b18
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b71e3a5f2c90'
+down_revision = '9a4d6e2c7b18'
+branch_labels = None
+depends_on = None
+
+foreign_keys = [
+    ('sub_query', 'query_guid', 'query'),
+    ('apartment', 'input_apartments_guid', 'sub_query'),
+    ('apartment', 'standart_object_guid', 'sub_query'),
+    ('apartment', 'analogs_guid', 'sub_query'),
+    ('apartment', 'selected_analogs_guid', 'sub_query'),
+    ('apartment', 'output_apartments_guid', 'sub_query'),
+    ('adjustment', 'apartment_guid', 'apartment'),
+    ('adjustment', 'analog_calculated_guid', 'sub_query'),
+    ('adjustment', 'analog_user_guid', 'sub_query'),
+    ('adjustment', 'pool_calculated_guid', 'sub_query'),
+    ('adjustment', 'pool_user_guid', 'sub_query'),
+]
+
+
+def upgrade() -> None:
+    for table, column, referent in foreign_keys:
+        op.drop_constraint(f'{table}_{column}_fkey', table, type_='foreignkey')
+        op.create_foreign_key(f'{table}_{column}_fkey', table, referent, [column], ['guid'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    for table, column, referent in foreign_keys:
+        op.drop_constraint(f'{table}_{column}_fkey', table, type_='foreignkey')
+        op.create_foreign_key(f'{table}_{column}_fkey', table, referent, [column], ['guid'])
@@ -0,0 +1,111 @@
+"""apartment role sort indexes
+
+Revision ID: c5e8b2d7f413
+Revises: a9c4e7f1b203
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e8b2d7f413'
+down_revision = 'a9c4e7f1b203'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_apartment_analogs_guid_price',
+        'apartment',
+        ['analogs_guid', 'price', 'guid'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_apartment_analogs_guid_m2price',
+        'apartment',
+        ['analogs_guid', 'm2price', 'guid'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_apartment_analogs_guid_apartment_area',
+        'apartment',
+        ['analogs_guid', 'apartment_area', 'guid'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_apartment_analogs_guid_distance_to_metro',
+        'apartment',
+        ['analogs_guid', 'distance_to_metro', 'guid'],
+        unique=False,
+    )
+    op.drop_index('ix_apartment_analogs_guid', table_name='apartment')
+    op.create_index(
+        'ix_apartment_selected_analogs_guid_price',
+        'apartment',
+        ['selected_analogs_guid', 'price', 'guid'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_apartment_selected_analogs_guid_m2price',
+        'apartment',
+        ['selected_analogs_guid', 'm2price', 'guid'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_apartment_selected_analogs_guid_apartment_area',
+        'apartment',
+        ['selected_analogs_guid', 'apartment_area', 'guid'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_apartment_selected_analogs_guid_distance_to_metro',
+        'apartment',
+        ['selected_analogs_guid', 'distance_to_metro', 'guid'],
+        unique=False,
+    )
+    op.drop_index('ix_apartment_selected_analogs_guid', table_name='apartment')
+    op.create_index(
+        'ix_apartment_output_apartments_guid_price',
+        'apartment',
+        ['output_apartments_guid', 'price', 'guid'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_apartment_output_apartments_guid_m2price',
+        'apartment',
+        ['output_apartments_guid', 'm2price', 'guid'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_apartment_output_apartments_guid_apartment_area',
+        'apartment',
+        ['output_apartments_guid', 'apartment_area', 'guid'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_apartment_output_apartments_guid_distance_to_metro',
+        'apartment',
+        ['output_apartments_guid', 'distance_to_metro', 'guid'],
+        unique=False,
+    )
+    op.drop_index('ix_apartment_output_apartments_guid', table_name='apartment')
+
+
+def downgrade() -> None:
+    op.create_index('ix_apartment_output_apartments_guid', 'apartment', ['output_apartments_guid'], unique=False)
+    op.drop_index('ix_apartment_output_apartments_guid_distance_to_metro', table_name='apartment')
+    op.drop_index('ix_apartment_output_apartments_guid_apartment_area', table_name='apartment')
+    op.drop_index('ix_apartment_output_apartments_guid_m2price', table_name='apartment')
+    op.drop_index('ix_apartment_output_apartments_guid_price', table_name='apartment')
+    op.create_index('ix_apartment_selected_analogs_guid', 'apartment', ['selected_analogs_guid'], unique=False)
+    op.drop_index('ix_apartment_selected_analogs_guid_distance_to_metro', table_name='apartment')
+    op.drop_index('ix_apartment_selected_analogs_guid_apartment_area', table_name='apartment')
+    op.drop_index('ix_apartment_selected_analogs_guid_m2price', table_name='apartment')
+    op.drop_index('ix_apartment_selected_analogs_guid_price', table_name='apartment')
+    op.create_index('ix_apartment_analogs_guid', 'apartment', ['analogs_guid'], unique=False)
+    op.drop_index('ix_apartment_analogs_guid_distance_to_metro', table_name='apartment')
+    op.drop_index('ix_apartment_analogs_guid_apartment_area', table_name='apartment')
+    op.drop_index('ix_apartment_analogs_guid_m2price', table_name='apartment')
+    op.drop_index('ix_apartment_analogs_guid_price', table_name='apartment')
@@ -0,0 +1,49 @@
+"""apartment sort indexes
+
+Revision ID: d4f8a1c6e359
+Revises: b71e3a5f2c90
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f8a1c6e359'
+down_revision = 'b71e3a5f2c90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_apartment_input_apartments_guid_price',
+        'apartment',
+        ['input_apartments_guid', 'price', 'guid'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_apartment_input_apartments_guid_m2price',
+        'apartment',
+        ['input_apartments_guid', 'm2price', 'guid'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_apartment_input_apartments_guid_apartment_area',
+        'apartment',
+        ['input_apartments_guid', 'apartment_area', 'guid'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_apartment_input_apartments_guid_distance_to_metro',
+        'apartment',
+        ['input_apartments_guid', 'distance_to_metro', 'guid'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_apartment_input_apartments_guid_distance_to_metro', table_name='apartment')
+    op.drop_index('ix_apartment_input_apartments_guid_apartment_area', table_name='apartment')
+    op.drop_index('ix_apartment_input_apartments_guid_m2price', table_name='apartment')
+    op.drop_index('ix_apartment_input_apartments_guid_price', table_name='apartment')
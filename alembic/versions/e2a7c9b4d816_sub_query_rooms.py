@@ -0,0 +1,29 @@
+"""sub query rooms
+
+Revision ID: e2a7c9b4d816
+Revises: d4f8a1c6e359
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a7c9b4d816'
+down_revision = 'd4f8a1c6e359'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('sub_query', sa.Column('rooms', sa.Integer(), nullable=True))
+    op.execute(
+        'UPDATE sub_query SET rooms = ('
+        'SELECT min(apartment.rooms) FROM apartment WHERE apartment.input_apartments_guid = sub_query.guid'
+        ')'
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('sub_query', 'rooms')
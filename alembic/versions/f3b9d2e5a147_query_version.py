@@ -0,0 +1,83 @@
+"""query version
+
+Revision ID: f3b9d2e5a147
+Revises: e2a7c9b4d816
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b9d2e5a147'
+down_revision = 'e2a7c9b4d816'
+branch_labels = None
+depends_on = None
+
+# Any write to a query, its sub-queries, apartments or adjustments bumps query.version once per
+# transaction. Statement-level triggers with transition tables keep bulk writes to a single UPDATE.
+changed_sub_queries = {
+    'sub_query': None,
+    'apartment': (
+        'SELECT unnest(ARRAY[input_apartments_guid, standart_object_guid, analogs_guid, '
+        'selected_analogs_guid, output_apartments_guid]) FROM {rows}'
+    ),
+    'adjustment': (
+        'SELECT unnest(ARRAY[analog_calculated_guid, analog_user_guid, pool_calculated_guid, pool_user_guid]) '
+        'FROM {rows} '
+        'UNION SELECT unnest(ARRAY[a.input_apartments_guid, a.standart_object_guid, a.analogs_guid, '
+        'a.selected_analogs_guid, a.output_apartments_guid]) '
+        'FROM {rows} AS r JOIN apartment AS a ON a.guid = r.apartment_guid'
+    ),
+}
+operations = {'INSERT': ('new_rows',), 'UPDATE': ('new_rows', 'old_rows'), 'DELETE': ('old_rows',)}
+
+
+def _bump(table: str, rows: str) -> str:
+    if changed_sub_queries[table] is None:
+        queries = f'SELECT query_guid FROM {rows}'
+    else:
+        queries = f'SELECT query_guid FROM sub_query WHERE guid IN ({changed_sub_queries[table].format(rows=rows)})'
+    return (
+        f'UPDATE query SET version = version + 1 WHERE guid IN ({queries}) '
+        f'AND xmin <> (txid_current() % 4294967296)::text::xid;'
+    )
+
+
+def upgrade() -> None:
+    op.add_column('query', sa.Column('version', sa.BigInteger(), server_default='1', nullable=False))
+    op.execute(
+        'CREATE FUNCTION query_bump_version() RETURNS trigger AS $$ '
+        'BEGIN IF NEW.version = OLD.version THEN NEW.version := OLD.version + 1; END IF; RETURN NEW; END '
+        '$$ LANGUAGE plpgsql'
+    )
+    op.execute(
+        'CREATE TRIGGER query_bump_version BEFORE UPDATE ON query '
+        'FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*) EXECUTE FUNCTION query_bump_version()'
+    )
+    for table in changed_sub_queries:
+        for operation, tables in operations.items():
+            name = f'{table}_{operation.lower()}_bump_query_version'
+            body = ' '.join(_bump(table, rows) for rows in tables)
+            referencing = ' '.join(
+                f'{"NEW" if rows == "new_rows" else "OLD"} TABLE AS {rows}' for rows in tables
+            )
+            op.execute(
+                f'CREATE FUNCTION {name}() RETURNS trigger AS $$ BEGIN {body} RETURN NULL; END $$ LANGUAGE plpgsql'
+            )
+            op.execute(
+                f'CREATE TRIGGER {name} AFTER {operation} ON {table} REFERENCING {referencing} '
+                f'FOR EACH STATEMENT EXECUTE FUNCTION {name}()'
+            )
+
+
+def downgrade() -> None:
+    for table in reversed(list(changed_sub_queries)):
+        for operation in reversed(list(operations)):
+            name = f'{table}_{operation.lower()}_bump_query_version'
+            op.execute(f'DROP TRIGGER {name} ON {table}')
+            op.execute(f'DROP FUNCTION {name}()')
+    op.execute('DROP TRIGGER query_bump_version ON query')
+    op.execute('DROP FUNCTION query_bump_version()')
+    op.drop_column('query', 'version')
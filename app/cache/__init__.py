@@ -0,0 +1,5 @@
+from .base import Cache
+from .bloom import BloomFilter
+from .connection import close_cache, get_cache, open_cache
+from .memory import MemoryCache
+from .redis import RedisCache
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class Cache(ABC):
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def open(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    @abstractmethod
+    async def get(self, key: str, version: int) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, version: int, value: bytes) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, keys: list[str]) -> None:
+        ...
+
+    def entries(self) -> Optional[int]:
+        return None
+
+    def size(self) -> Optional[int]:
+        return None
+
+    def _count(self, value: Optional[bytes]) -> Optional[bytes]:
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
@@ -0,0 +1,34 @@
+from typing import Optional
+
+from app.cache.base import Cache
+from app.cache.memory import MemoryCache
+from app.cache.redis import RedisCache
+from app.config import config
+
+cache: Optional[Cache] = None
+
+
+def create_cache() -> Cache:
+    if config.CACHE_BACKEND == "redis":
+        return RedisCache()
+    return MemoryCache()
+
+
+async def open_cache() -> None:
+    global cache
+    if cache is None:
+        cache = create_cache()
+        await cache.open()
+
+
+async def close_cache() -> None:
+    global cache
+    if cache is not None:
+        await cache.close()
+    cache = None
+
+
+def get_cache() -> Cache:
+    if cache is None:
+        raise RuntimeError("Cache is not initialized, call open_cache() on startup")
+    return cache
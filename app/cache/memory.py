@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Optional
+
+from app.cache.base import Cache
+from app.config import config
+
+
+class MemoryCache(Cache):
+    def __init__(self) -> None:
+        super().__init__()
+        self.max_bytes = config.CACHE_MAX_BYTES
+        self._entries: OrderedDict[str, tuple[int, bytes]] = OrderedDict()
+        self._size = 0
+
+    async def get(self, key: str, version: int) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            return self._count(None)
+        self._entries.move_to_end(key)
+        return self._count(entry[1])
+
+    async def set(self, key: str, version: int, value: bytes) -> None:
+        self._pop(key)
+        if len(value) > self.max_bytes:
+            return
+        self._entries[key] = (version, value)
+        self._size += len(value)
+        while self._size > self.max_bytes:
+            self._pop(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def delete(self, keys: list[str]) -> None:
+        for key in keys:
+            self._pop(key)
+
+    def entries(self) -> Optional[int]:
+        return len(self._entries)
+
+    def size(self) -> Optional[int]:
+        return self._size
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
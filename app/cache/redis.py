@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from loguru import logger
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.cache.base import Cache
+from app.config import config
+
+
+class RedisCache(Cache):
+    def __init__(self) -> None:
+        super().__init__()
+        self.client: Optional[aioredis.Redis] = None
+
+    async def open(self) -> None:
+        if self.client is None:
+            self.client = aioredis.from_url(
+                config.CACHE_REDIS_URI,
+                socket_timeout=config.CACHE_REDIS_TIMEOUT_SECONDS,
+                socket_connect_timeout=config.CACHE_REDIS_TIMEOUT_SECONDS,
+            )
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.close()
+        self.client = None
+
+    # A Redis outage degrades to cache misses: reads fall through to the database and writes skip the cache.
+    async def get(self, key: str, version: int) -> Optional[bytes]:
+        try:
+            value = await self.client.get(self._key(key))
+        except (RedisError, OSError) as e:
+            logger.warning(f"Redis cache is unavailable: {e!r}")
+            value = None
+        if value is None:
+            return self._count(None)
+        cached_version, _, payload = value.partition(b"\n")
+        return self._count(payload if int(cached_version) == version else None)
+
+    async def set(self, key: str, version: int, value: bytes) -> None:
+        if len(value) > config.CACHE_MAX_BYTES:
+            return
+        try:
+            await self.client.set(self._key(key), b"%d\n%s" % (version, value), ex=config.CACHE_TTL_SECONDS)
+        except (RedisError, OSError) as e:
+            logger.warning(f"Redis cache is unavailable: {e!r}")
+
+    async def delete(self, keys: list[str]) -> None:
+        if not keys:
+            return
+        try:
+            await self.client.delete(*(self._key(key) for key in keys))
+        except (RedisError, OSError) as e:
+            logger.warning(f"Redis cache is unavailable: {e!r}")
+
+    @staticmethod
+    def _key(key: str) -> str:
+        return f"{config.CACHE_REDIS_PREFIX}{key}"
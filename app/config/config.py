@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from dotenv import find_dotenv
-from pydantic import BaseSettings, HttpUrl, PostgresDsn, validator
+from pydantic import BaseSettings, HttpUrl, PostgresDsn, RedisDsn, validator
 
 
 class AsyncPostgresDsn(PostgresDsn):
@@ -15,6 +15,12 @@ class _Settings(BaseSettings):
     class Config:
         env_file_encoding = "utf-8"
 
+        @classmethod
+        def parse_env_var(cls, field_name: str, raw_val: str) -> Any:
+            if field_name in ("POSTGRES_REPLICA_URIS", "BACKEND_ADMIN_EMAILS") and not raw_val.startswith("["):
+                return [value.strip() for value in raw_val.split(",") if value.strip()]
+            return cls.json_loads(raw_val)
+
 
 class Config(_Settings):
     # Debug
@@ -43,6 +49,24 @@ class Config(_Settings):
     BACKEND_JWT_SECRET: str
     BACKEND_JWT_ALGORITHM: str
     BACKEND_JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int
+    BACKEND_JWT_CACHE_SIZE: int = 10000
+    BACKEND_JWT_CACHE_TTL_SECONDS: int = 5 * 60
+
+    BACKEND_REVOCATION_BLOOM_CAPACITY: int = 100000
+    BACKEND_REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    BACKEND_REVOCATION_REFRESH_SECONDS: int = 5
+    BACKEND_REVOCATION_PURGE_MINUTES: int = 60
+
+    BACKEND_BCRYPT_ROUNDS: int = 12
+    BACKEND_HASHING_WORKERS: int = 2
+    BACKEND_HASHING_QUEUE_SIZE: int = 32
+    BACKEND_HASHING_TIMEOUT_SECONDS: int = 10
+
+    @validator("BACKEND_BCRYPT_ROUNDS")
+    def check_bcrypt_rounds(cls, v: int) -> int:
+        if not 4 <= v <= 31:
+            raise ValueError("bcrypt rounds must be between 4 and 31")
+        return v
 
     BACKEND_DADATA_TOKEN: str
 
@@ -50,7 +74,27 @@ class Config(_Settings):
     BACKEND_DISABLE_FILE_SENDING: bool
     BACKEND_DISABLE_REGISTRATION: bool
 
+    BACKEND_ADMIN_EMAILS: List[str] = []
+
+    BACKEND_EXPORT_JOB_TTL_MINUTES: int = 60
+    BACKEND_STREAM_CHUNK_SIZE: int = 1000
+
+    BACKEND_COMPRESSION_MIN_SIZE: int = 1024
+    BACKEND_COMPRESSION_GZIP_LEVEL: int = 6
+    BACKEND_COMPRESSION_BROTLI_QUALITY: int = 4
+    BACKEND_COMPRESSION_ZSTD_LEVEL: int = 3
+
     # Storage
+    STORAGE_BACKEND: Literal["s3", "local"] = "s3"
+    STORAGE_LOCAL_DIRECTORY: str = "./files"
+    STORAGE_LOCAL_URL: Optional[HttpUrl] = None
+
+    @validator("STORAGE_LOCAL_URL", pre=True)
+    def assemble_storage_local_url(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
+        if isinstance(v, str) and v:
+            return v.rstrip("/")
+        return f"http://{values.get('BACKEND_HOST')}:{values.get('BACKEND_PORT')}{values.get('BACKEND_PREFIX')}/files"
+
     STORAGE_REGION: str
     STORAGE_ENDPOINT: HttpUrl
     STORAGE_ACCESS_KEY: str
@@ -58,12 +102,52 @@ class Config(_Settings):
     STORAGE_BUCKET_NAME: str
     STORAGE_FOLDER_NAME: str
 
+    STORAGE_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024
+    STORAGE_MULTIPART_CHUNK_SIZE: int = 8 * 1024 * 1024
+    STORAGE_MULTIPART_CONCURRENCY: int = 4
+    STORAGE_PRESIGNED_URL_EXPIRE_SECONDS: int = 60 * 60
+    STORAGE_MAX_POOL_CONNECTIONS: int = 10
+
+    STORAGE_GC_ENABLED: bool = False
+    STORAGE_GC_INTERVAL_MINUTES: int = 60
+    STORAGE_GC_BATCH_SIZE: int = 1000
+    STORAGE_GC_INPUT_RETENTION_HOURS: int = 24
+    STORAGE_GC_EXPORT_RETENTION_HOURS: int = 24
+
+    @validator("STORAGE_MULTIPART_THRESHOLD", "STORAGE_MULTIPART_CHUNK_SIZE")
+    def check_multipart_part_size(cls, v: int) -> int:
+        if v < 5 * 1024 * 1024:
+            raise ValueError("S3 multipart parts must be at least 5 MiB")
+        return v
+
+    # Cache
+    CACHE_BACKEND: Literal["memory", "redis"] = "memory"
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_REDIS_URI: Optional[RedisDsn] = None
+    CACHE_REDIS_PREFIX: str = "lct-hack:"
+    CACHE_REDIS_TIMEOUT_SECONDS: float = 0.5
+    CACHE_TTL_SECONDS: int = 60 * 60
+
+    @validator("CACHE_REDIS_URI", pre=True)
+    def check_cache_redis_uri(cls, v: Optional[str], values: Dict[str, Any]) -> Optional[str]:
+        if not v and values.get("CACHE_BACKEND") == "redis":
+            raise ValueError("CACHE_REDIS_URI is required when CACHE_BACKEND=redis")
+        return v or None
+
     # Postgres
     POSTGRES_SERVER: str
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
 
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT: int = 30
+    POSTGRES_POOL_RECYCLE: int = 30 * 60
+    POSTGRES_POOL_PRE_PING: bool = True
+    POSTGRES_STATEMENT_CACHE_SIZE: int = 100
+    POSTGRES_PGBOUNCER: bool = False
+
     SQLALCHEMY_DATABASE_URI: Optional[AsyncPostgresDsn] = None
 
     @validator("SQLALCHEMY_DATABASE_URI", pre=True)
@@ -78,6 +162,11 @@ class Config(_Settings):
             path=f"/{values.get('POSTGRES_DB') or ''}",
         )
 
+    POSTGRES_REPLICA_URIS: List[AsyncPostgresDsn] = []
+    POSTGRES_REPLICA_MAX_LAG_SECONDS: int = 10
+    POSTGRES_REPLICA_LAG_CHECK_SECONDS: int = 5
+    POSTGRES_READ_YOUR_WRITES_SECONDS: int = 10
+
 
 @lru_cache()
 def get_config(env_file: str = ".env") -> Config:
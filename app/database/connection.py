@@ -1,17 +1,130 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import itertools
+import time
+from typing import Optional
+
+from fastapi import Request
+from jose import jwt
+from jose.exceptions import JOSEError
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.config import config
+from app.database.pool import MeteredPool
+
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
 
-if config.DEBUG:
-    engine = create_async_engine(config.SQLALCHEMY_DATABASE_URI, future=True, echo=True)
-else:
-    engine = create_async_engine(config.SQLALCHEMY_DATABASE_URI, future=True, echo=False)
+def create_engine(uri: str) -> AsyncEngine:
+    return create_async_engine(
+        uri,
+        future=True,
+        echo=config.DEBUG,
+        poolclass=MeteredPool,
+        pool_size=config.POSTGRES_POOL_SIZE,
+        max_overflow=config.POSTGRES_MAX_OVERFLOW,
+        pool_timeout=config.POSTGRES_POOL_TIMEOUT,
+        pool_recycle=config.POSTGRES_POOL_RECYCLE,
+        pool_pre_ping=config.POSTGRES_POOL_PRE_PING,
+        connect_args={
+            "prepared_statement_cache_size": 0 if config.POSTGRES_PGBOUNCER else config.POSTGRES_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": 0 if config.POSTGRES_PGBOUNCER else config.POSTGRES_STATEMENT_CACHE_SIZE,
+        },
+    )
+
+
+engine = create_engine(config.SQLALCHEMY_DATABASE_URI)
 async_session = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+replica_sessions = [
+    sessionmaker(create_engine(uri), expire_on_commit=False, class_=AsyncSession)
+    for uri in config.POSTGRES_REPLICA_URIS
+]
 Base = declarative_base()
 
+_replica_order = itertools.cycle(range(len(replica_sessions)))
+_replica_lag: dict[int, tuple[float, Optional[float]]] = {}
+_last_writes: dict[str, float] = {}
+
+
+def _writer(request: Request) -> Optional[str]:
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return str(principal.sub)
+
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        sub = jwt.get_unverified_claims(token).get("sub")
+    except JOSEError:
+        return None
+    return str(sub) if sub else None
+
+
+# Writes are remembered in this process only: read-your-writes holds while a
+# user's requests are served by the same worker.
+def _mark_write(request: Request) -> None:
+    writer = _writer(request)
+    if writer is None or request.method in READ_ONLY_METHODS:
+        return
+
+    now = time.monotonic()
+    if len(_last_writes) > 10000:
+        expired_at = now - config.POSTGRES_READ_YOUR_WRITES_SECONDS
+        for key, written_at in list(_last_writes.items()):
+            if written_at < expired_at:
+                del _last_writes[key]
+    _last_writes[writer] = now
+
 
-async def get_session() -> AsyncSession:
+def _wrote_recently(request: Request) -> bool:
+    written_at = _last_writes.get(_writer(request))
+    return written_at is not None and time.monotonic() - written_at < config.POSTGRES_READ_YOUR_WRITES_SECONDS
+
+
+async def _replica_is_fresh(index: int) -> bool:
+    checked_at, lag = _replica_lag.get(index, (0.0, None))
+    if time.monotonic() - checked_at > config.POSTGRES_REPLICA_LAG_CHECK_SECONDS:
+        try:
+            async with replica_sessions[index]() as session:
+                lag = float((await session.execute(REPLICA_LAG_QUERY)).scalar())
+        except Exception as e:
+            logger.warning(f"Replica {index} is unavailable: {e!r}")
+            lag = None
+        _replica_lag[index] = (time.monotonic(), lag)
+    return lag is not None and lag <= config.POSTGRES_REPLICA_MAX_LAG_SECONDS
+
+
+async def _read_sessionmaker(request: Request) -> sessionmaker:
+    if _wrote_recently(request):
+        return async_session
+    for _ in range(len(replica_sessions)):
+        index = next(_replica_order)
+        if await _replica_is_fresh(index):
+            return replica_sessions[index]
+    return async_session
+
+
+async def get_session(request: Request) -> AsyncSession:
+    _mark_write(request)
     async with async_session() as session:
+        request.state.session = session
+        yield session
+
+
+async def commit_session(request: Request) -> None:
+    session: Optional[AsyncSession] = getattr(request.state, "session", None)
+    if session is not None and session.in_transaction():
+        await session.commit()
+        _mark_write(request)
+
+
+async def get_read_session(request: Request) -> AsyncSession:
+    async with (await _read_sessionmaker(request))() as session:
         yield session
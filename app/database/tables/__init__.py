@@ -1,4 +1,5 @@
 from .adjustment import Adjustment
 from .apartment import Apartment
 from .query import Query, SubQuery
+from .revoked_token import RevokedToken
 from .user import User
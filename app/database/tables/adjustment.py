@@ -10,9 +10,9 @@ from app.database.connection import Base
 class Adjustment(Base):
     __tablename__ = "adjustment"
 
-    guid = Column(UUID(as_uuid=True), default=uuid.uuid4, primary_key=True, index=True, unique=True)
-    apartment_guid = Column(UUID(as_uuid=True), ForeignKey("apartment.guid"))
-    apartment = relationship("Apartment", back_populates="adjustment", uselist=False, lazy="joined")
+    guid = Column(UUID(as_uuid=True), default=uuid.uuid4, primary_key=True)
+    apartment_guid = Column(UUID(as_uuid=True), ForeignKey("apartment.guid", ondelete="CASCADE"), index=True)
+    apartment = relationship("Apartment", back_populates="adjustment", uselist=False, lazy="raise")
     trade = Column(Float, nullable=False, default=-450)
     price_trade = Column(Integer, nullable=False)
     floor = Column(Float, nullable=False)
@@ -28,7 +28,7 @@ class Adjustment(Base):
     quality = Column(Float, nullable=False)
     price_final = Column(Integer, nullable=False)
 
-    analog_calculated_guid = Column(UUID(as_uuid=True), ForeignKey("sub_query.guid"))
-    analog_user_guid = Column(UUID(as_uuid=True), ForeignKey("sub_query.guid"))
-    pool_calculated_guid = Column(UUID(as_uuid=True), ForeignKey("sub_query.guid"))
-    pool_user_guid = Column(UUID(as_uuid=True), ForeignKey("sub_query.guid"))
+    analog_calculated_guid = Column(UUID(as_uuid=True), ForeignKey("sub_query.guid", ondelete="CASCADE"), index=True)
+    analog_user_guid = Column(UUID(as_uuid=True), ForeignKey("sub_query.guid", ondelete="CASCADE"), index=True)
+    pool_calculated_guid = Column(UUID(as_uuid=True), ForeignKey("sub_query.guid", ondelete="CASCADE"), index=True)
+    pool_user_guid = Column(UUID(as_uuid=True), ForeignKey("sub_query.guid", ondelete="CASCADE"), index=True)
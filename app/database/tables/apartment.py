@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, Numeric, String
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, Numeric, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -10,7 +10,7 @@ from app.database.connection import Base
 class Apartment(Base):
     __tablename__ = "apartment"
 
-    guid = Column(UUID(as_uuid=True), default=uuid.uuid4, primary_key=True, index=True, unique=True)
+    guid = Column(UUID(as_uuid=True), default=uuid.uuid4, primary_key=True)
     address = Column(String, nullable=False)
     lat = Column(Numeric, nullable=False, default=-1)
     lon = Column(Numeric, nullable=False, default=-1)
@@ -28,10 +28,34 @@ class Apartment(Base):
     m2price = Column(Integer, nullable=True)
     price = Column(Integer, nullable=True)
 
-    adjustment = relationship("Adjustment", back_populates="apartment", lazy="joined", uselist=False)
+    adjustment = relationship(
+        "Adjustment", back_populates="apartment", lazy="raise", uselist=False, cascade="all, delete-orphan"
+    )
 
-    input_apartments_guid = Column(UUID(as_uuid=True), ForeignKey("sub_query.guid"))
-    standart_object_guid = Column(UUID(as_uuid=True), ForeignKey("sub_query.guid"))
-    analogs_guid = Column(UUID(as_uuid=True), ForeignKey("sub_query.guid"))
-    selected_analogs_guid = Column(UUID(as_uuid=True), ForeignKey("sub_query.guid"))
-    output_apartments_guid = Column(UUID(as_uuid=True), ForeignKey("sub_query.guid"))
+    input_apartments_guid = Column(UUID(as_uuid=True), ForeignKey("sub_query.guid", ondelete="CASCADE"))
+    standart_object_guid = Column(UUID(as_uuid=True), ForeignKey("sub_query.guid", ondelete="CASCADE"), index=True)
+    analogs_guid = Column(UUID(as_uuid=True), ForeignKey("sub_query.guid", ondelete="CASCADE"))
+    selected_analogs_guid = Column(UUID(as_uuid=True), ForeignKey("sub_query.guid", ondelete="CASCADE"))
+    output_apartments_guid = Column(UUID(as_uuid=True), ForeignKey("sub_query.guid", ondelete="CASCADE"))
+
+    __table_args__ = (
+        Index("ix_apartment_input_apartments_guid_segment", input_apartments_guid, segment),
+        Index("ix_apartment_input_apartments_guid_walls", input_apartments_guid, walls),
+        Index("ix_apartment_input_apartments_guid_floors", input_apartments_guid, floors),
+        Index("ix_apartment_input_apartments_guid_price", input_apartments_guid, price, guid),
+        Index("ix_apartment_input_apartments_guid_m2price", input_apartments_guid, m2price, guid),
+        Index("ix_apartment_input_apartments_guid_apartment_area", input_apartments_guid, apartment_area, guid),
+        Index("ix_apartment_input_apartments_guid_distance_to_metro", input_apartments_guid, distance_to_metro, guid),
+        Index("ix_apartment_analogs_guid_price", analogs_guid, price, guid),
+        Index("ix_apartment_analogs_guid_m2price", analogs_guid, m2price, guid),
+        Index("ix_apartment_analogs_guid_apartment_area", analogs_guid, apartment_area, guid),
+        Index("ix_apartment_analogs_guid_distance_to_metro", analogs_guid, distance_to_metro, guid),
+        Index("ix_apartment_selected_analogs_guid_price", selected_analogs_guid, price, guid),
+        Index("ix_apartment_selected_analogs_guid_m2price", selected_analogs_guid, m2price, guid),
+        Index("ix_apartment_selected_analogs_guid_apartment_area", selected_analogs_guid, apartment_area, guid),
+        Index("ix_apartment_selected_analogs_guid_distance_to_metro", selected_analogs_guid, distance_to_metro, guid),
+        Index("ix_apartment_output_apartments_guid_price", output_apartments_guid, price, guid),
+        Index("ix_apartment_output_apartments_guid_m2price", output_apartments_guid, m2price, guid),
+        Index("ix_apartment_output_apartments_guid_apartment_area", output_apartments_guid, apartment_area, guid),
+        Index("ix_apartment_output_apartments_guid_distance_to_metro", output_apartments_guid, distance_to_metro, guid),
+    )
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, ForeignKey, String, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.database.connection import Base
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_token"
+
+    jti = Column(String, primary_key=True)
+    user_guid = Column(UUID(as_uuid=True), ForeignKey("user.guid", ondelete="CASCADE"), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
@@ -9,4 +9,21 @@ set_analogs_example_value = {
     ]
 }
 
+set_analogs_bulk_example_value = [
+    {
+        "subQueryGuid": uuid.uuid4(),
+        "guids": [
+            uuid.uuid4(),
+            uuid.uuid4(),
+        ],
+    },
+    {
+        "subQueryGuid": uuid.uuid4(),
+        "guids": [
+            uuid.uuid4(),
+            uuid.uuid4(),
+        ],
+    },
+]
+
 set_analog_example_value = {"guid": uuid.uuid4()}
@@ -1,16 +1,24 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.cors import CORSMiddleware
 from starlette.staticfiles import StaticFiles
 
+from app.cache import close_cache, open_cache
 from app.config import config
+from app.middleware import CompressionMiddleware, SessionCommitMiddleware
 from app.models.exceptions import add_exception_handlers, catch_unhandled_exceptions
 from app.routers.adjustment import router as adjustment_router
 from app.routers.apartment import router as apartment_router
 from app.routers.auth import router as auth_router
+from app.routers.files import router as files_router
+from app.routers.internal import router as internal_router
 from app.routers.pool import router as pool_router
 from app.routers.query import router as query_router
 from app.routers.subquery import router as subquery_router
 from app.routers.users import router as users_router
+from app.services import RevocationService, StorageService
+from app.services.auth import close_password_hashing, open_password_hashing
+from app.storage import close_storage, open_storage
 
 tags_metadata = [
     {"name": "auth", "description": "Авторизация"},
@@ -20,6 +28,8 @@ tags_metadata = [
     {"name": "subquery", "description": "Работа с подзапросами"},
     {"name": "apartment", "description": "Работа с квартирами"},
     {"name": "adjustment", "description": "Работа с корректировками"},
+    {"name": "files", "description": "Работа с файлами"},
+    {"name": "internal", "description": "Служебные метрики"},
 ]
 
 app = FastAPI(
@@ -28,8 +38,22 @@ app = FastAPI(
     openapi_url=f"{config.BACKEND_PREFIX}/openapi.json",
     title=config.BACKEND_TTILE,
     description=config.BACKEND_DESCRIPTION,
+    default_response_class=ORJSONResponse,
 )
 
+app.add_event_handler("startup", open_storage)
+app.add_event_handler("startup", open_cache)
+app.add_event_handler("startup", open_password_hashing)
+app.add_event_handler("startup", StorageService.start_sweeper)
+app.add_event_handler("startup", RevocationService.start_refresher)
+app.add_event_handler("shutdown", RevocationService.stop_refresher)
+app.add_event_handler("shutdown", StorageService.stop_sweeper)
+app.add_event_handler("shutdown", close_storage)
+app.add_event_handler("shutdown", close_cache)
+app.add_event_handler("shutdown", close_password_hashing)
+
+app.add_middleware(SessionCommitMiddleware)
+app.add_middleware(CompressionMiddleware, minimum_size=config.BACKEND_COMPRESSION_MIN_SIZE)
 app.middleware("http")(catch_unhandled_exceptions)
 add_exception_handlers(app)
 
@@ -49,3 +73,5 @@ app.include_router(query_router, tags=["query"])
 app.include_router(subquery_router, tags=["subquery"])
 app.include_router(apartment_router, tags=["apartment"])
 app.include_router(adjustment_router, tags=["adjustment"])
+app.include_router(files_router, tags=["files"])
+app.include_router(internal_router, tags=["internal"])
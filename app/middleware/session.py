@@ -0,0 +1,21 @@
+from fastapi import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database.connection import commit_session
+
+
+class SessionCommitMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_committed(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                await commit_session(Request(scope))
+            await send(message)
+
+        await self.app(scope, receive, send_committed)
@@ -1,5 +1,8 @@
 from .adjustments import *
 from .apartments import *
 from .auth import *
+from .cache import *
+from .database import *
+from .export import *
 from .query import *
 from .users import *
@@ -1,5 +1,5 @@
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import UUID4, BaseModel, Field, HttpUrl
 
@@ -41,6 +41,16 @@ class ApartmentCreate(ApartmentBase):
     pass
 
 
+class ApartmentPage(BaseModel):
+    items: List[ApartmentGet] = Field(description="Квартиры подзапроса")
+    next_cursor: Optional[str] = Field(
+        None, description="Курсор следующей страницы (отсутствует на последней странице)", alias="nextCursor"
+    )
+
+    class Config:
+        allow_population_by_field_name = True
+
+
 @optional
 class ApartmentPatch(ApartmentCreate):
     pass
@@ -1,4 +1,7 @@
-from pydantic import BaseModel, EmailStr
+from datetime import datetime
+from typing import Optional
+
+from pydantic import UUID4, BaseModel, EmailStr, Field
 
 
 class UserAuth(BaseModel):
@@ -8,3 +11,10 @@ class UserAuth(BaseModel):
 
 class Token(BaseModel):
     access_token: str
+
+
+class Principal(BaseModel):
+    sub: UUID4 = Field(description="Уникальный идентификатор пользователя")
+    jti: Optional[str] = Field(None, description="Уникальный идентификатор токена")
+    exp: datetime = Field(description="Время истечения токена")
+    email: Optional[EmailStr] = Field(None, description="Email пользователя")
@@ -0,0 +1,18 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class CacheGet(BaseModel):
+    pid: int = Field(description="Идентификатор процесса воркера")
+    backend: str = Field(description="Хранилище кэша")
+    entries: Optional[int] = Field(description="Количество записей в кэше воркера")
+    size_bytes: Optional[int] = Field(description="Объем записей в кэше воркера, байт", alias="sizeBytes")
+    max_bytes: int = Field(description="Максимальный объем кэша воркера, байт", alias="maxBytes")
+    hits: int = Field(description="Количество попаданий с запуска воркера")
+    misses: int = Field(description="Количество промахов с запуска воркера")
+    hit_rate: float = Field(description="Доля попаданий", alias="hitRate")
+    evictions: int = Field(description="Количество вытесненных записей с запуска воркера")
+
+    class Config:
+        allow_population_by_field_name = True
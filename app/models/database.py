@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+
+
+class DatabasePoolGet(BaseModel):
+    pid: int = Field(description="Идентификатор процесса воркера")
+    size: int = Field(description="Размер пула соединений")
+    max_overflow: int = Field(description="Максимальное количество соединений сверх пула", alias="maxOverflow")
+    timeout: float = Field(description="Время ожидания свободного соединения, с")
+    checked_out: int = Field(description="Количество выданных соединений", alias="checkedOut")
+    idle: int = Field(description="Количество свободных соединений в пуле")
+    overflow: int = Field(description="Количество соединений сверх размера пула")
+    checkouts: int = Field(description="Количество выдач соединений с запуска воркера")
+    timeouts: int = Field(description="Количество выдач, завершившихся по таймауту")
+    wait_time_avg_ms: float = Field(description="Среднее время получения соединения, мс", alias="waitTimeAvgMs")
+    wait_time_max_ms: float = Field(description="Максимальное время получения соединения, мс", alias="waitTimeMaxMs")
+
+    class Config:
+        allow_population_by_field_name = True
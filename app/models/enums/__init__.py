@@ -1,5 +1,6 @@
 from .adjustments import *
 from .apartment import *
 from .base_enum import BaseEnum
+from .export import *
 from .file import *
 from .query import *
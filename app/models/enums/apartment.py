@@ -27,3 +27,37 @@ class RepairType(str, BaseEnum):
     WITHOUT_REPAIR = "без отделки"
     MUNICIPAL_REPAIR = "муниципальный ремонт"
     MODERN_REPAIR = "современный ремонт"
+
+
+class ApartmentRole(str, BaseEnum):
+    INPUT = "input"
+    ANALOGS = "analogs"
+    SELECTED = "selected"
+    OUTPUT = "output"
+
+
+class ApartmentSortField(str, BaseEnum):
+    PRICE = "price"
+    M2PRICE = "m2price"
+    AREA = "area"
+    METRO = "metro"
+
+
+class ApartmentField(str, BaseEnum):
+    ADDRESS = "address"
+    LINK = "link"
+    LAT = "lat"
+    LON = "lon"
+    ROOMS = "rooms"
+    SEGMENT = "segment"
+    FLOORS = "floors"
+    WALLS = "walls"
+    FLOOR = "floor"
+    APARTMENT_AREA = "apartmentArea"
+    KITCHEN_AREA = "kitchenArea"
+    HAS_BALCONY = "hasBalcony"
+    DISTANCE_TO_METRO = "distanceToMetro"
+    QUALITY = "quality"
+    M2PRICE = "m2price"
+    PRICE = "price"
+    ADJUSTMENT = "adjustment"
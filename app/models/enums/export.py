@@ -0,0 +1,8 @@
+from .base_enum import BaseEnum
+
+
+class ExportJobStatus(str, BaseEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
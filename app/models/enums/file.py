@@ -5,3 +5,8 @@ class AllowedFileTypes(str, BaseEnum):
     XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
     XLS = "application/vnd.ms-excel"
     CSV = "text/csv"
+
+
+class StoredFileType(str, BaseEnum):
+    INPUT = "input"
+    EXPORT = "export"
@@ -4,3 +4,15 @@ from app.models.enums import BaseEnum
 class SortByEnum(str, BaseEnum):
     ASC = "asc"
     DESC = "desc"
+
+
+class SubQueryRelation(str, BaseEnum):
+    INPUT_APARTMENTS = "input_apartments"
+    STANDART_OBJECT = "standart_object"
+    ANALOGS = "analogs"
+    SELECTED_ANALOGS = "selected_analogs"
+    ADJUSTMENTS_ANALOG_CALCULATED = "adjustments_analog_calculated"
+    ADJUSTMENTS_ANALOG_USER = "adjustments_analog_user"
+    ADJUSTMENTS_POOL_CALCULATED = "adjustments_pool_calculated"
+    ADJUSTMENTS_POOL_USER = "adjustments_pool_user"
+    OUTPUT_APARTMENTS = "output_apartments"
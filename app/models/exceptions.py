@@ -6,7 +6,7 @@ from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import HTTPException, RequestValidationError
 from loguru import logger
 from pydantic import UUID4, BaseModel
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 
 from app.config import config
 
@@ -37,6 +37,7 @@ class Message(BaseModel):
 endpoint_message = {
     ("POST", "/api/signin"): "Ошибка входа в систему",
     ("POST", "/api/signup"): "Ошибка регистрации в системе",
+    ("POST", "/api/logout"): "Ошибка выхода из системы",
     ("POST", "/api/user"): "Ошибка создания пользователя",
     ("GET", "/api/user"): "Ошибка получения всех пользователей",
     ("GET", "/api/user/{id}"): "Ошибка получения пользователя по id",
@@ -46,7 +47,11 @@ endpoint_message = {
     ("DELETE", "/api/user/{id}"): "Ошибка удаления пользователя по id",
     ("POST", "/api/pool"): "Ошибка загрузки пула",
     ("GET", "/api/export"): "Ошибка экспорта пула",
+    ("POST", "/api/export/jobs"): "Ошибка создания задачи экспорта пула",
+    ("GET", "/api/export/jobs/{id}"): "Ошибка получения задачи экспорта пула",
     ("GET", "/api/query"): "Ошибка получения всех запросов",
+    ("DELETE", "/api/query"): "Ошибка удаления запросов",
+    ("GET", "/api/query/summary"): "Ошибка получения кратких сведений о запросах",
     ("GET", "/api/query/{id}"): "Ошибка получения запроса по id",
     ("PUT", "/api/query/{id}"): "Ошибка изменения запроса по id",
     ("PATCH", "/api/query/{id}"): "Ошибка частичного изменения запроса по id",
@@ -55,16 +60,21 @@ endpoint_message = {
     ("GET", "/api/query/{id}/subquery/{subid}/analogs"): "Ошибка получения аналогов",
     ("POST", "/api/query/{id}/subquery/{subid}/analogs"): "Ошибка установки аналогов",
     ("POST", "/api/query/{id}/subquery/{subid}/user-analogs"): "Ошибка установки аналогов пользователя",
+    ("POST", "/api/query/{id}/user-analogs"): "Ошибка установки аналогов пользователя для нескольких подзапросов",
     ("POST", "/api/query/{id}/subquery/{subid}/calculate-analogs"): "Ошибка расчета аналогов",
     ("POST", "/query/{id}/subquery/{subid}/recalculate-analogs"): "Ошибка расчета аналогов",
     ("POST", "/api/query/{id}/subquery/{subid}/calculate-pool"): "Ошибка расчета пула",
     ("POST", "/api/query/{id}/subquery/{subid}/apartment"): "Ошибка создания квартиры",
     ("GET", "/api/query/{id}/subquery/{subid}/apartment"): "Ошибка получения всех квартир",
+    ("GET", "/api/query/{id}/subquery/{subid}/apartment/stream"): "Ошибка потоковой выгрузки квартир",
     ("GET", "/api/query/{id}/subquery/{subid}/apartment/{aid}"): "Ошибка получения квартиры по id",
     ("PUT", "/api/query/{id}/subquery/{subid}/apartment/{aid}"): "Ошибка изменения квартиры по id",
     ("PATCH", "/api/query/{id}/subquery/{subid}/apartment/{aid}"): "Ошибка частичного изменения квартиры по id",
     ("DELETE", "/api/query/{id}/subquery/{subid}/apartment/{aid}"): "Ошибка удаления квартиры по id",
     ("GET", "/api/adjustment"): "Ошибка получения корректировок",
+    ("GET", "/api/files/{key}"): "Ошибка получения файла",
+    ("GET", "/api/internal/database/pool"): "Ошибка получения состояния пула соединений",
+    ("GET", "/api/internal/cache"): "Ошибка получения состояния кэша",
     ("PATCH", "/api/query/{id}/subquery/{subid}/apartment/{aid}/adjustment/{adjid}"): "Ошибка изменения корректировки",
 }
 
@@ -154,8 +164,10 @@ class ValidationHandler:
 
 
 async def logging_handler(request: Request, exc: HTTPException):
+    if exc.status_code == status.HTTP_304_NOT_MODIFIED:
+        return Response(status_code=exc.status_code, headers=exc.headers)
     error = {"message": get_endpoint_message(request), "errors": exc.detail}
-    return JSONResponse(status_code=exc.status_code, content=jsonable_encoder(error))
+    return JSONResponse(status_code=exc.status_code, content=jsonable_encoder(error), headers=exc.headers)
 
 
 def add_exception_handlers(app: FastAPI):
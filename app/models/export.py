@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import UUID4, BaseModel, Field, HttpUrl
+
+from app.models.enums import ExportJobStatus
+
+
+class ExportJobGet(BaseModel):
+    guid: UUID4 = Field(description="Уникальный идентификатор задачи экспорта")
+    query_guid: UUID4 = Field(description="Уникальный идентификатор экспортируемого запроса", alias="queryGuid")
+    include_adjustments: bool = Field(description="Включить корректировки", alias="includeAdjustments")
+    split_by_lists: bool = Field(description="Разбить данные по листам", alias="splitByLists")
+    status: ExportJobStatus = Field(ExportJobStatus.PENDING, description="Статус задачи экспорта")
+    sheets_total: int = Field(0, description="Количество листов в файле", alias="sheetsTotal")
+    sheets_done: int = Field(0, description="Количество заполненных листов", alias="sheetsDone")
+    rows_written: int = Field(0, description="Количество записанных строк", alias="rowsWritten")
+    link: Optional[HttpUrl] = Field(None, description="Ссылка на файл с выходными данными")
+    error: Optional[str] = Field(None, description="Описание ошибки экспорта")
+    created_by: UUID4 = Field(description="Уникальный идентификатор пользователя, создавшего задачу", alias="createdBy")
+    created_at: datetime = Field(description="Время создания задачи", alias="createdAt")
+    updated_at: datetime = Field(description="Время последнего обновления задачи", alias="updatedAt")
+
+    class Config:
+        allow_population_by_field_name = True
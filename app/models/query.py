@@ -31,6 +31,7 @@ class SubQueryCreate(SubQueryBase):
 
 class SubQueryGet(BaseModel):
     guid: UUID4 = Field(description="Уникальный идентификатор подзапроса")
+    rooms: Optional[int] = Field(None, description="Количество комнат в квартирах подзапроса")
     input_apartments: Optional[List[ApartmentGet]] = Field(description="Список квартир в подзапросе")
     standart_object: Optional[ApartmentGet] = Field(description="Эталонный объект")
     analogs: Optional[List[ApartmentGet]] = Field(description="Список подобранных аналогов")
@@ -91,6 +92,20 @@ class QueryGet(QueryBase):
         allow_population_by_field_name = True
 
 
+class QueryListItem(QueryBase):
+    guid: UUID4 = Field(description="Уникальный идентификатор записи")
+    created_by: UUID4 = Field(description="Уникальный идентификатор пользователя, создавшего запись", alias="createdBy")
+    updated_by: UUID4 = Field(
+        description="Уникальный идентификатор пользователя, обновившего запись", alias="updatedBy"
+    )
+    created_at: datetime = Field(description="Время создания записи", alias="createdAt")
+    updated_at: datetime = Field(description="Время последнего обновления записи", alias="updatedAt")
+
+    class Config:
+        orm_mode = True
+        allow_population_by_field_name = True
+
+
 @optional
 class QueryPatch(QueryCreate):
     pass
@@ -104,5 +119,35 @@ class QueryCreateUserApartments(BaseModel):
     guids: List[UUID4] = Field(description="Уникальные идентификаторы аналогов, устанавливаемых пользователем")
 
 
+class QuerySubQueryUserApartments(QueryCreateUserApartments):
+    sub_query_guid: UUID4 = Field(description="Уникальный идентификатор подзапроса", alias="subQueryGuid")
+
+    class Config:
+        allow_population_by_field_name = True
+
+
 class QueryExport(BaseModel):
     link: HttpUrl = Field(example="https://example.com/", description="Ссылка на файл с выходными данными")
+
+
+class QuerySummary(QueryBase):
+    guid: UUID4 = Field(description="Уникальный идентификатор записи")
+    created_by: UUID4 = Field(description="Уникальный идентификатор пользователя, создавшего запись", alias="createdBy")
+    created_at: datetime = Field(description="Время создания записи", alias="createdAt")
+    sub_queries_count: int = Field(description="Количество подзапросов", alias="subQueriesCount")
+    apartments_count: int = Field(description="Количество квартир в пуле", alias="apartmentsCount")
+    rooms: List[int] = Field(description="Количество комнат в группах пула")
+
+    class Config:
+        orm_mode = True
+        allow_population_by_field_name = True
+
+
+class QuerySummaryPage(BaseModel):
+    items: List[QuerySummary] = Field(description="Краткие сведения о запросах")
+    next_cursor: Optional[str] = Field(
+        None, description="Курсор следующей страницы (отсутствует на последней странице)", alias="nextCursor"
+    )
+
+    class Config:
+        allow_population_by_field_name = True
@@ -1,6 +1,11 @@
 import inspect
+from datetime import date, datetime, time
+from decimal import Decimal
 from typing import Any
+from uuid import UUID
 
+import msgpack
+import orjson
 from pydantic import BaseModel
 
 
@@ -16,3 +21,35 @@ def optional(*fields: Any):
         return dec(cls)
 
     return dec
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return _default(value)
+
+
+def _to_dict(content: Any, exclude_unset: bool) -> Any:
+    if isinstance(content, BaseModel):
+        return content.dict(by_alias=True, exclude_unset=exclude_unset)
+    if isinstance(content, list):
+        return [item.dict(by_alias=True, exclude_unset=exclude_unset) for item in content]
+    return content
+
+
+def dump_json(content: Any, exclude_unset: bool = False) -> bytes:
+    return orjson.dumps(_to_dict(content, exclude_unset), default=_default)
+
+
+def dump_msgpack(content: Any, exclude_unset: bool = False) -> bytes:
+    if isinstance(content, bytes):
+        content = orjson.loads(content)
+    return msgpack.packb(_to_dict(content, exclude_unset), default=_msgpack_default)
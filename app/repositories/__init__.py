@@ -1,4 +1,5 @@
 from .adjustment import AdjustmentRepository
 from .apartment import ApartmentRepository
 from .query import QueryRepository
+from .revocation import RevocationRepository
 from .users import UsersRepository
@@ -1,6 +1,6 @@
 from fastapi import HTTPException
 from pydantic import UUID4
-from sqlalchemy import update
+from sqlalchemy import delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -13,8 +13,7 @@ class AdjustmentRepository:
     async def create(db: AsyncSession, guid: UUID4, subid: UUID4, model: AdjustmentCreate) -> Adjustment:
         adjustment = Adjustment(**model.dict())
         db.add(adjustment)
-        await db.commit()
-        await db.refresh(adjustment)
+        await db.flush()
         return adjustment
 
     @staticmethod
@@ -40,7 +39,26 @@ class AdjustmentRepository:
             raise HTTPException(400, "Должно быть задано хотя бы одно новое поле модели")
 
         await db.execute(update(Adjustment).where(Adjustment.guid == adjid).values(**model.dict(exclude_unset=True)))
-        await db.commit()
+        await db.flush()
         await db.refresh(adjustment)
 
         return adjustment
+
+    @staticmethod
+    async def delete_orphans(db: AsyncSession, limit: int) -> int:
+        orphans = (
+            select(Adjustment.guid)
+            .where(
+                Adjustment.apartment_guid.is_(None),
+                Adjustment.analog_calculated_guid.is_(None),
+                Adjustment.analog_user_guid.is_(None),
+                Adjustment.pool_calculated_guid.is_(None),
+                Adjustment.pool_user_guid.is_(None),
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        res = await db.execute(
+            delete(Adjustment).where(Adjustment.guid.in_(orphans)).execution_options(synchronize_session=False)
+        )
+        return res.rowcount
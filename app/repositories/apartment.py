@@ -1,36 +1,186 @@
-from typing import List
+from decimal import Decimal
+from typing import AsyncIterator, List, Optional
 
 from fastapi import HTTPException
 from pydantic import UUID4
-from sqlalchemy import BigInteger, delete, update
+from sqlalchemy import and_, delete, tuple_, union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.sql.expression import cast
+from sqlalchemy.orm import aliased, joinedload, selectinload
 
-from app.database.tables import Apartment
+from app.config import config
+from app.database.tables import Apartment, SubQuery
 from app.models import ApartmentCreate, ApartmentPatch
+from app.models.enums import ApartmentRole, ApartmentSortField, SortByEnum
 from app.repositories.query import QueryRepository
 
+apartment_roles = {
+    ApartmentRole.INPUT: Apartment.input_apartments_guid,
+    ApartmentRole.ANALOGS: Apartment.analogs_guid,
+    ApartmentRole.SELECTED: Apartment.selected_analogs_guid,
+    ApartmentRole.OUTPUT: Apartment.output_apartments_guid,
+}
+apartment_sort_fields = {
+    ApartmentSortField.PRICE: Apartment.price,
+    ApartmentSortField.M2PRICE: Apartment.m2price,
+    ApartmentSortField.AREA: Apartment.apartment_area,
+    ApartmentSortField.METRO: Apartment.distance_to_metro,
+}
+
 
 class ApartmentRepository:
     @staticmethod
     async def create(db: AsyncSession, guid: UUID4, subid: UUID4, model: ApartmentCreate) -> Apartment:
-        aparment = Apartment(**model.dict())
-        db.add(aparment)
-        await db.commit()
-        await db.refresh(aparment)
         subquery = await QueryRepository.get_subquery(db, subid)
-        subquery.analogs.append(aparment)
-        await db.commit()
-        await db.refresh(subquery)
-        return aparment
+        if subquery is None:
+            raise HTTPException(404, "Подзапрос не найден")
+        aparment = Apartment(**model.dict(), analogs_guid=subquery.guid)
+        db.add(aparment)
+        await db.flush()
+        return await ApartmentRepository.get(db, guid, subid, aparment.guid)
+
+    @staticmethod
+    def _after(column, order: SortByEnum, value: Optional[Decimal], guid: UUID4) -> list:
+        # NULLs sort last ascending and first descending. A page that crosses them
+        # is read as two index ranges instead of an OR the index can't answer.
+        if order == SortByEnum.DESC:
+            if value is None:
+                return [and_(column.is_(None), Apartment.guid < guid), column.isnot(None)]
+            return [tuple_(column, Apartment.guid) < tuple_(value, guid)]
+
+        if value is None:
+            return [and_(column.is_(None), Apartment.guid > guid)]
+        return [tuple_(column, Apartment.guid) > tuple_(value, guid), column.is_(None)]
+
+    @staticmethod
+    def _order_by(query, column, order: SortByEnum, guid):
+        if order == SortByEnum.DESC:
+            return query.order_by(column.desc(), guid.desc())
+        return query.order_by(column.asc(), guid.asc())
+
+    @staticmethod
+    def _page(query, column, order: SortByEnum, after: Optional[tuple[Optional[Decimal], UUID4]], limit: int):
+        ranges = ApartmentRepository._after(column, order, *after) if after else [None]
+        if len(ranges) == 1:
+            if ranges[0] is not None:
+                query = query.where(ranges[0])
+            return query.options(joinedload(Apartment.adjustment)).limit(limit)
+
+        page = aliased(Apartment, union_all(*(query.where(r).limit(limit) for r in ranges)).subquery())
+        query = ApartmentRepository._order_by(select(page), getattr(page, column.key), order, page.guid)
+        return query.options(joinedload(page.adjustment)).limit(limit)
+
+    @staticmethod
+    async def has_sub_query(db: AsyncSession, guid: UUID4, subid: UUID4) -> bool:
+        res = await db.execute(select(SubQuery.guid).where(SubQuery.guid == subid, SubQuery.query_guid == guid))
+        return res.scalar() is not None
+
+    @staticmethod
+    def _select(
+        subid: UUID4,
+        role: ApartmentRole,
+        sort: ApartmentSortField,
+        order: SortByEnum,
+        price_min: Optional[int],
+        price_max: Optional[int],
+        m2price_min: Optional[int],
+        m2price_max: Optional[int],
+        area_min: Optional[Decimal],
+        area_max: Optional[Decimal],
+        metro_min: Optional[int],
+        metro_max: Optional[int],
+    ):
+        column = apartment_sort_fields[sort]
+        query = select(Apartment).where(apartment_roles[role] == subid)
+        for field, lower, upper in (
+            (Apartment.price, price_min, price_max),
+            (Apartment.m2price, m2price_min, m2price_max),
+            (Apartment.apartment_area, area_min, area_max),
+            (Apartment.distance_to_metro, metro_min, metro_max),
+        ):
+            if lower is not None:
+                query = query.where(field >= lower)
+            if upper is not None:
+                query = query.where(field <= upper)
+        return ApartmentRepository._order_by(query, column, order, Apartment.guid)
 
     @staticmethod
     async def get_all(
-        db: AsyncSession, guid: UUID4, subid: UUID4, offset: int = 0, limit: int = 100
-    ) -> List[Apartment]:
-        res = await db.execute(select(Apartment).offset(cast(offset, BigInteger)).limit(limit))
-        return res.scalars().unique().all()
+        db: AsyncSession,
+        guid: UUID4,
+        subid: UUID4,
+        role: ApartmentRole,
+        sort: ApartmentSortField,
+        order: SortByEnum,
+        price_min: Optional[int],
+        price_max: Optional[int],
+        m2price_min: Optional[int],
+        m2price_max: Optional[int],
+        area_min: Optional[Decimal],
+        area_max: Optional[Decimal],
+        metro_min: Optional[int],
+        metro_max: Optional[int],
+        after: Optional[tuple[Optional[Decimal], UUID4]],
+        limit: int = 100,
+    ) -> Optional[List[Apartment]]:
+        if not await ApartmentRepository.has_sub_query(db, guid, subid):
+            return None
+
+        query = ApartmentRepository._select(
+            subid,
+            role,
+            sort,
+            order,
+            price_min,
+            price_max,
+            m2price_min,
+            m2price_max,
+            area_min,
+            area_max,
+            metro_min,
+            metro_max,
+        )
+        query = ApartmentRepository._page(query, apartment_sort_fields[sort], order, after, limit)
+        res = await db.execute(query.execution_options(populate_existing=True))
+        return res.scalars().all()
+
+    @staticmethod
+    async def stream(
+        db: AsyncSession,
+        subid: UUID4,
+        role: ApartmentRole,
+        sort: ApartmentSortField,
+        order: SortByEnum,
+        price_min: Optional[int],
+        price_max: Optional[int],
+        m2price_min: Optional[int],
+        m2price_max: Optional[int],
+        area_min: Optional[Decimal],
+        area_max: Optional[Decimal],
+        metro_min: Optional[int],
+        metro_max: Optional[int],
+    ) -> AsyncIterator[List[Apartment]]:
+        query = ApartmentRepository._select(
+            subid,
+            role,
+            sort,
+            order,
+            price_min,
+            price_max,
+            m2price_min,
+            m2price_max,
+            area_min,
+            area_max,
+            metro_min,
+            metro_max,
+        )
+        res = await db.stream_scalars(
+            query.options(selectinload(Apartment.adjustment)).execution_options(
+                yield_per=config.BACKEND_STREAM_CHUNK_SIZE
+            )
+        )
+        async for apartments in res.partitions():
+            yield apartments
 
     @staticmethod
     async def get(
@@ -39,7 +189,12 @@ class ApartmentRepository:
         subid: UUID4,
         aid: UUID4,
     ) -> Apartment:
-        res = await db.execute(select(Apartment).where(Apartment.guid == aid).limit(1))
+        res = await db.execute(
+            select(Apartment)
+            .where(Apartment.guid == aid)
+            .options(joinedload(Apartment.adjustment))
+            .execution_options(populate_existing=True)
+        )
         return res.scalar()
 
     @staticmethod
@@ -50,10 +205,9 @@ class ApartmentRepository:
             raise HTTPException(404, "Квартира не найдена")
 
         await db.execute(update(Apartment).where(Apartment.guid == aid).values(**model.dict()))
-        await db.commit()
-        await db.refresh(apartment)
+        await db.flush()
 
-        return apartment
+        return await ApartmentRepository.get(db, guid, subid, aid)
 
     @staticmethod
     async def patch(db: AsyncSession, guid: UUID4, subid: UUID4, aid: UUID4, model: ApartmentPatch) -> Apartment:
@@ -66,12 +220,30 @@ class ApartmentRepository:
             raise HTTPException(400, "Должно быть задано хотя бы одно новое поле модели")
 
         await db.execute(update(Apartment).where(Apartment.guid == aid).values(**model.dict()))
-        await db.commit()
-        await db.refresh(apartment)
+        await db.flush()
 
-        return apartment
+        return await ApartmentRepository.get(db, guid, subid, aid)
 
     @staticmethod
     async def delete(db: AsyncSession, guid: UUID4, subid: UUID4, aid: UUID4) -> None:
         await db.execute(delete(Apartment).where(Apartment.guid == aid))
-        await db.commit()
+        await db.flush()
+
+    @staticmethod
+    async def delete_orphans(db: AsyncSession, limit: int) -> int:
+        orphans = (
+            select(Apartment.guid)
+            .where(
+                Apartment.input_apartments_guid.is_(None),
+                Apartment.standart_object_guid.is_(None),
+                Apartment.analogs_guid.is_(None),
+                Apartment.selected_analogs_guid.is_(None),
+                Apartment.output_apartments_guid.is_(None),
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        res = await db.execute(
+            delete(Apartment).where(Apartment.guid.in_(orphans)).execution_options(synchronize_session=False)
+        )
+        return res.rowcount
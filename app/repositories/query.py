@@ -1,15 +1,35 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Union
+from typing import List, Optional, Union
 
 from fastapi import HTTPException
 from pydantic import UUID4
-from sqlalchemy import BigInteger, asc, delete, desc, update
+from sqlalchemy import (
+    BigInteger,
+    Integer,
+    and_,
+    any_,
+    asc,
+    bindparam,
+    case,
+    delete,
+    desc,
+    distinct,
+    func,
+    literal,
+    or_,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, aggregate_order_by
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import joinedload, load_only, noload, selectinload
 from sqlalchemy.sql.expression import cast
 
+from app.cache import get_cache
 from app.database.tables import Apartment, Query, SubQuery
 from app.models import (
     AdjustmentCreate,
@@ -19,12 +39,82 @@ from app.models import (
     QueryCreateBaseApartment,
     QueryCreateUserApartments,
     QueryPatch,
+    QuerySubQueryUserApartments,
 )
-from app.models.enums import AdjustmentType, SortByEnum
+from app.models.enums import AdjustmentType, SortByEnum, SubQueryRelation
 from app.repositories.adjustment import AdjustmentRepository
 
 
+def load_apartments(relationship):
+    return selectinload(relationship).joinedload(Apartment.adjustment)
+
+
+subquery_graph_options = (
+    load_apartments(SubQuery.input_apartments),
+    load_apartments(SubQuery.standart_object),
+    load_apartments(SubQuery.analogs),
+    load_apartments(SubQuery.selected_analogs),
+    selectinload(SubQuery.adjustments_analog_calculated),
+    selectinload(SubQuery.adjustments_analog_user),
+    selectinload(SubQuery.adjustments_pool_calculated),
+    selectinload(SubQuery.adjustments_pool_user),
+    load_apartments(SubQuery.output_apartments),
+)
+query_graph_options = (selectinload(Query.sub_queries).options(*subquery_graph_options),)
+
+
+def sparse_query_graph_options(relations: List[SubQueryRelation], columns: Optional[List[str]], adjustment: bool):
+    options = []
+    for relation in relations:
+        attribute = getattr(SubQuery, relation.value)
+        loader = selectinload(attribute)
+        if attribute.property.mapper.class_ is Apartment:
+            apartment_options = [load_only(*(getattr(Apartment, column) for column in columns))] if columns else []
+            if adjustment:
+                apartment_options.append(joinedload(Apartment.adjustment))
+            loader = loader.options(*apartment_options)
+        options.append(loader)
+    return (selectinload(Query.sub_queries).options(*options),)
+
+
+def cache_key(guid: UUID4) -> str:
+    return f"query:{guid}"
+
+
 class QueryRepository:
+    @staticmethod
+    def _filter(
+        query,
+        start: datetime,
+        end: datetime,
+        segment: list[str],
+        walls: list[str],
+        floors_min: int,
+        floors_max: int,
+    ):
+        if start:
+            query = query.where(Query.created_at >= start)
+        if end:
+            query = query.where(Query.created_at <= end)
+
+        apartment_filters = []
+        if segment:
+            apartment_filters.append(Apartment.segment.in_(segment))
+        if walls:
+            apartment_filters.append(Apartment.walls.in_(walls))
+        if floors_min is not None:
+            apartment_filters.append(Apartment.floors >= floors_min)
+        if floors_max is not None:
+            apartment_filters.append(Apartment.floors <= floors_max)
+        if apartment_filters:
+            query = query.where(
+                select(Apartment.guid)
+                .join(SubQuery, Apartment.input_apartments_guid == SubQuery.guid)
+                .where(SubQuery.query_guid == Query.guid, *apartment_filters)
+                .exists()
+            )
+        return query
+
     @staticmethod
     async def create(db: AsyncSession, model: QueryCreate) -> Query:
         query = Query(
@@ -36,13 +126,13 @@ class QueryRepository:
         )
         for sub_query in model.sub_queries:
             sub_query_object = SubQuery(
+                rooms=min((apartment.rooms for apartment in sub_query.input_apartments or []), default=None),
                 input_apartments=[Apartment(**apartment.dict()) for apartment in sub_query.input_apartments],
             )
             query.sub_queries.append(sub_query_object)
         db.add(query)
-        await db.commit()
-        await db.refresh(query)
-        return query
+        await db.flush()
+        return await QueryRepository.get(db, query.guid, *query_graph_options)
 
     @staticmethod
     async def get_all(
@@ -57,48 +147,88 @@ class QueryRepository:
         limit: int = 0,
         offset: int = 100,
     ) -> List[Query]:
-        query = select(Query).offset(cast(offset, BigInteger)).limit(limit)
+        query = select(Query).options(noload(Query.sub_queries)).offset(cast(offset, BigInteger)).limit(limit)
         if sort:
             query = (
                 query.order_by(desc(Query.created_at))
                 if sort == SortByEnum.DESC
                 else query.order_by(asc(Query.created_at))
             )
-        if start:
-            query = query.where(Query.created_at >= start)
-        if end:
-            query = query.where(Query.created_at <= end)
-        if segment:
-            pass
-        if walls:
-            pass
-        if floors_min:
-            pass
-        if floors_max:
-            pass
+        query = QueryRepository._filter(query, start, end, segment, walls, floors_min, floors_max)
         res = await db.execute(query)
-        return res.scalars().unique().all()
+        return res.scalars().all()
 
     @staticmethod
-    async def get(db: AsyncSession, guid: UUID4) -> Query:
-        res = await db.execute(select(Query).where(Query.guid == guid).limit(1))
+    async def get_summary(
+        db: AsyncSession,
+        start: datetime,
+        end: datetime,
+        segment: list[str],
+        walls: list[str],
+        floors_min: int,
+        floors_max: int,
+        after: Optional[tuple[datetime, UUID4]],
+        limit: int,
+    ) -> List[Row]:
+        page = select(Query.guid, Query.name, Query.input_file, Query.output_file, Query.created_by, Query.created_at)
+        if after:
+            page = page.where(tuple_(Query.created_at, Query.guid) < tuple_(*after))
+        page = QueryRepository._filter(page, start, end, segment, walls, floors_min, floors_max)
+        page = page.order_by(desc(Query.created_at), desc(Query.guid)).limit(limit).subquery()
+
+        query = (
+            select(
+                page,
+                func.count(distinct(SubQuery.guid)).label("sub_queries_count"),
+                func.count(Apartment.guid).label("apartments_count"),
+                func.coalesce(
+                    func.array_agg(aggregate_order_by(distinct(Apartment.rooms), Apartment.rooms)).filter(
+                        Apartment.rooms.isnot(None)
+                    ),
+                    literal([], ARRAY(Integer)),
+                ).label("rooms"),
+            )
+            .select_from(page)
+            .outerjoin(SubQuery, SubQuery.query_guid == page.c.guid)
+            .outerjoin(Apartment, Apartment.input_apartments_guid == SubQuery.guid)
+            .group_by(*page.c)
+            .order_by(desc(page.c.created_at), desc(page.c.guid))
+        )
+        res = await db.execute(query)
+        return res.all()
+
+    @staticmethod
+    async def _invalidate(*guids: UUID4) -> None:
+        await get_cache().delete([cache_key(guid) for guid in guids])
+
+    @staticmethod
+    async def get_version(db: AsyncSession, guid: UUID4) -> Optional[int]:
+        res = await db.execute(select(Query.version).where(Query.guid == guid))
+        return res.scalar()
+
+    @staticmethod
+    async def get(db: AsyncSession, guid: UUID4, *options) -> Query:
+        res = await db.execute(
+            select(Query).where(Query.guid == guid).options(*options).execution_options(populate_existing=True)
+        )
         return res.scalar()
 
     @staticmethod
     async def update(db: AsyncSession, guid: UUID4, user: UUID4, model: QueryCreate) -> Query:
+        await QueryRepository._invalidate(guid)
         query = await QueryRepository.get(db, guid)
 
         if query is None:
             raise HTTPException(404, "Запрос не найден")
 
         await db.execute(update(Query).where(Query.guid == guid).values(**model.dict()))
-        await db.commit()
-        await db.refresh(query)
+        await db.flush()
 
-        return query
+        return await QueryRepository.get(db, guid, *query_graph_options)
 
     @staticmethod
     async def patch(db: AsyncSession, guid: UUID4, user: UUID4, model: QueryPatch) -> Query:
+        await QueryRepository._invalidate(guid)
         query = await QueryRepository.get(db, guid)
 
         if query is None:
@@ -108,56 +238,108 @@ class QueryRepository:
             raise HTTPException(400, "Должно быть задано хотя бы одно новое поле модели")
 
         await db.execute(update(Query).where(Query.guid == guid).values(**model.dict()))
-        await db.commit()
-        await db.refresh(query)
+        await db.flush()
 
-        return query
+        return await QueryRepository.get(db, guid, *query_graph_options)
 
     @staticmethod
     async def delete(db: AsyncSession, guid: UUID4) -> None:
+        await QueryRepository._invalidate(guid)
         await db.execute(delete(Query).where(Query.guid == guid))
-        await db.commit()
+        await db.flush()
+
+    @staticmethod
+    async def delete_many(db: AsyncSession, guids: List[UUID4]) -> None:
+        await QueryRepository._invalidate(*guids)
+        await db.execute(delete(Query).where(Query.guid.in_(guids)))
+        await db.flush()
 
     @staticmethod
-    async def get_subquery(db: AsyncSession, subguid: UUID4) -> SubQuery:
-        res = await db.execute(select(SubQuery).where(SubQuery.guid == subguid).limit(1))
+    async def get_subquery(db: AsyncSession, subguid: UUID4, *options) -> SubQuery:
+        res = await db.execute(
+            select(SubQuery).where(SubQuery.guid == subguid).options(*options).execution_options(populate_existing=True)
+        )
         return res.scalar()
 
     @staticmethod
     async def set_base(
         db: AsyncSession, guid: UUID4, subguid: UUID4, user: UUID4, stantart_object: QueryCreateBaseApartment
     ) -> Apartment:
+        await QueryRepository._invalidate(guid)
         await db.execute(
             update(Apartment).where(Apartment.guid == stantart_object.guid).values({"standart_object_guid": subguid})
         )
-        await db.commit()
-        res = await db.execute(select(Apartment).where(Apartment.guid == stantart_object.guid).limit(1))
+        await db.flush()
+        res = await db.execute(
+            select(Apartment)
+            .where(Apartment.guid == stantart_object.guid)
+            .options(joinedload(Apartment.adjustment))
+            .execution_options(populate_existing=True)
+        )
         return res.scalar()
 
     @staticmethod
     async def get_analogs(db: AsyncSession, guid: UUID4, subguid: UUID4) -> List[Apartment]:
-        subquery = await QueryRepository.get_subquery(db, subguid)
+        subquery = await QueryRepository.get_subquery(db, subguid, load_apartments(SubQuery.analogs))
         return subquery.analogs
 
     @staticmethod
     async def create_analogs(db: AsyncSession, guid: UUID4, subguid: UUID4, analogs: List[ApartmentCreate]) -> None:
-        subquery = await QueryRepository.get_subquery(db, subguid)
+        await QueryRepository._invalidate(guid)
+        subquery = await QueryRepository.get_subquery(db, subguid, selectinload(SubQuery.analogs))
         db_analogs = [Apartment(**apartment.dict()) for apartment in analogs]
         subquery.analogs = db_analogs
-        await db.commit()
-        await db.refresh(subquery)
+        await db.flush()
+
+    @staticmethod
+    async def _owns_subqueries(db: AsyncSession, guid: UUID4, subguids: set[UUID4]) -> bool:
+        res = await db.execute(select(SubQuery.guid).where(SubQuery.query_guid == guid, SubQuery.guid.in_(subguids)))
+        return set(res.scalars().all()) == subguids
+
+    @staticmethod
+    async def _select_analogs(db: AsyncSession, subguid: UUID4, guids: List[UUID4]) -> None:
+        selected = bindparam("guids", guids, type_=ARRAY(UUID(as_uuid=True)))
+        is_selected = and_(Apartment.analogs_guid == subguid, Apartment.guid == any_(selected))
+        await db.execute(
+            update(Apartment)
+            .where(or_(Apartment.selected_analogs_guid == subguid, is_selected))
+            .values(selected_analogs_guid=case((is_selected, literal(subguid, UUID(as_uuid=True))), else_=None))
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def get_selected_analogs(db: AsyncSession, subguids: List[UUID4]) -> List[Apartment]:
+        res = await db.execute(
+            select(Apartment)
+            .where(Apartment.selected_analogs_guid.in_(subguids))
+            .options(joinedload(Apartment.adjustment))
+            .execution_options(populate_existing=True)
+        )
+        return res.scalars().all()
 
     @staticmethod
     async def set_analogs(
         db: AsyncSession, guid: UUID4, subguid: UUID4, user: UUID4, analogs: QueryCreateUserApartments
-    ) -> SubQuery:
-        for analog in analogs.guids:
-            await db.execute(
-                update(Apartment).where(Apartment.guid == analog).values({"selected_analogs_guid": subguid})
-            )
-        await db.commit()
-        subquery = await QueryRepository.get_subquery(db, subguid)
-        return subquery
+    ) -> Optional[List[Apartment]]:
+        await QueryRepository._invalidate(guid)
+        if not await QueryRepository._owns_subqueries(db, guid, {subguid}):
+            return None
+
+        await QueryRepository._select_analogs(db, subguid, analogs.guids)
+        return await QueryRepository.get_selected_analogs(db, [subguid])
+
+    @staticmethod
+    async def set_analogs_bulk(
+        db: AsyncSession, guid: UUID4, user: UUID4, analogs: List[QuerySubQueryUserApartments]
+    ) -> Optional[List[Apartment]]:
+        await QueryRepository._invalidate(guid)
+        subguids = {analog.sub_query_guid for analog in analogs}
+        if not await QueryRepository._owns_subqueries(db, guid, subguids):
+            return None
+
+        for analog in analogs:
+            await QueryRepository._select_analogs(db, analog.sub_query_guid, analog.guids)
+        return await QueryRepository.get_selected_analogs(db, list(subguids))
 
     @staticmethod
     async def _nameddict(typename: str, keys: list[str | tuple]) -> str:
@@ -314,7 +496,10 @@ class QueryRepository:
 
     @staticmethod
     async def calculate_analogs(db: AsyncSession, guid: UUID4, subguid: UUID4, user: UUID4) -> Query:
-        subquery = await QueryRepository.get_subquery(db, subguid)
+        await QueryRepository._invalidate(guid)
+        subquery = await QueryRepository.get_subquery(
+            db, subguid, selectinload(SubQuery.standart_object), load_apartments(SubQuery.selected_analogs)
+        )
         standart_object = subquery.standart_object
         standart_object_m2price = 0
         analogs = subquery.selected_analogs
@@ -385,13 +570,16 @@ class QueryRepository:
             standart_object_m2price = 0
         standart_object.m2price = standart_object_m2price
         standart_object.price = standart_object_m2price * standart_object.apartment_area
-        await db.commit()
-        query = await QueryRepository.get(db, guid)
+        await db.flush()
+        query = await QueryRepository.get(db, guid, *query_graph_options)
         return query
 
     @staticmethod
     async def recalculate_analogs(db: AsyncSession, guid: UUID4, subguid: UUID4, user: UUID4) -> Query:
-        subquery = await QueryRepository.get_subquery(db, subguid)
+        await QueryRepository._invalidate(guid)
+        subquery = await QueryRepository.get_subquery(
+            db, subguid, selectinload(SubQuery.standart_object), load_apartments(SubQuery.selected_analogs)
+        )
         standart_object = subquery.standart_object
         standart_object_m2price = 0
         analogs = subquery.selected_analogs
@@ -456,8 +644,10 @@ class QueryRepository:
                 )
                 adjustment = await AdjustmentRepository.create(db, guid, subguid, model)
                 analog.adjustment = adjustment
-                await db.commit()
-        subquery = await QueryRepository.get_subquery(db, subguid)
+                await db.flush()
+        subquery = await QueryRepository.get_subquery(
+            db, subguid, selectinload(SubQuery.standart_object), load_apartments(SubQuery.selected_analogs)
+        )
         analogs = subquery.selected_analogs
         for analog in analogs:
             price_trade = analog.m2price * (1 + analog.adjustment.trade)
@@ -485,13 +675,16 @@ class QueryRepository:
             standart_object_m2price = 0
         standart_object.m2price = standart_object_m2price
         standart_object.price = standart_object_m2price * standart_object.apartment_area
-        await db.commit()
-        query = await QueryRepository.get(db, guid)
+        await db.flush()
+        query = await QueryRepository.get(db, guid, *query_graph_options)
         return query
 
     @staticmethod
     async def calculate_pool(db: AsyncSession, guid: UUID4, subguid: UUID4, user: UUID4) -> Query:
-        subquery = await QueryRepository.get_subquery(db, subguid)
+        await QueryRepository._invalidate(guid)
+        subquery = await QueryRepository.get_subquery(
+            db, subguid, selectinload(SubQuery.standart_object), load_apartments(SubQuery.input_apartments)
+        )
         standart_object = subquery.standart_object
         input_apartments = subquery.input_apartments
         repair_type = {
@@ -559,14 +752,20 @@ class QueryRepository:
             input_apartment.price = int(price_final * input_apartment.apartment_area)
             adjustment = await AdjustmentRepository.create(db, guid, subguid, model)
             input_apartment.adjustment = adjustment
-        await db.commit()
-        query = await QueryRepository.get(db, guid)
+        await db.flush()
+        query = await QueryRepository.get(db, guid, *query_graph_options)
         return query
 
+    @staticmethod
+    async def get_file_links(db: AsyncSession) -> set[str]:
+        res = await db.execute(select(Query.input_file, Query.output_file))
+        return {link for row in res for link in row if link}
+
     @staticmethod
     async def set_link(db: AsyncSession, guid: UUID4, link: str) -> Query:
+        await QueryRepository._invalidate(guid)
         query = await QueryRepository.get(db, guid)
         query.output_file = link
-        await db.commit()
+        await db.flush()
         await db.refresh(query)
         return query
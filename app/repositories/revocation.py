@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import UUID4
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.database.tables import RevokedToken
+
+
+class RevocationRepository:
+    @staticmethod
+    async def revoke(db: AsyncSession, jti: str, user: UUID4, expires_at: datetime) -> None:
+        await db.execute(
+            insert(RevokedToken)
+            .values(jti=jti, user_guid=user, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+        )
+
+    @staticmethod
+    async def is_revoked(db: AsyncSession, jti: str) -> bool:
+        res = await db.execute(select(RevokedToken.jti).where(RevokedToken.jti == jti).limit(1))
+        return res.scalar() is not None
+
+    @staticmethod
+    async def get_revoked(db: AsyncSession, since: Optional[datetime] = None) -> List[Row]:
+        query = select(RevokedToken.jti, RevokedToken.revoked_at).where(RevokedToken.expires_at > func.now())
+        if since is not None:
+            query = query.where(RevokedToken.revoked_at >= since)
+        res = await db.execute(query)
+        return res.all()
+
+    @staticmethod
+    async def purge(db: AsyncSession) -> int:
+        res = await db.execute(
+            delete(RevokedToken)
+            .where(RevokedToken.expires_at <= func.now())
+            .execution_options(synchronize_session=False)
+        )
+        return res.rowcount
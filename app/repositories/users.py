@@ -16,7 +16,7 @@ class UsersRepository:
     async def create(db: AsyncSession, model: UserCreate) -> User:
         user = User(**model.dict())
         db.add(user)
-        await db.commit()
+        await db.flush()
         await db.refresh(user)
         return user
 
@@ -44,14 +44,19 @@ class UsersRepository:
 
         from app.services.auth import crypt_password
 
-        model.password = crypt_password(model.password)
+        model.password = await crypt_password(model.password)
 
         await db.execute(update(User).where(User.guid == guid).values(**model.dict()))
-        await db.commit()
+        await db.flush()
         await db.refresh(user)
 
         return user
 
+    @staticmethod
+    async def set_password(db: AsyncSession, guid: UUID4, password: str) -> None:
+        await db.execute(update(User).where(User.guid == guid).values(password=password))
+        await db.flush()
+
     @staticmethod
     async def patch(db: AsyncSession, guid: UUID4, model: UserPatch) -> User:
         user = await UsersRepository.get(db, guid)
@@ -63,7 +68,7 @@ class UsersRepository:
             raise HTTPException(400, "Должно быть задано хотя бы одно новое поле модели")
 
         await db.execute(update(User).where(User.guid == guid).values(**model.dict()))
-        await db.commit()
+        await db.flush()
         await db.refresh(user)
 
         return user
@@ -71,4 +76,4 @@ class UsersRepository:
     @staticmethod
     async def delete(db: AsyncSession, guid: UUID4) -> None:
         await db.execute(delete(User).where(User.guid == guid))
-        await db.commit()
+        await db.flush()
@@ -9,10 +9,11 @@ from app.config import config
 from app.database.connection import get_session
 from app.models import AdjusmentGetValues, AdjustmentGet, AdjustmentPatch
 from app.models.enums import AdjustmentType
+from app.routers.route import ModelRoute
 from app.services import AdjustmentService
 from app.services.auth import verify_access_token
 
-router = APIRouter(prefix=config.BACKEND_PREFIX, dependencies=[Depends(verify_access_token)])
+router = APIRouter(prefix=config.BACKEND_PREFIX, dependencies=[Depends(verify_access_token)], route_class=ModelRoute)
 
 
 @router.get(
@@ -1,17 +1,21 @@
-from typing import List
+from decimal import Decimal
+from typing import Optional
 
 from fastapi import APIRouter, Depends, Path, Query
+from fastapi.responses import StreamingResponse
 from pydantic import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from app.config import config
-from app.database.connection import get_session
-from app.models import ApartmentCreate, ApartmentGet, ApartmentPatch
-from app.services import ApartmentService
+from app.database.connection import get_read_session, get_session
+from app.models import ApartmentCreate, ApartmentGet, ApartmentPage, ApartmentPatch
+from app.models.enums import ApartmentRole, ApartmentSortField, SortByEnum
+from app.routers.route import ModelRoute
+from app.services import ApartmentService, QueryService
 from app.services.auth import verify_access_token
 
-router = APIRouter(prefix=config.BACKEND_PREFIX, dependencies=[Depends(verify_access_token)])
+router = APIRouter(prefix=config.BACKEND_PREFIX, dependencies=[Depends(verify_access_token)], route_class=ModelRoute)
 
 
 @router.post(
@@ -33,28 +37,104 @@ async def create(
     return await apartment_service.create(db=db, guid=id, subid=subid, model=model)
 
 
+@router.get(
+    "/query/{id}/subquery/{subid}/apartment/stream",
+    response_class=StreamingResponse,
+    response_description="Поток квартир в формате NDJSON",
+    status_code=status.HTTP_200_OK,
+    description="Получить все квартиры подзапроса потоком в формате NDJSON (по одной квартире в строке) "
+    "с той же фильтрацией и сортировкой, что и постраничный список",
+    summary="Потоковая выгрузка квартир подзапроса",
+    # responses={},
+)
+async def stream(
+    id: UUID4 = Path(None, description="Id запроса"),
+    subid: UUID4 = Path(None, description="Id подзапроса"),
+    db: AsyncSession = Depends(get_read_session),
+    role: ApartmentRole = Query(ApartmentRole.INPUT, description="Роль квартир в подзапросе"),
+    sort: ApartmentSortField = Query(ApartmentSortField.PRICE, description="Поле сортировки"),
+    order: SortByEnum = Query(SortByEnum.ASC, description="Направление сортировки"),
+    price_min: Optional[int] = Query(None, description="Минимальная цена"),
+    price_max: Optional[int] = Query(None, description="Максимальная цена"),
+    m2price_min: Optional[int] = Query(None, description="Минимальная цена за квадратный метр"),
+    m2price_max: Optional[int] = Query(None, description="Максимальная цена за квадратный метр"),
+    area_min: Optional[Decimal] = Query(None, description="Минимальная площадь квартиры"),
+    area_max: Optional[Decimal] = Query(None, description="Максимальная площадь квартиры"),
+    metro_min: Optional[int] = Query(None, description="Минимальное расстояние до метро"),
+    metro_max: Optional[int] = Query(None, description="Максимальное расстояние до метро"),
+    apartment_service: ApartmentService = Depends(),
+):
+    return await apartment_service.stream(
+        db=db,
+        guid=id,
+        subid=subid,
+        role=role,
+        sort=sort,
+        order=order,
+        price_min=price_min,
+        price_max=price_max,
+        m2price_min=m2price_min,
+        m2price_max=m2price_max,
+        area_min=area_min,
+        area_max=area_max,
+        metro_min=metro_min,
+        metro_max=metro_max,
+    )
+
+
 @router.get(
     "/query/{id}/subquery/{subid}/apartment",
-    response_model=List[ApartmentGet],
-    response_description="Успешный возврат списка квартир",
+    dependencies=[Depends(QueryService.verify_version)],
+    response_model=ApartmentPage,
+    response_description="Успешный возврат страницы квартир",
     status_code=status.HTTP_200_OK,
-    description="Получить список всех квартир",
-    summary="Получение всех квартир",
+    description="Получить квартиры подзапроса (входные, аналоги, выбранные аналоги или выходные) "
+    "с фильтрацией, сортировкой и постраничной навигацией по курсору",
+    summary="Получение квартир подзапроса",
     # responses={},
 )
 async def get_all(
     id: UUID4 = Path(None, description="Id запроса"),
     subid: UUID4 = Path(None, description="Id подзапроса"),
-    db: AsyncSession = Depends(get_session),
-    limit: int = Query(100, ge=1),
-    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_session),
+    role: ApartmentRole = Query(ApartmentRole.INPUT, description="Роль квартир в подзапросе"),
+    sort: ApartmentSortField = Query(ApartmentSortField.PRICE, description="Поле сортировки"),
+    order: SortByEnum = Query(SortByEnum.ASC, description="Направление сортировки"),
+    price_min: Optional[int] = Query(None, description="Минимальная цена"),
+    price_max: Optional[int] = Query(None, description="Максимальная цена"),
+    m2price_min: Optional[int] = Query(None, description="Минимальная цена за квадратный метр"),
+    m2price_max: Optional[int] = Query(None, description="Максимальная цена за квадратный метр"),
+    area_min: Optional[Decimal] = Query(None, description="Минимальная площадь квартиры"),
+    area_max: Optional[Decimal] = Query(None, description="Максимальная площадь квартиры"),
+    metro_min: Optional[int] = Query(None, description="Минимальное расстояние до метро"),
+    metro_max: Optional[int] = Query(None, description="Максимальное расстояние до метро"),
+    cursor: Optional[str] = Query(None, description="Курсор страницы из поля nextCursor предыдущего ответа"),
+    limit: int = Query(100, ge=1, le=1000),
     apartment_service: ApartmentService = Depends(),
 ):
-    return await apartment_service.get_all(db=db, guid=id, subid=subid, limit=limit, offset=offset)
+    return await apartment_service.get_all(
+        db=db,
+        guid=id,
+        subid=subid,
+        role=role,
+        sort=sort,
+        order=order,
+        price_min=price_min,
+        price_max=price_max,
+        m2price_min=m2price_min,
+        m2price_max=m2price_max,
+        area_min=area_min,
+        area_max=area_max,
+        metro_min=metro_min,
+        metro_max=metro_max,
+        cursor=cursor,
+        limit=limit,
+    )
 
 
 @router.get(
     "/query/{id}/subquery/{subid}/apartment/{aid}",
+    dependencies=[Depends(QueryService.verify_version)],
     response_model=ApartmentGet,
     response_description="Успешный возврат квартиры",
     status_code=status.HTTP_200_OK,
@@ -66,7 +146,7 @@ async def get(
     id: UUID4 = Path(None, description="Id запроса"),
     subid: UUID4 = Path(None, description="Id подзапроса"),
     aid: UUID4 = Path(None, description="Id квартиры"),
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     apartment_service: ApartmentService = Depends(),
 ):
     return await apartment_service.get(db=db, guid=id, subid=subid, aid=aid)
@@ -4,10 +4,12 @@ from starlette import status
 
 from app.config import config
 from app.database import get_session
-from app.models import Token, UserAuth, UserCreate
+from app.models import Principal, Token, UserAuth, UserCreate
+from app.routers.route import ModelRoute
 from app.services import AuthService
+from app.services.auth import verify_access_token
 
-router = APIRouter(prefix=config.BACKEND_PREFIX)
+router = APIRouter(prefix=config.BACKEND_PREFIX, route_class=ModelRoute)
 
 
 @router.post(
@@ -34,3 +36,19 @@ async def signin(model: UserAuth, db: AsyncSession = Depends(get_session), auth_
 )
 async def signup(model: UserCreate, db: AsyncSession = Depends(get_session), auth_service: AuthService = Depends()):
     return await auth_service.signup(db=db, model=model)
+
+
+@router.post(
+    "/logout",
+    response_description="Успешный выход из сервиса",
+    status_code=status.HTTP_204_NO_CONTENT,
+    description="Выйти из сервиса и отозвать текущий токен авторизации",
+    summary="Выход из сервиса",
+    # responses={},
+)
+async def logout(
+    principal: Principal = Depends(verify_access_token),
+    db: AsyncSession = Depends(get_session),
+    auth_service: AuthService = Depends(),
+):
+    return await auth_service.logout(db=db, principal=principal)
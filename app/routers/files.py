@@ -0,0 +1,41 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Path, Query, Request
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette import status
+from starlette.responses import FileResponse
+
+from app.config import config
+from app.services import FilesService
+from app.services.auth import optional_bearer_scheme
+from app.storage import Storage, get_storage
+
+router = APIRouter(prefix=config.BACKEND_PREFIX)
+
+
+@router.get(
+    "/files/{key:path}",
+    response_class=FileResponse,
+    response_description="Успешный возврат файла",
+    status_code=status.HTTP_200_OK,
+    description="Скачать файл из локального хранилища по подписанной ссылке или с токеном авторизации",
+    summary="Скачивание файла",
+    # responses={},
+)
+async def get(
+    request: Request,
+    key: str = Path(..., description="Имя файла"),
+    expires: Optional[int] = Query(None, description="Время истечения ссылки (unix time)"),
+    signature: Optional[str] = Query(None, description="Подпись ссылки"),
+    access_token: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer_scheme),
+    storage: Storage = Depends(get_storage),
+    files_service: FilesService = Depends(),
+):
+    return await files_service.get(
+        request=request,
+        storage=storage,
+        key=key,
+        expires=expires,
+        signature=signature,
+        access_token=access_token,
+    )
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends
+from starlette import status
+
+from app.config import config
+from app.models import CacheGet, DatabasePoolGet
+from app.routers.route import ModelRoute
+from app.services import CacheService, DatabaseService
+from app.services.auth import verify_admin
+
+router = APIRouter(
+    prefix=f"{config.BACKEND_PREFIX}/internal", dependencies=[Depends(verify_admin)], route_class=ModelRoute
+)
+
+
+@router.get(
+    "/database/pool",
+    response_model=DatabasePoolGet,
+    response_description="Успешный возврат состояния пула соединений",
+    status_code=status.HTTP_200_OK,
+    description="Получить состояние пула соединений с базой данных текущего воркера",
+    summary="Состояние пула соединений",
+    # responses={},
+)
+async def get_database_pool(
+    database_service: DatabaseService = Depends(),
+):
+    return await database_service.get_pool()
+
+
+@router.get(
+    "/cache",
+    response_model=CacheGet,
+    response_description="Успешный возврат состояния кэша",
+    status_code=status.HTTP_200_OK,
+    description="Получить состояние кэша ответов текущего воркера: попадания, промахи и вытеснения",
+    summary="Состояние кэша ответов",
+    # responses={},
+)
+async def get_cache(
+    cache_service: CacheService = Depends(),
+):
+    return await cache_service.get_stats()
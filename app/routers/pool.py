@@ -1,18 +1,20 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Path, Query, UploadFile
 from pydantic import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from app.config import config
 from app.database import get_session
-from app.models import QueryExport, QueryGet
+from app.models import ExportJobGet, QueryExport, QueryGet
 from app.models.enums.file import AllowedFileTypes
-from app.services import PoolService
+from app.routers.route import ModelRoute
+from app.services import ExportService, PoolService
 from app.services.auth import get_user_from_access_token, verify_access_token
+from app.storage import Storage, get_storage
 
-router = APIRouter(prefix=config.BACKEND_PREFIX, dependencies=[Depends(verify_access_token)])
+router = APIRouter(prefix=config.BACKEND_PREFIX, dependencies=[Depends(verify_access_token)], route_class=ModelRoute)
 
 
 @router.post(
@@ -29,12 +31,13 @@ async def create(
     file: UploadFile = File(description="Excel таблица с пулом"),
     user: UUID4 = Depends(get_user_from_access_token),
     db: AsyncSession = Depends(get_session),
+    storage: Storage = Depends(get_storage),
     pool_service: PoolService = Depends(),
 ):
     if not AllowedFileTypes.has_value(file.content_type):
         raise HTTPException(400, detail="Неверный тип файла. Доступные типы: xlsx, xls, csv")
 
-    return await pool_service.create(db=db, user=user, name=name, file=file)
+    return await pool_service.create(db=db, storage=storage, user=user, name=name, file=file)
 
 
 @router.get(
@@ -52,8 +55,55 @@ async def export(
     split_by_lists: bool = Query(False, description="Разбить данные по листам", alias="splitByLists"),
     user: UUID4 = Depends(get_user_from_access_token),
     db: AsyncSession = Depends(get_session),
+    storage: Storage = Depends(get_storage),
     pool_service: PoolService = Depends(),
 ):
     return await pool_service.export(
-        db=db, guid=id, include_adjustments=include_adjustments, split_by_lists=split_by_lists, user=user
+        db=db,
+        storage=storage,
+        guid=id,
+        include_adjustments=include_adjustments,
+        split_by_lists=split_by_lists,
+        user=user,
     )
+
+
+@router.post(
+    "/export/jobs",
+    response_model=ExportJobGet,
+    response_description="Задача экспорта пула успешно создана",
+    status_code=status.HTTP_202_ACCEPTED,
+    description="Создать задачу экспорта пула в файл. Одинаковые активные задачи объединяются в одну",
+    summary="Создание задачи экспорта пула",
+    # responses={},
+)
+async def create_export_job(
+    id: UUID4 = Query(description="Id запроса"),
+    include_adjustments: bool = Query(False, description="Включить корректировки", alias="includeAdjustments"),
+    split_by_lists: bool = Query(False, description="Разбить данные по листам", alias="splitByLists"),
+    user: UUID4 = Depends(get_user_from_access_token),
+    export_service: ExportService = Depends(),
+):
+    return await export_service.create(
+        guid=id, include_adjustments=include_adjustments, split_by_lists=split_by_lists, user=user
+    )
+
+
+@router.get(
+    "/export/jobs/{id}",
+    response_model=ExportJobGet,
+    response_description="Успешный возврат задачи экспорта пула",
+    status_code=status.HTTP_200_OK,
+    description="Получить статус и прогресс задачи экспорта пула, а также ссылку на файл после завершения. "
+    "С параметром wait запрос ждёт завершения задачи указанное количество секунд. "
+    "Задачи хранятся в памяти процесса, поэтому поддерживается только один воркер",
+    summary="Получение задачи экспорта пула",
+    # responses={},
+)
+async def get_export_job(
+    id: UUID4 = Path(None, description="Id задачи экспорта"),
+    wait: int = Query(0, ge=0, le=60, description="Сколько секунд ждать завершения задачи"),
+    user: UUID4 = Depends(get_user_from_access_token),
+    export_service: ExportService = Depends(),
+):
+    return await export_service.get(guid=id, user=user, wait=wait)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, Path, Query
 from pydantic import UUID4
@@ -7,26 +7,27 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from app.config import config
-from app.database.connection import get_session
-from app.models import QueryCreate, QueryGet, QueryPatch
-from app.models.enums import SortByEnum
+from app.database.connection import get_read_session, get_session
+from app.models import QueryCreate, QueryGet, QueryListItem, QueryPatch, QuerySummaryPage
+from app.models.enums import ApartmentField, SortByEnum, SubQueryRelation
+from app.routers.route import ModelResponse, ModelRoute
 from app.services import QueryService
 from app.services.auth import get_user_from_access_token, verify_access_token
 
-router = APIRouter(prefix=config.BACKEND_PREFIX, dependencies=[Depends(verify_access_token)])
+router = APIRouter(prefix=config.BACKEND_PREFIX, dependencies=[Depends(verify_access_token)], route_class=ModelRoute)
 
 
 @router.get(
     "/query",
-    response_model=list[QueryGet],
+    response_model=list[QueryListItem],
     response_description="Успешный возврат списка запросов",
     status_code=status.HTTP_200_OK,
-    description="Получить список всех запросов",
+    description="Получить список всех запросов без подзапросов. Подзапросы возвращаются в GET /query/{id}",
     summary="Получение всех запросов",
     # responses={},
 )
 async def get_all(
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     sort: SortByEnum = Query(None, description="Cортировка"),
     start: datetime = Query(None, description="Дата начала"),
     end: datetime = Query(None, description="Дата окончания"),
@@ -52,21 +53,80 @@ async def get_all(
     )
 
 
+@router.delete(
+    "/query",
+    response_description="Успешное удаление запросов",
+    status_code=status.HTTP_204_NO_CONTENT,
+    description="Удалить несколько запросов по их id вместе с подзапросами, квартирами и корректировками",
+    summary="Удаление нескольких запросов",
+    # responses={},
+)
+async def delete_many(
+    ids: list[UUID4] = Query(..., description="Id запросов"),
+    db: AsyncSession = Depends(get_session),
+    query_service: QueryService = Depends(),
+):
+    return await query_service.delete_many(db=db, guids=ids)
+
+
+@router.get(
+    "/query/summary",
+    response_model=QuerySummaryPage,
+    response_description="Успешный возврат страницы кратких сведений о запросах",
+    status_code=status.HTTP_200_OK,
+    description="Получить краткие сведения о запросах (от новых к старым) с постраничной навигацией по курсору",
+    summary="Получение кратких сведений о запросах",
+    # responses={},
+)
+async def get_summary(
+    db: AsyncSession = Depends(get_read_session),
+    start: datetime = Query(None, description="Дата начала"),
+    end: datetime = Query(None, description="Дата окончания"),
+    segment: Optional[list[str]] = Query(None, description="Сегмент"),
+    walls: Optional[list[str]] = Query(None, description="Стены"),
+    floors_min: int = Query(None, description="Минимальное количество этажей"),
+    floors_max: int = Query(None, description="Максимальное количество этажей"),
+    cursor: Optional[str] = Query(None, description="Курсор страницы из поля nextCursor предыдущего ответа"),
+    limit: int = Query(100, ge=1, le=1000),
+    query_service: QueryService = Depends(),
+):
+    return await query_service.get_summary(
+        db=db,
+        start=start,
+        end=end,
+        segment=segment,
+        walls=walls,
+        floors_min=floors_min,
+        floors_max=floors_max,
+        cursor=cursor,
+        limit=limit,
+    )
+
+
 @router.get(
     "/query/{id}",
     response_model=QueryGet,
     response_description="Успешный возврат запроса",
     status_code=status.HTTP_200_OK,
-    description="Получить запрос по его id",
+    description="Получить запрос по его id. Параметры include, exclude и fields ограничивают загружаемые "
+    "коллекции подзапросов и поля квартир; незапрошенные данные не загружаются из базы и отсутствуют в ответе",
     summary="Получение запрос по id",
     # responses={},
 )
 async def get(
     id: UUID4 = Path(None, description="Id запроса"),
-    db: AsyncSession = Depends(get_session),
+    include: Optional[List[SubQueryRelation]] = Query(None, description="Загружаемые коллекции подзапросов"),
+    exclude: Optional[List[SubQueryRelation]] = Query(None, description="Исключаемые коллекции подзапросов"),
+    fields: Optional[List[ApartmentField]] = Query(None, description="Загружаемые поля квартир"),
+    version: int = Depends(QueryService.verify_version),
+    db: AsyncSession = Depends(get_read_session),
     query_service: QueryService = Depends(),
 ):
-    return await query_service.get(db=db, guid=id)
+    if include is None and exclude is None and fields is None:
+        return ModelResponse(await query_service.get_json(db=db, guid=id, version=version))
+
+    query = await query_service.get_sparse(db=db, guid=id, include=include, exclude=exclude, fields=fields)
+    return ModelResponse(query, exclude_unset=True)
 
 
 @router.put(
@@ -111,7 +171,7 @@ async def patch(
     "/query/{id}",
     response_description="Успешное удаление запроса",
     status_code=status.HTTP_204_NO_CONTENT,
-    description="Удалить запрос по его id",
+    description="Удалить запрос по его id вместе с подзапросами, квартирами и корректировками",
     summary="Удаление запрос по id",
     # responses={},
 )
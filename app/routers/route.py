@@ -0,0 +1,119 @@
+import asyncio
+import functools
+import typing
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import APIRoute, request_response
+
+from app.models.utils import dump_json, dump_msgpack
+
+SUB_RESPONSE_PARAM = "_sub_response"
+REQUEST_PARAM = "_request"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+JSON_MEDIA_RANGES = ("application/json", "application/*", "*/*")
+
+negotiated_media_type: ContextVar[str] = ContextVar("negotiated_media_type", default=ORJSONResponse.media_type)
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    if not accept:
+        return ORJSONResponse.media_type
+
+    ranges = {}
+    for media_range in accept.split(","):
+        media_type, *params = media_range.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        ranges[media_type.strip().lower()] = quality
+
+    msgpack_quality = max(ranges.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+    json_quality = max(ranges.get(media_range, 0.0) for media_range in JSON_MEDIA_RANGES)
+    if msgpack_quality > 0 and msgpack_quality >= json_quality:
+        return MSGPACK_MEDIA_TYPE
+    return ORJSONResponse.media_type
+
+
+class ModelResponse(ORJSONResponse):
+    def __init__(self, content: Any, exclude_unset: bool = False, **kwargs: Any) -> None:
+        self.exclude_unset = exclude_unset
+        kwargs.setdefault("media_type", negotiated_media_type.get())
+        super().__init__(content, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        if self.media_type == MSGPACK_MEDIA_TYPE:
+            return dump_msgpack(content, exclude_unset=self.exclude_unset)
+        if isinstance(content, bytes):
+            return content
+        return dump_json(content, exclude_unset=self.exclude_unset)
+
+
+class ModelRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, endpoint, **kwargs)
+        if self._is_trusted_model_route():
+            self.dependant.call = self._model_response_call(
+                self.dependant.call, self.dependant.response_param_name, self.dependant.request_param_name
+            )
+            self.dependant.response_param_name = self.dependant.response_param_name or SUB_RESPONSE_PARAM
+            self.dependant.request_param_name = self.dependant.request_param_name or REQUEST_PARAM
+            self.app = request_response(self.get_route_handler())
+
+    def _is_trusted_model_route(self) -> bool:
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        return (
+            self.response_model is not None
+            and issubclass(response_class, JSONResponse)
+            and asyncio.iscoroutinefunction(self.dependant.call)
+            and self.response_model_include is None
+            and self.response_model_exclude is None
+            and self.response_model_by_alias
+            and not self.response_model_exclude_unset
+            and not self.response_model_exclude_defaults
+            and not self.response_model_exclude_none
+        )
+
+    def _is_response_model(self, content: Any) -> bool:
+        if typing.get_origin(self.response_model) is list:
+            (model,) = typing.get_args(self.response_model)
+            return isinstance(content, list) and all(type(item) is model for item in content)
+        return type(content) is self.response_model
+
+    def _model_response_call(
+        self, call: Callable[..., Any], response_param: Optional[str], request_param: Optional[str]
+    ) -> Callable[..., Any]:
+        @functools.wraps(call)
+        async def model_response_call(**values: Any) -> Any:
+            sub_response = values[response_param] if response_param else values.pop(SUB_RESPONSE_PARAM)
+            request = values[request_param] if request_param else values.pop(REQUEST_PARAM)
+            media_type = negotiate_media_type(request.headers.get("Accept"))
+
+            token = negotiated_media_type.set(media_type)
+            try:
+                content = await call(**values)
+            finally:
+                negotiated_media_type.reset(token)
+
+            if self._is_response_model(content):
+                status_code = sub_response.status_code or self.status_code or 200
+                content = ModelResponse(content, status_code=status_code, media_type=media_type)
+            if isinstance(content, ModelResponse):
+                content.headers.raw.extend(sub_response.headers.raw)
+                content.headers.add_vary_header("Accept")
+                etag = content.headers.get("ETag")
+                if media_type == MSGPACK_MEDIA_TYPE and etag and not etag.startswith("W/"):
+                    content.headers["ETag"] = f"W/{etag}"
+            return content
+
+        return model_response_call
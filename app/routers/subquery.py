@@ -4,20 +4,22 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from app.config import config
-from app.database.connection import get_session
-from app.fixtures import set_analog_example_value, set_analogs_example_value
+from app.database.connection import get_read_session, get_session
+from app.fixtures import set_analog_example_value, set_analogs_bulk_example_value, set_analogs_example_value
 from app.models import (
     ApartmentCreate,
     ApartmentGet,
     QueryCreateBaseApartment,
     QueryCreateUserApartments,
     QueryGet,
+    QuerySubQueryUserApartments,
     SubQueryGet,
 )
+from app.routers.route import ModelRoute
 from app.services import QueryService
 from app.services.auth import get_user_from_access_token, verify_access_token
 
-router = APIRouter(prefix=config.BACKEND_PREFIX, dependencies=[Depends(verify_access_token)])
+router = APIRouter(prefix=config.BACKEND_PREFIX, dependencies=[Depends(verify_access_token)], route_class=ModelRoute)
 
 
 @router.post(
@@ -42,6 +44,7 @@ async def set_base(
 
 @router.get(
     "/query/{id}/subquery/{subid}/analogs",
+    dependencies=[Depends(QueryService.verify_version)],
     response_model=list[ApartmentGet],
     response_description="Успешный возврат списка аналогов",
     status_code=status.HTTP_200_OK,
@@ -52,7 +55,7 @@ async def set_base(
 async def get_analogs(
     id: UUID4 = Path(None, description="Id запроса"),
     subid: UUID4 = Path(None, description="Id подзапроса"),
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     query_service: QueryService = Depends(),
 ):
     return await query_service.get_analogs(db=db, guid=id, subguid=subid)
@@ -96,6 +99,27 @@ async def set_analogs(
     return await query_service.set_analogs(db=db, guid=id, subguid=subid, user=user, analogs=analogs)
 
 
+@router.post(
+    "/query/{id}/user-analogs",
+    response_model=list[SubQueryGet],
+    response_description="Аналоги успешно установлены",
+    status_code=status.HTTP_201_CREATED,
+    description="Установить выбранные аналоги сразу нескольким подзапросам запроса",
+    summary="Установка аналогов для нескольких подзапросов",
+    # responses={},
+)
+async def set_analogs_bulk(
+    analogs: list[QuerySubQueryUserApartments] = Body(
+        ..., description="Список аналогов по подзапросам", example=set_analogs_bulk_example_value
+    ),
+    id: UUID4 = Path(None, description="Id запроса"),
+    user: UUID4 = Depends(get_user_from_access_token),
+    db: AsyncSession = Depends(get_session),
+    query_service: QueryService = Depends(),
+):
+    return await query_service.set_analogs_bulk(db=db, guid=id, user=user, analogs=analogs)
+
+
 @router.post(
     "/query/{id}/subquery/{subid}/calculate-analogs",
     response_model=QueryGet,
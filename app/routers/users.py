@@ -6,12 +6,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from app.config import config
-from app.database.connection import get_session
+from app.database.connection import get_read_session, get_session
 from app.models import UserCreate, UserGet, UserPatch
+from app.routers.route import ModelRoute
 from app.services import UsersService
 from app.services.auth import verify_access_token
 
-router = APIRouter(prefix=config.BACKEND_PREFIX, dependencies=[Depends(verify_access_token)])
+router = APIRouter(prefix=config.BACKEND_PREFIX, dependencies=[Depends(verify_access_token)], route_class=ModelRoute)
 
 
 @router.post(
@@ -43,7 +44,7 @@ async def create(
     # responses={},
 )
 async def get_all(
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     limit: int = Query(100, ge=1),
     offset: int = Query(0, ge=0),
     users_service: UsersService = Depends(),
@@ -63,7 +64,7 @@ async def get_all(
 )
 async def get(
     id: UUID4 = Path(None, description="Id пользователя"),
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     users_service: UsersService = Depends(),
 ):
     return await users_service.get(db=db, guid=id)
@@ -81,7 +82,7 @@ async def get(
 )
 async def get(
     email: EmailStr = Path(None, description="Email пользователя"),
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     users_service: UsersService = Depends(),
 ):
     return await users_service.get_user_by_email(db=db, email=email)
@@ -1,6 +1,12 @@
 from .adjustment import AdjustmentService
 from .apartment import ApartmentService
 from .auth import AuthService
+from .cache import CacheService
+from .database import DatabaseService
+from .export import ExportService
+from .files import FilesService
 from .pool import PoolService
 from .query import QueryService
+from .revocation import RevocationService
+from .storage import StorageService
 from .users import UsersService
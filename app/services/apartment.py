@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import json
+from decimal import Decimal
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
 from fastapi import HTTPException, Response
+from fastapi.responses import StreamingResponse
 from pydantic import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import ApartmentCreate, ApartmentGet, ApartmentPatch
+from app.models import ApartmentCreate, ApartmentGet, ApartmentPage, ApartmentPatch
+from app.models.enums import ApartmentRole, ApartmentSortField, SortByEnum
+from app.models.utils import dump_json
 from app.repositories import ApartmentRepository
+from app.repositories.apartment import apartment_sort_fields
 
 
 class ApartmentService:
@@ -14,14 +25,112 @@ class ApartmentService:
         apartment = await ApartmentRepository.create(db, guid, subid, model)
         return ApartmentGet.from_orm(apartment)
 
+    @staticmethod
+    def _encode_cursor(sort: ApartmentSortField, order: SortByEnum, apartment: ApartmentGet) -> str:
+        value = getattr(apartment, apartment_sort_fields[sort].key)
+        payload = [sort.value, order.value, None if value is None else str(value), str(apartment.guid)]
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str, sort: ApartmentSortField, order: SortByEnum) -> tuple[Optional[Decimal], UUID4]:
+        try:
+            cursor_sort, cursor_order, value, guid = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if (cursor_sort, cursor_order) != (sort.value, order.value):
+                raise ValueError
+            if value is not None:
+                value = apartment_sort_fields[sort].type.python_type(value)
+            return value, UUID(guid)
+        except (binascii.Error, ArithmeticError, TypeError, ValueError):
+            raise HTTPException(400, "Некорректный курсор")
+
     @staticmethod
     async def get_all(
-        db: AsyncSession, guid: UUID4, subid: UUID4, offset: int = 0, limit: int = 100
-    ) -> list[ApartmentGet]:
-        apartments = await ApartmentRepository.get_all(db, guid, subid, offset=offset, limit=limit)
+        db: AsyncSession,
+        guid: UUID4,
+        subid: UUID4,
+        role: ApartmentRole,
+        sort: ApartmentSortField,
+        order: SortByEnum,
+        price_min: Optional[int],
+        price_max: Optional[int],
+        m2price_min: Optional[int],
+        m2price_max: Optional[int],
+        area_min: Optional[Decimal],
+        area_max: Optional[Decimal],
+        metro_min: Optional[int],
+        metro_max: Optional[int],
+        cursor: Optional[str],
+        limit: int = 100,
+    ) -> ApartmentPage:
+        after = ApartmentService._decode_cursor(cursor, sort, order) if cursor else None
+        apartments = await ApartmentRepository.get_all(
+            db,
+            guid,
+            subid,
+            role=role,
+            sort=sort,
+            order=order,
+            price_min=price_min,
+            price_max=price_max,
+            m2price_min=m2price_min,
+            m2price_max=m2price_max,
+            area_min=area_min,
+            area_max=area_max,
+            metro_min=metro_min,
+            metro_max=metro_max,
+            after=after,
+            limit=limit + 1,
+        )
         if apartments is None:
-            raise HTTPException(404, "Квартиры не найдены")
-        return [ApartmentGet.from_orm(a) for a in apartments]
+            raise HTTPException(404, "Подзапрос не найден")
+
+        items = [ApartmentGet.from_orm(a) for a in apartments[:limit]]
+        next_cursor = None
+        if len(apartments) > limit:
+            next_cursor = ApartmentService._encode_cursor(sort, order, items[-1])
+        return ApartmentPage(items=items, next_cursor=next_cursor)
+
+    @staticmethod
+    async def _ndjson(partitions: AsyncIterator[list]) -> AsyncIterator[bytes]:
+        async for apartments in partitions:
+            yield b"".join(dump_json(ApartmentGet.from_orm(a)) + b"\n" for a in apartments)
+
+    @staticmethod
+    async def stream(
+        db: AsyncSession,
+        guid: UUID4,
+        subid: UUID4,
+        role: ApartmentRole,
+        sort: ApartmentSortField,
+        order: SortByEnum,
+        price_min: Optional[int],
+        price_max: Optional[int],
+        m2price_min: Optional[int],
+        m2price_max: Optional[int],
+        area_min: Optional[Decimal],
+        area_max: Optional[Decimal],
+        metro_min: Optional[int],
+        metro_max: Optional[int],
+    ) -> StreamingResponse:
+        if not await ApartmentRepository.has_sub_query(db, guid, subid):
+            raise HTTPException(404, "Подзапрос не найден")
+
+        partitions = ApartmentRepository.stream(
+            db,
+            subid,
+            role=role,
+            sort=sort,
+            order=order,
+            price_min=price_min,
+            price_max=price_max,
+            m2price_min=m2price_min,
+            m2price_max=m2price_max,
+            area_min=area_min,
+            area_max=area_max,
+            metro_min=metro_min,
+            metro_max=metro_max,
+        )
+        return StreamingResponse(ApartmentService._ndjson(partitions), media_type="application/x-ndjson")
 
     @staticmethod
     async def get(db: AsyncSession, guid: UUID4, subid: UUID4, aid: UUID4) -> ApartmentGet:
@@ -1,52 +1,138 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
 from uuid import uuid4
 
 from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import jwt
 from jose.exceptions import JOSEError
-from passlib.hash import bcrypt
-from pydantic import UUID4
+from passlib.context import CryptContext
+from pydantic import UUID4, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import config
-from app.models import Token, UserAuth, UserCreate, UserGet
+from app.models import Principal, Token, UserAuth, UserCreate, UserGet
 from app.repositories import UsersRepository
+from app.services.revocation import RevocationService
 
 bearer_scheme = HTTPBearer()
+optional_bearer_scheme = HTTPBearer(auto_error=False)
+password_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=config.BACKEND_BCRYPT_ROUNDS)
+hashing_executor: Optional[ThreadPoolExecutor] = None
+hashing_jobs = 0
+hashing_jobs_lock = threading.Lock()
 
 
-def verify_access_token(access_token: HTTPAuthorizationCredentials = Depends(bearer_scheme)):
+verified_tokens: OrderedDict[bytes, tuple[float, Principal]] = OrderedDict()
+
+
+def _decode_access_token(token: str) -> Principal:
+    key = hashlib.sha256(token.encode()).digest()
+    now = time.monotonic()
+    cached = verified_tokens.get(key)
+    if cached is not None:
+        expires_at, principal = cached
+        if expires_at > now:
+            verified_tokens.move_to_end(key)
+            return principal
+        del verified_tokens[key]
+
     try:
-        jwt.decode(
-            access_token.credentials,
-            config.BACKEND_JWT_SECRET,
-            algorithms=[config.BACKEND_JWT_ALGORITHM],
-            options={"verify_aud": False},
+        principal = Principal.parse_obj(
+            jwt.decode(
+                token,
+                config.BACKEND_JWT_SECRET,
+                algorithms=[config.BACKEND_JWT_ALGORITHM],
+                options={"verify_aud": False},
+            )
         )
-    except JOSEError:
+    except (JOSEError, ValidationError):
         raise HTTPException(401, "Неверный токен авторизации", headers={"WWW-Authenticate": "Bearer"})
 
+    ttl = min(config.BACKEND_JWT_CACHE_TTL_SECONDS, principal.exp.timestamp() - time.time())
+    if ttl > 0 and config.BACKEND_JWT_CACHE_SIZE > 0:
+        verified_tokens[key] = (now + ttl, principal)
+        while len(verified_tokens) > config.BACKEND_JWT_CACHE_SIZE:
+            verified_tokens.popitem(last=False)
+    return principal
+
+
+async def verify_access_token(
+    request: Request, access_token: HTTPAuthorizationCredentials = Depends(bearer_scheme)
+) -> Principal:
+    principal = getattr(request.state, "principal", None)
+    if principal is None:
+        principal = _decode_access_token(access_token.credentials)
+        if await RevocationService.is_revoked(principal):
+            raise HTTPException(401, "Токен авторизации отозван", headers={"WWW-Authenticate": "Bearer"})
+        request.state.principal = principal
+    return principal
+
+
+async def verify_admin(principal: Principal = Depends(verify_access_token)) -> Principal:
+    admins = {email.lower() for email in config.BACKEND_ADMIN_EMAILS}
+    if principal.email is None or principal.email.lower() not in admins:
+        raise HTTPException(403, "Недостаточно прав для доступа к служебным данным")
+    return principal
+
+
+def get_user_from_access_token(principal: Principal = Depends(verify_access_token)) -> UUID4:
+    return principal.sub
 
-def get_user_from_access_token(request: Request) -> UUID4:
-    access_token = request.headers["Authorization"].split()[1]
-    info = jwt.decode(
-        access_token,
-        config.BACKEND_JWT_SECRET,
-        algorithms=[config.BACKEND_JWT_ALGORITHM],
-        options={"verify_aud": False},
-    )
-    return info["sub"]
 
+def _release_hashing_job(_: Future) -> None:
+    global hashing_jobs
+    with hashing_jobs_lock:
+        hashing_jobs -= 1
 
-def crypt_password(password: str) -> str:
-    return bcrypt.hash(password)
 
+async def _run_hashing(func: Callable[..., Any], *args: Any) -> Any:
+    global hashing_jobs
+    with hashing_jobs_lock:
+        if hashing_jobs >= config.BACKEND_HASHING_WORKERS + config.BACKEND_HASHING_QUEUE_SIZE:
+            raise HTTPException(
+                429, "Слишком много одновременных запросов, повторите позже", headers={"Retry-After": "1"}
+            )
+        hashing_jobs += 1
 
-def verify_password(password: str, hashed_password: str) -> bool:
-    return bcrypt.verify(password, hashed_password)
+    open_password_hashing()
+    future = hashing_executor.submit(func, *args)
+    future.add_done_callback(_release_hashing_job)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), config.BACKEND_HASHING_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise HTTPException(503, "Сервис временно перегружен, повторите позже", headers={"Retry-After": "5"})
+
+
+def open_password_hashing() -> None:
+    global hashing_executor
+    if hashing_executor is None:
+        hashing_executor = ThreadPoolExecutor(
+            max_workers=config.BACKEND_HASHING_WORKERS, thread_name_prefix="password-hashing"
+        )
+
+
+def close_password_hashing() -> None:
+    global hashing_executor
+    if hashing_executor is not None:
+        hashing_executor.shutdown(wait=False, cancel_futures=True)
+    hashing_executor = None
+
+
+async def crypt_password(password: str) -> str:
+    return await _run_hashing(password_context.hash, password)
+
+
+async def verify_password(password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    return await _run_hashing(password_context.verify_and_update, password, hashed_password)
 
 
 def get_payload(user: UserGet) -> dict[str, datetime | str]:
@@ -79,8 +165,11 @@ class AuthService:
         if not user:
             raise HTTPException(401, "Неверный логин или пароль")
 
-        if not verify_password(model.password, user.password):
+        verified, rehashed_password = await verify_password(model.password, user.password)
+        if not verified:
             raise HTTPException(401, "Неверный логин или пароль")
+        if rehashed_password is not None:
+            await UsersRepository.set_password(db, user.guid, rehashed_password)
 
         payload = get_payload(user=user)
         access_token = create_access_token(payload=payload)
@@ -93,10 +182,13 @@ class AuthService:
         if user:
             raise HTTPException(409, "Пользователь с таким email уже существует")
 
-        hashed_password = crypt_password(model.password)
+        hashed_password = await crypt_password(model.password)
         model.password = hashed_password
 
         user = await UsersRepository.create(db, model)
         payload = get_payload(user=user)
         access_token = create_access_token(payload=payload)
         return Token(access_token=access_token)
+
+    async def logout(self, db: AsyncSession, principal: Principal) -> None:
+        await RevocationService.revoke(db, principal)
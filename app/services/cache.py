@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import os
+
+from app.cache import get_cache
+from app.config import config
+from app.models import CacheGet
+
+
+class CacheService:
+    @staticmethod
+    async def get_stats() -> CacheGet:
+        cache = get_cache()
+        requests = cache.hits + cache.misses
+        return CacheGet(
+            pid=os.getpid(),
+            backend=config.CACHE_BACKEND,
+            entries=cache.entries(),
+            size_bytes=cache.size(),
+            max_bytes=config.CACHE_MAX_BYTES,
+            hits=cache.hits,
+            misses=cache.misses,
+            hit_rate=cache.hits / requests if requests else 0,
+            evictions=cache.evictions,
+        )
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import os
+
+from app.config import config
+from app.database.connection import engine
+from app.models import DatabasePoolGet
+
+
+class DatabaseService:
+    @staticmethod
+    async def get_pool() -> DatabasePoolGet:
+        pool = engine.sync_engine.pool
+        return DatabasePoolGet(
+            pid=os.getpid(),
+            size=pool.size(),
+            max_overflow=config.POSTGRES_MAX_OVERFLOW,
+            timeout=pool.timeout(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            checkouts=pool.checkouts,
+            timeouts=pool.timeouts,
+            wait_time_avg_ms=pool.wait_time_total / pool.checkouts * 1000 if pool.checkouts else 0,
+            wait_time_max_ms=pool.wait_time_max * 1000,
+        )
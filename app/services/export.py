@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from fastapi import HTTPException
+from loguru import logger
+from pydantic import UUID4
+from starlette.concurrency import run_in_threadpool
+
+from app.config import config
+from app.database.connection import async_session
+from app.models import ExportJobGet
+from app.models.enums import ExportJobStatus, StoredFileType
+from app.repositories import QueryRepository
+from app.services.pool import PoolService, send_file
+from app.services.query import QueryService
+from app.storage import get_storage
+
+# Jobs live in the memory of the worker that created them, so polling only works
+# while the backend runs a single worker process.
+_jobs: dict[UUID4, ExportJobGet] = {}
+_active_jobs: dict[tuple[UUID4, UUID4, bool, bool], UUID4] = {}
+_tasks: dict[UUID4, asyncio.Task] = {}
+
+
+class ExportService:
+    @staticmethod
+    def _prune_finished_jobs() -> None:
+        expired_at = datetime.utcnow() - timedelta(minutes=config.BACKEND_EXPORT_JOB_TTL_MINUTES)
+        for guid, job in list(_jobs.items()):
+            if job.status in (ExportJobStatus.DONE, ExportJobStatus.FAILED) and job.updated_at < expired_at:
+                del _jobs[guid]
+
+    @staticmethod
+    def _set_progress(job: ExportJobGet, sheets_done: int, rows_written: int) -> None:
+        job.sheets_done = sheets_done
+        job.rows_written = rows_written
+        job.updated_at = datetime.utcnow()
+
+    @staticmethod
+    async def _run(job: ExportJobGet) -> None:
+        job.status = ExportJobStatus.RUNNING
+        job.updated_at = datetime.utcnow()
+        try:
+            storage = get_storage()
+            async with async_session() as db, db.begin():
+                query = await QueryService.get(db=db, guid=job.query_guid)
+                job.sheets_total = len(query.sub_queries) if job.split_by_lists else 1
+
+                stream = await run_in_threadpool(
+                    PoolService._render_excel,
+                    query,
+                    job.include_adjustments,
+                    job.split_by_lists,
+                    lambda sheets_done, rows_written: ExportService._set_progress(job, sheets_done, rows_written),
+                )
+                filename = f"{StoredFileType.EXPORT.value}/{await PoolService._create_random_name()}.xlsx"
+                link = await send_file(storage=storage, file=stream, filename=filename)
+                await QueryRepository.set_link(db=db, guid=job.query_guid, link=link)
+
+            job.link = await storage.download_url(filename)
+            job.status = ExportJobStatus.DONE
+        except HTTPException as e:
+            job.error = e.detail
+            job.status = ExportJobStatus.FAILED
+        except Exception:
+            logger.exception(f"Export job {job.guid} failed")
+            job.error = "Отказано в обработке из-за неизвестной ошибки на сервере"
+            job.status = ExportJobStatus.FAILED
+        finally:
+            job.updated_at = datetime.utcnow()
+            _active_jobs.pop((job.query_guid, job.created_by, job.include_adjustments, job.split_by_lists), None)
+
+    @staticmethod
+    async def create(guid: UUID4, include_adjustments: bool, split_by_lists: bool, user: UUID4) -> ExportJobGet:
+        ExportService._prune_finished_jobs()
+
+        key = (guid, user, include_adjustments, split_by_lists)
+        if key in _active_jobs:
+            return _jobs[_active_jobs[key]]
+
+        created_at = datetime.utcnow()
+        job = ExportJobGet(
+            guid=uuid4(),
+            query_guid=guid,
+            include_adjustments=include_adjustments,
+            split_by_lists=split_by_lists,
+            created_by=user,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+        _jobs[job.guid] = job
+        _active_jobs[key] = job.guid
+
+        task = asyncio.create_task(ExportService._run(job))
+        _tasks[job.guid] = task
+        task.add_done_callback(lambda _: _tasks.pop(job.guid, None))
+        return job
+
+    @staticmethod
+    async def get(guid: UUID4, user: UUID4, wait: int = 0) -> ExportJobGet:
+        job = _jobs.get(guid)
+        if job is None or job.created_by != user:
+            raise HTTPException(404, "Задача экспорта не найдена")
+
+        task = _tasks.get(guid)
+        if wait and task is not None:
+            await asyncio.wait({task}, timeout=wait)
+        return job
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import HTTPException, Request
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.responses import FileResponse
+
+from app.services.auth import verify_access_token
+from app.storage import LocalStorage, Storage
+
+
+class FilesService:
+    @staticmethod
+    async def get(
+        request: Request,
+        storage: Storage,
+        key: str,
+        expires: Optional[int],
+        signature: Optional[str],
+        access_token: Optional[HTTPAuthorizationCredentials],
+    ) -> FileResponse:
+        if not isinstance(storage, LocalStorage):
+            raise HTTPException(404, "Файл не найден")
+
+        if expires is not None and signature is not None:
+            if not storage.verify(key, expires, signature):
+                raise HTTPException(403, "Ссылка на файл недействительна или устарела")
+        elif access_token is not None:
+            await verify_access_token(request, access_token)
+        else:
+            raise HTTPException(401, "Требуется авторизация", headers={"WWW-Authenticate": "Bearer"})
+
+        try:
+            path = storage.path(key)
+        except ValueError:
+            raise HTTPException(404, "Файл не найден")
+
+        if not path.is_file():
+            raise HTTPException(404, "Файл не найден")
+        return FileResponse(path, filename=path.name)
@@ -4,6 +4,7 @@ import asyncio
 import secrets
 from io import BytesIO
 from tempfile import NamedTemporaryFile
+from typing import BinaryIO, Callable, Optional, Union
 
 import aiohttp
 import openpyxl
@@ -14,19 +15,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import config
 from app.models import ApartmentCreate, QueryCreate, QueryExport, QueryGet, SubQueryCreate
+from app.models.enums import StoredFileType
 from app.repositories import QueryRepository
 from app.services.query import QueryService
-from app.storage import get_s3_client
+from app.storage import Storage
 
 
-async def send_file(file: bytes, filename: str) -> str:
-    async with get_s3_client() as client:
-        await client.put_object(
-            Bucket=config.STORAGE_BUCKET_NAME,
-            Key=f"{filename}",
-            Body=file,
-        )
-    return f"{config.STORAGE_ENDPOINT}/{config.STORAGE_BUCKET_NAME}/{filename}"
+async def send_file(storage: Storage, file: Union[bytes, BinaryIO], filename: str) -> str:
+    await storage.upload(key=filename, body=file)
+    return storage.url(filename)
 
 
 class PoolService:
@@ -100,10 +97,13 @@ class PoolService:
         return secrets.token_hex(8)
 
     @staticmethod
-    async def create(db: AsyncSession, user: UUID4, name: str, file: UploadFile) -> QueryGet:
-        read_file = await file.read()
+    async def create(db: AsyncSession, storage: Storage, user: UUID4, name: str, file: UploadFile) -> QueryGet:
         filename = await PoolService._create_random_name()
-        await send_file(file=read_file, filename=f"{filename}.xlsx")
+        input_file = await send_file(
+            storage=storage, file=file.file, filename=f"{StoredFileType.INPUT.value}/{filename}.xlsx"
+        )
+        await file.seek(0)
+        read_file = await file.read()
 
         df = pd.read_excel(BytesIO(read_file))
         df = PoolService._rename_columns(df)
@@ -136,15 +136,10 @@ class PoolService:
             sub_queries=sub_queries,
             created_by=user,
             updated_by=user,
-            input_file=f"{config.STORAGE_ENDPOINT}/{config.STORAGE_BUCKET_NAME}/{filename}.xlsx",
+            input_file=input_file,
         )
 
-        query_db = await QueryService.create(db=db, model=query)
-
-        for _ in range(len(query_db.sub_queries)):
-            query_db.sub_queries.sort(key=lambda x: x.input_apartments[0].rooms)
-
-        return query_db
+        return await QueryService.create(db=db, model=query)
 
     @staticmethod
     def _create_excel_columns(ws, include_adjustments: bool):
@@ -207,7 +202,7 @@ class PoolService:
                 cell.alignment = openpyxl.styles.Alignment(wrap_text=True, horizontal="center", vertical="center")
 
     @staticmethod
-    def _append_data_to_excel(ws, sub_query, include_adjustments: bool):
+    def _append_data_to_excel(ws, sub_query, include_adjustments: bool) -> int:
         for j in range(len(sub_query.input_apartments)):
             apartment = sub_query.input_apartments[j]
             row = [
@@ -244,13 +239,18 @@ class PoolService:
 
             ws.append(row)
 
+        return len(sub_query.input_apartments)
+
     @staticmethod
-    async def export(
-        db: AsyncSession, guid: UUID4, include_adjustments: bool, split_by_lists: bool, user: UUID4
-    ) -> QueryExport:
-        query = await QueryService.get(db=db, guid=guid)
+    def _render_excel(
+        query: QueryGet,
+        include_adjustments: bool,
+        split_by_lists: bool,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> bytes:
         wb = openpyxl.Workbook()
         ws = None
+        rows_written = 0
 
         if not split_by_lists:
             ws = wb.active
@@ -267,14 +267,31 @@ class PoolService:
                 ws = wb.create_sheet(f"SubQuery {i+1}")
                 PoolService._create_excel_columns(ws, include_adjustments)
 
-            PoolService._append_data_to_excel(ws, sub_query, include_adjustments)
+            rows_written += PoolService._append_data_to_excel(ws, sub_query, include_adjustments)
+            if progress is not None:
+                progress(i + 1 if split_by_lists else 0, rows_written)
 
         with NamedTemporaryFile() as tmp:
             wb.save(tmp.name)
             tmp.seek(0)
             stream = tmp.read()
-        filename = await PoolService._create_random_name()
-        await send_file(file=bytes(stream), filename=f"{filename}.xlsx")
-        link = f"{config.STORAGE_ENDPOINT}/{config.STORAGE_BUCKET_NAME}/{filename}.xlsx"
+
+        if progress is not None and not split_by_lists:
+            progress(1, rows_written)
+        return bytes(stream)
+
+    @staticmethod
+    async def export(
+        db: AsyncSession,
+        storage: Storage,
+        guid: UUID4,
+        include_adjustments: bool,
+        split_by_lists: bool,
+        user: UUID4,
+    ) -> QueryExport:
+        query = await QueryService.get(db=db, guid=guid)
+        stream = PoolService._render_excel(query, include_adjustments, split_by_lists)
+        filename = f"{StoredFileType.EXPORT.value}/{await PoolService._create_random_name()}.xlsx"
+        link = await send_file(storage=storage, file=stream, filename=filename)
         await QueryRepository.set_link(db=db, guid=guid, link=link)
-        return QueryExport(link=link)
+        return QueryExport(link=await storage.download_url(filename))
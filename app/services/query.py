@@ -1,39 +1,68 @@
 from __future__ import annotations
 
+import base64
+import binascii
 from datetime import datetime
+from typing import Optional
+from uuid import UUID
 
-from fastapi import HTTPException, Response
+from fastapi import Depends, HTTPException, Path, Request, Response, status
 from pydantic import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import get_cache
+from app.database.connection import get_read_session
 from app.models import (
+    AdjustmentGet,
     ApartmentCreate,
     ApartmentGet,
     QueryCreate,
     QueryCreateBaseApartment,
     QueryCreateUserApartments,
     QueryGet,
+    QueryListItem,
     QueryPatch,
+    QuerySubQueryUserApartments,
+    QuerySummary,
+    QuerySummaryPage,
     SubQueryGet,
 )
-from app.models.enums import SortByEnum
+from app.models.enums import ApartmentField, SortByEnum, SubQueryRelation
+from app.models.utils import dump_json
 from app.repositories import QueryRepository
+from app.repositories.query import cache_key, query_graph_options, sparse_query_graph_options
+
+adjustment_relations = {
+    SubQueryRelation.ADJUSTMENTS_ANALOG_CALCULATED,
+    SubQueryRelation.ADJUSTMENTS_ANALOG_USER,
+    SubQueryRelation.ADJUSTMENTS_POOL_CALCULATED,
+    SubQueryRelation.ADJUSTMENTS_POOL_USER,
+}
 
 
 class QueryService:
     @staticmethod
-    def _sort_by_rooms(query: QueryGet) -> QueryGet:
-        for _ in range(len(query.sub_queries)):
-            query.sub_queries.sort(key=lambda x: x.input_apartments[0].rooms)
+    async def verify_version(
+        request: Request,
+        response: Response,
+        id: UUID4 = Path(None, description="Id запроса"),
+        db: AsyncSession = Depends(get_read_session),
+    ) -> int:
+        version = await QueryRepository.get_version(db, id)
+        if version is None:
+            raise HTTPException(404, "Запрос не найден")
 
-        return query
+        etag = f'"{version}"'
+        if_none_match = [tag.strip() for tag in request.headers.get("If-None-Match", "").split(",")]
+        if "*" in if_none_match or etag in if_none_match or f"W/{etag}" in if_none_match:
+            raise HTTPException(status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return version
 
     @staticmethod
     async def create(db: AsyncSession, model: QueryCreate) -> QueryGet:
         query = await QueryRepository.create(db, model)
-        query = QueryGet.from_orm(query)
-
-        return QueryService._sort_by_rooms(query)
+        return QueryGet.from_orm(query)
 
     @staticmethod
     async def get_all(
@@ -47,7 +76,7 @@ class QueryService:
         floors_max: int,
         limit: int = 0,
         offset: int = 100,
-    ) -> list[QueryGet]:
+    ) -> list[QueryListItem]:
         queries = await QueryRepository.get_all(
             db=db,
             sort=sort,
@@ -62,34 +91,145 @@ class QueryService:
         )
         if queries is None:
             raise HTTPException(404, "Запросы не найдены")
-        return [QueryService._sort_by_rooms(QueryGet.from_orm(q)) for q in queries]
+        return [QueryListItem.from_orm(q) for q in queries]
+
+    @staticmethod
+    def _encode_cursor(created_at: datetime, guid: UUID4) -> str:
+        return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{guid}".encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[datetime, UUID4]:
+        try:
+            created_at, guid = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            return datetime.fromisoformat(created_at), UUID(guid)
+        except (binascii.Error, UnicodeError, ValueError):
+            raise HTTPException(400, "Некорректный курсор")
+
+    @staticmethod
+    async def get_summary(
+        db: AsyncSession,
+        start: datetime,
+        end: datetime,
+        segment: list[str],
+        walls: list[str],
+        floors_min: int,
+        floors_max: int,
+        cursor: Optional[str],
+        limit: int = 100,
+    ) -> QuerySummaryPage:
+        after = QueryService._decode_cursor(cursor) if cursor else None
+        rows = await QueryRepository.get_summary(
+            db=db,
+            start=start,
+            end=end,
+            segment=segment,
+            walls=walls,
+            floors_min=floors_min,
+            floors_max=floors_max,
+            after=after,
+            limit=limit + 1,
+        )
+
+        items = [QuerySummary.from_orm(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = QueryService._encode_cursor(items[-1].created_at, items[-1].guid)
+        return QuerySummaryPage(items=items, next_cursor=next_cursor)
 
     @staticmethod
     async def get(db: AsyncSession, guid: UUID4) -> QueryGet:
-        query = await QueryRepository.get(db, guid)
+        query = await QueryRepository.get(db, guid, *query_graph_options)
         if query is None:
             raise HTTPException(404, "Запрос не найден")
-        return QueryService._sort_by_rooms(QueryGet.from_orm(query))
+        return QueryGet.from_orm(query)
+
+    @staticmethod
+    async def get_json(db: AsyncSession, guid: UUID4, version: int) -> bytes:
+        cache = get_cache()
+        payload = await cache.get(cache_key(guid), version)
+        if payload is None:
+            payload = dump_json(await QueryService.get(db, guid))
+            await cache.set(cache_key(guid), version, payload)
+        return payload
+
+    @staticmethod
+    def _sparse_apartment(apartment, columns: list[str], adjustment: bool) -> ApartmentGet:
+        values = {column: getattr(apartment, column) for column in columns}
+        if adjustment:
+            values["adjustment"] = apartment.adjustment and AdjustmentGet.from_orm(apartment.adjustment)
+        return ApartmentGet.construct(**values)
+
+    @staticmethod
+    def _sparse_relation(relation: SubQueryRelation, value, columns: list[str], adjustment: bool):
+        if relation in adjustment_relations:
+            return [AdjustmentGet.from_orm(a) for a in value]
+        if isinstance(value, list):
+            return [QueryService._sparse_apartment(a, columns, adjustment) for a in value]
+        return value and QueryService._sparse_apartment(value, columns, adjustment)
+
+    @staticmethod
+    async def get_sparse(
+        db: AsyncSession,
+        guid: UUID4,
+        include: Optional[list[SubQueryRelation]],
+        exclude: Optional[list[SubQueryRelation]],
+        fields: Optional[list[ApartmentField]],
+    ) -> QueryGet:
+        relations = [relation for relation in include or SubQueryRelation if relation not in (exclude or [])]
+        fields = set(fields or ApartmentField)
+        adjustment = ApartmentField.ADJUSTMENT in fields
+        columns = ["guid"] + [
+            name
+            for name, field in ApartmentGet.__fields__.items()
+            if field.alias in fields and field.alias != ApartmentField.ADJUSTMENT
+        ]
+
+        query = await QueryRepository.get(db, guid, *sparse_query_graph_options(relations, columns, adjustment))
+        if query is None:
+            raise HTTPException(404, "Запрос не найден")
+
+        sub_queries = [
+            SubQueryGet.construct(
+                guid=sub_query.guid,
+                rooms=sub_query.rooms,
+                **{
+                    relation.value: QueryService._sparse_relation(
+                        relation, getattr(sub_query, relation.value), columns, adjustment
+                    )
+                    for relation in relations
+                },
+            )
+            for sub_query in query.sub_queries
+        ]
+        return QueryGet.construct(
+            **{name: getattr(query, name) for name in QueryGet.__fields__ if name != "sub_queries"},
+            sub_queries=sub_queries,
+        )
 
     @staticmethod
     async def update(db: AsyncSession, guid: UUID4, user: UUID4, model: QueryCreate) -> QueryGet:
         query = await QueryRepository.update(db, guid, user, model)
         if query is None:
             raise HTTPException(404, "Запрос не найден")
-        return QueryService._sort_by_rooms(QueryGet.from_orm(query))
+        return QueryGet.from_orm(query)
 
     @staticmethod
     async def patch(db: AsyncSession, guid: UUID4, user: UUID4, model: QueryPatch) -> QueryGet:
         query = await QueryRepository.patch(db, guid, user, model)
         if query is None:
             raise HTTPException(404, "Запрос не найден")
-        return QueryService._sort_by_rooms(QueryGet.from_orm(query))
+        return QueryGet.from_orm(query)
 
     @staticmethod
     async def delete(db: AsyncSession, guid: UUID4) -> Response(status_code=204):
         await QueryRepository.delete(db, guid)
         return Response(status_code=204)
 
+    @staticmethod
+    async def delete_many(db: AsyncSession, guids: list[UUID4]) -> Response(status_code=204):
+        await QueryRepository.delete_many(db, guids)
+        return Response(status_code=204)
+
     @staticmethod
     async def set_base(
         db: AsyncSession, guid: UUID4, subguid: UUID4, user: UUID4, analog: QueryCreateBaseApartment
@@ -124,22 +264,37 @@ class QueryService:
     async def set_analogs(
         db: AsyncSession, guid: UUID4, subguid: UUID4, user: UUID4, analogs: QueryCreateUserApartments
     ) -> SubQueryGet:
-        subquery = await QueryRepository.set_analogs(db, guid, subguid, user, analogs)
-        if subquery is None:
+        selected = await QueryRepository.set_analogs(db, guid, subguid, user, analogs)
+        if selected is None:
             raise HTTPException(404, "Подзапрос не найден")
-        return SubQueryGet.from_orm(subquery)
+        return SubQueryGet(guid=subguid, selected_analogs=[ApartmentGet.from_orm(a) for a in selected])
+
+    @staticmethod
+    async def set_analogs_bulk(
+        db: AsyncSession, guid: UUID4, user: UUID4, analogs: list[QuerySubQueryUserApartments]
+    ) -> list[SubQueryGet]:
+        selected = await QueryRepository.set_analogs_bulk(db, guid, user, analogs)
+        if selected is None:
+            raise HTTPException(404, "Подзапрос не найден")
+
+        sub_queries = {
+            analog.sub_query_guid: SubQueryGet(guid=analog.sub_query_guid, selected_analogs=[]) for analog in analogs
+        }
+        for apartment in selected:
+            sub_queries[apartment.selected_analogs_guid].selected_analogs.append(ApartmentGet.from_orm(apartment))
+        return list(sub_queries.values())
 
     @staticmethod
     async def calculate_analogs(db: AsyncSession, guid: UUID4, subguid: UUID4, user: UUID4) -> QueryGet:
         query = await QueryRepository.calculate_analogs(db, guid, subguid, user)
-        return QueryService._sort_by_rooms(QueryGet.from_orm(query))
+        return QueryGet.from_orm(query)
 
     @staticmethod
     async def recalculate_analogs(db: AsyncSession, guid: UUID4, subguid: UUID4, user: UUID4) -> QueryGet:
         query = await QueryRepository.recalculate_analogs(db, guid, subguid, user)
-        return QueryService._sort_by_rooms(QueryGet.from_orm(query))
+        return QueryGet.from_orm(query)
 
     @staticmethod
     async def calculate_pool(db: AsyncSession, guid: UUID4, subguid: UUID4, user: UUID4) -> QueryGet:
         query = await QueryRepository.calculate_pool(db, guid, subguid, user)
-        return QueryService._sort_by_rooms(QueryGet.from_orm(query))
+        return QueryGet.from_orm(query)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import BloomFilter
+from app.config import config
+from app.database.connection import async_session
+from app.models import Principal
+from app.repositories import RevocationRepository
+
+REVOCATION_PURGE_LOCK_ID = 0x6C637472
+REVOCATION_REFRESH_OVERLAP = timedelta(minutes=1)
+
+revoked_filter: Optional[BloomFilter] = None
+revoked_seen_at: Optional[datetime] = None
+refresher_task: Optional[asyncio.Task] = None
+
+
+class RevocationService:
+    @staticmethod
+    async def load(db: AsyncSession) -> None:
+        global revoked_filter, revoked_seen_at
+        revoked = await RevocationRepository.get_revoked(db)
+        bloom = BloomFilter(
+            max(config.BACKEND_REVOCATION_BLOOM_CAPACITY, 2 * len(revoked)), config.BACKEND_REVOCATION_BLOOM_ERROR_RATE
+        )
+        for jti, _ in revoked:
+            bloom.add(jti)
+        revoked_filter = bloom
+        revoked_seen_at = max((revoked_at for _, revoked_at in revoked), default=None)
+
+    @staticmethod
+    async def refresh(db: AsyncSession) -> None:
+        global revoked_seen_at
+        if revoked_filter is None or revoked_filter.count > revoked_filter.capacity:
+            await RevocationService.load(db)
+            return
+        if revoked_seen_at is None:
+            revoked_seen_at = (await db.execute(select(func.now()))).scalar()
+
+        for jti, revoked_at in await RevocationRepository.get_revoked(db, revoked_seen_at - REVOCATION_REFRESH_OVERLAP):
+            if jti not in revoked_filter:
+                revoked_filter.add(jti)
+            revoked_seen_at = max(revoked_seen_at, revoked_at)
+
+    @staticmethod
+    async def purge(db: AsyncSession) -> int:
+        locked = await db.execute(select(func.pg_try_advisory_xact_lock(REVOCATION_PURGE_LOCK_ID)))
+        if not locked.scalar():
+            return 0
+        return await RevocationRepository.purge(db)
+
+    @staticmethod
+    async def is_revoked(principal: Principal) -> bool:
+        if principal.jti is None:
+            return False
+        if revoked_filter is not None and principal.jti not in revoked_filter:
+            return False
+        async with async_session() as db:
+            return await RevocationRepository.is_revoked(db, principal.jti)
+
+    @staticmethod
+    async def revoke(db: AsyncSession, principal: Principal) -> None:
+        if principal.jti is None:
+            return
+        await RevocationRepository.revoke(db, principal.jti, principal.sub, principal.exp)
+        if revoked_filter is not None:
+            revoked_filter.add(principal.jti)
+
+    @staticmethod
+    async def _run_refresher() -> None:
+        purged_at = time.monotonic()
+        while True:
+            try:
+                async with async_session() as db:
+                    if time.monotonic() - purged_at > config.BACKEND_REVOCATION_PURGE_MINUTES * 60:
+                        purged_at = time.monotonic()
+                        purged = await RevocationService.purge(db)
+                        await db.commit()
+                        logger.info(f"Revocation purge deleted {purged} expired tokens")
+                        await RevocationService.load(db)
+                    else:
+                        await RevocationService.refresh(db)
+            except Exception:
+                logger.exception("Revocation refresh failed")
+            await asyncio.sleep(config.BACKEND_REVOCATION_REFRESH_SECONDS)
+
+    @staticmethod
+    async def start_refresher() -> None:
+        global refresher_task
+        if refresher_task is None:
+            refresher_task = asyncio.create_task(RevocationService._run_refresher())
+
+    @staticmethod
+    async def stop_refresher() -> None:
+        global refresher_task
+        if refresher_task is not None:
+            refresher_task.cancel()
+            await asyncio.gather(refresher_task, return_exceptions=True)
+        refresher_task = None
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import func, select
+
+from app.config import config
+from app.database.connection import async_session, engine
+from app.models.enums import StoredFileType
+from app.repositories import QueryRepository
+from app.storage import Storage, StoredObject, get_storage
+
+STORAGE_SWEEPER_LOCK_ID = 0x6C637473
+
+sweeper_task: Optional[asyncio.Task] = None
+
+
+class StorageService:
+    @staticmethod
+    def _retention(key: str) -> Optional[timedelta]:
+        if key.startswith(f"{StoredFileType.EXPORT.value}/"):
+            return timedelta(hours=config.STORAGE_GC_EXPORT_RETENTION_HOURS)
+        if key.startswith(f"{StoredFileType.INPUT.value}/"):
+            return timedelta(hours=config.STORAGE_GC_INPUT_RETENTION_HOURS)
+        if "/" not in key and key.endswith(".xlsx"):
+            return timedelta(hours=config.STORAGE_GC_INPUT_RETENTION_HOURS)
+        return None
+
+    @staticmethod
+    def _is_garbage(obj: StoredObject, referenced: set[str], now: datetime) -> bool:
+        retention = StorageService._retention(obj.key)
+        return retention is not None and obj.key not in referenced and now - obj.modified_at > retention
+
+    @staticmethod
+    async def sweep(storage: Storage) -> int:
+        async with engine.connect() as connection:
+            lock = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            if not (await lock.execute(select(func.pg_try_advisory_lock(STORAGE_SWEEPER_LOCK_ID)))).scalar():
+                return 0
+            try:
+                return await StorageService._sweep_unreferenced(storage)
+            finally:
+                await lock.execute(select(func.pg_advisory_unlock(STORAGE_SWEEPER_LOCK_ID)))
+
+    @staticmethod
+    async def _sweep_unreferenced(storage: Storage) -> int:
+        async with async_session() as db:
+            links = await QueryRepository.get_file_links(db)
+        referenced = {key for key in map(storage.key, links) if key is not None}
+        now = datetime.now(timezone.utc)
+
+        deleted, batch = 0, []
+        async for page in storage.list_objects():
+            batch.extend(obj.key for obj in page if StorageService._is_garbage(obj, referenced, now))
+            while len(batch) >= config.STORAGE_GC_BATCH_SIZE:
+                await storage.delete(batch[: config.STORAGE_GC_BATCH_SIZE])
+                deleted += config.STORAGE_GC_BATCH_SIZE
+                batch = batch[config.STORAGE_GC_BATCH_SIZE :]
+        if batch:
+            await storage.delete(batch)
+            deleted += len(batch)
+        return deleted
+
+    @staticmethod
+    async def _run_sweeper() -> None:
+        while True:
+            try:
+                deleted = await StorageService.sweep(get_storage())
+                if deleted:
+                    logger.info(f"Storage sweeper deleted {deleted} unreferenced files")
+            except Exception:
+                logger.exception("Storage sweeper failed")
+            await asyncio.sleep(config.STORAGE_GC_INTERVAL_MINUTES * 60)
+
+    @staticmethod
+    async def start_sweeper() -> None:
+        global sweeper_task
+        if config.STORAGE_GC_ENABLED and sweeper_task is None:
+            sweeper_task = asyncio.create_task(StorageService._run_sweeper())
+
+    @staticmethod
+    async def stop_sweeper() -> None:
+        global sweeper_task
+        if sweeper_task is not None:
+            sweeper_task.cancel()
+            await asyncio.gather(sweeper_task, return_exceptions=True)
+        sweeper_task = None
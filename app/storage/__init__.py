@@ -1 +1,4 @@
-from .connection import get_s3_client
+from .base import Storage, StoredObject
+from .connection import close_storage, get_storage, open_storage
+from .local import LocalStorage
+from .s3 import S3Storage
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import AsyncIterator, BinaryIO, NamedTuple, Optional, Union
+
+
+class StoredObject(NamedTuple):
+    key: str
+    modified_at: datetime
+
+
+class Storage(ABC):
+    async def open(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    @abstractmethod
+    async def upload(self, key: str, body: Union[bytes, BinaryIO]) -> None:
+        ...
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        ...
+
+    @abstractmethod
+    async def download_url(self, key: str, expires_in: Optional[int] = None) -> str:
+        ...
+
+    @abstractmethod
+    def list_objects(self, prefix: str = "") -> AsyncIterator[list[StoredObject]]:
+        ...
+
+    @abstractmethod
+    async def delete(self, keys: list[str]) -> None:
+        ...
+
+    def key(self, url: str) -> Optional[str]:
+        prefix = self.url("")
+        if url and url.startswith(prefix):
+            return url[len(prefix) :]
+        return None
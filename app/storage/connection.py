@@ -1,22 +1,34 @@
-from contextlib import asynccontextmanager
-
-from aiobotocore.session import ClientCreatorContext, get_session
+from typing import Optional
 
 from app.config import config
+from app.storage.base import Storage
+from app.storage.local import LocalStorage
+from app.storage.s3 import S3Storage
+
+storage: Optional[Storage] = None
+
+
+def create_storage() -> Storage:
+    if config.STORAGE_BACKEND == "local" or config.BACKEND_DISABLE_FILE_SENDING:
+        return LocalStorage()
+    return S3Storage()
+
+
+async def open_storage() -> None:
+    global storage
+    if storage is None:
+        storage = create_storage()
+        await storage.open()
+
+
+async def close_storage() -> None:
+    global storage
+    if storage is not None:
+        await storage.close()
+    storage = None
+
 
-s3_session = get_session()
-
-
-@asynccontextmanager
-async def get_s3_client() -> ClientCreatorContext:
-    async with s3_session.create_client(
-        service_name="s3",
-        region_name=config.STORAGE_REGION,
-        endpoint_url=config.STORAGE_ENDPOINT,
-        aws_secret_access_key=config.STORAGE_ACCESS_KEY,
-        aws_access_key_id=config.STORAGE_ACCESS_KEY_ID,
-    ) as client:
-        try:
-            yield client
-        finally:
-            await client.close()
+def get_storage() -> Storage:
+    if storage is None:
+        raise RuntimeError("Storage is not initialized, call open_storage() on startup")
+    return storage
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+from io import BytesIO
+from typing import BinaryIO, Optional, Union
+
+from aiobotocore.client import AioBaseClient
+from starlette.concurrency import run_in_threadpool
+
+from app.config import config
+
+
+async def _upload_part(client: AioBaseClient, key: str, upload_id: str, number: int, chunk: bytes) -> dict:
+    response = await client.upload_part(
+        Bucket=config.STORAGE_BUCKET_NAME,
+        Key=key,
+        UploadId=upload_id,
+        PartNumber=number,
+        Body=chunk,
+    )
+    return {"ETag": response["ETag"], "PartNumber": number}
+
+
+async def _multipart_upload(client: AioBaseClient, key: str, body: BinaryIO, first_chunk: bytes) -> None:
+    upload = await client.create_multipart_upload(Bucket=config.STORAGE_BUCKET_NAME, Key=key)
+    upload_id = upload["UploadId"]
+    semaphore = asyncio.Semaphore(config.STORAGE_MULTIPART_CONCURRENCY)
+
+    async def upload_part(number: int, chunk: bytes) -> dict:
+        try:
+            return await _upload_part(client, key, upload_id, number, chunk)
+        finally:
+            semaphore.release()
+
+    tasks = []
+    try:
+        chunk, number = first_chunk, 1
+        while chunk:
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(upload_part(number, chunk)))
+            chunk = await run_in_threadpool(body.read, config.STORAGE_MULTIPART_CHUNK_SIZE)
+            number += 1
+        parts = await asyncio.gather(*tasks)
+        await client.complete_multipart_upload(
+            Bucket=config.STORAGE_BUCKET_NAME,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await client.abort_multipart_upload(Bucket=config.STORAGE_BUCKET_NAME, Key=key, UploadId=upload_id)
+        raise
+
+
+async def upload_file(client: AioBaseClient, key: str, body: Union[bytes, BinaryIO]) -> None:
+    if isinstance(body, (bytes, bytearray)):
+        body = BytesIO(body)
+
+    first_chunk = await run_in_threadpool(body.read, config.STORAGE_MULTIPART_THRESHOLD)
+    if len(first_chunk) < config.STORAGE_MULTIPART_THRESHOLD:
+        await client.put_object(Bucket=config.STORAGE_BUCKET_NAME, Key=key, Body=first_chunk)
+    else:
+        await _multipart_upload(client, key, body, first_chunk)
+
+
+async def generate_presigned_url(client: AioBaseClient, key: str, expires_in: Optional[int] = None) -> str:
+    return await client.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": config.STORAGE_BUCKET_NAME, "Key": key},
+        ExpiresIn=expires_in or config.STORAGE_PRESIGNED_URL_EXPIRE_SECONDS,
+    )
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Optional, Union
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import config
+from app.storage.base import Storage, StoredObject
+
+
+class LocalStorage(Storage):
+    def __init__(self) -> None:
+        self.directory = Path(config.STORAGE_LOCAL_DIRECTORY).resolve()
+
+    async def open(self) -> None:
+        await run_in_threadpool(self.directory.mkdir, parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        path = (self.directory / key).resolve()
+        if self.directory not in path.parents:
+            raise ValueError(f"Key {key!r} points outside of the storage directory")
+        return path
+
+    @staticmethod
+    def _write(path: Path, body: Union[bytes, BinaryIO]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        with open(tmp, "wb") as f:
+            if isinstance(body, (bytes, bytearray)):
+                f.write(body)
+            else:
+                shutil.copyfileobj(body, f, config.STORAGE_MULTIPART_CHUNK_SIZE)
+        os.replace(tmp, path)
+
+    async def upload(self, key: str, body: Union[bytes, BinaryIO]) -> None:
+        await run_in_threadpool(self._write, self.path(key), body)
+
+    def url(self, key: str) -> str:
+        return f"{config.STORAGE_LOCAL_URL}/{key}"
+
+    @staticmethod
+    def sign(key: str, expires: int) -> str:
+        digest = hmac.new(config.BACKEND_JWT_SECRET.encode(), f"{key}:{expires}".encode(), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+    @staticmethod
+    def verify(key: str, expires: int, signature: str) -> bool:
+        return expires > time.time() and hmac.compare_digest(LocalStorage.sign(key, expires), signature)
+
+    async def download_url(self, key: str, expires_in: Optional[int] = None) -> str:
+        expires = int(time.time()) + (expires_in or config.STORAGE_PRESIGNED_URL_EXPIRE_SECONDS)
+        return f"{self.url(key)}?expires={expires}&signature={self.sign(key, expires)}"
+
+    def _scan(self, prefix: str) -> list[StoredObject]:
+        objects = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = Path(root) / name
+                key = path.relative_to(self.directory).as_posix()
+                if name.startswith(".") or not key.startswith(prefix):
+                    continue
+                modified_at = datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
+                objects.append(StoredObject(key=key, modified_at=modified_at))
+        return objects
+
+    async def list_objects(self, prefix: str = "") -> AsyncIterator[list[StoredObject]]:
+        objects = await run_in_threadpool(self._scan, prefix)
+        for i in range(0, len(objects), 1000):
+            yield objects[i : i + 1000]
+
+    def _delete(self, keys: list[str]) -> None:
+        for key in keys:
+            self.path(key).unlink(missing_ok=True)
+
+    async def delete(self, keys: list[str]) -> None:
+        await run_in_threadpool(self._delete, keys)
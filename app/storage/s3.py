@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from contextlib import AsyncExitStack
+from typing import AsyncIterator, BinaryIO, Optional, Union
+
+from aiobotocore.client import AioBaseClient
+from aiobotocore.config import AioConfig
+from aiobotocore.session import get_session
+
+from app.config import config
+from app.storage.base import Storage, StoredObject
+from app.storage.files import generate_presigned_url, upload_file
+
+s3_session = get_session()
+
+
+class S3Storage(Storage):
+    def __init__(self) -> None:
+        self.client: Optional[AioBaseClient] = None
+        self._exit_stack: Optional[AsyncExitStack] = None
+
+    async def open(self) -> None:
+        if self.client is not None:
+            return
+
+        self._exit_stack = AsyncExitStack()
+        self.client = await self._exit_stack.enter_async_context(
+            s3_session.create_client(
+                service_name="s3",
+                region_name=config.STORAGE_REGION,
+                endpoint_url=config.STORAGE_ENDPOINT,
+                aws_secret_access_key=config.STORAGE_ACCESS_KEY,
+                aws_access_key_id=config.STORAGE_ACCESS_KEY_ID,
+                config=AioConfig(max_pool_connections=config.STORAGE_MAX_POOL_CONNECTIONS),
+            )
+        )
+
+    async def close(self) -> None:
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+        self._exit_stack = None
+        self.client = None
+
+    async def upload(self, key: str, body: Union[bytes, BinaryIO]) -> None:
+        await upload_file(self.client, key, body)
+
+    def url(self, key: str) -> str:
+        return f"{config.STORAGE_ENDPOINT}/{config.STORAGE_BUCKET_NAME}/{key}"
+
+    async def download_url(self, key: str, expires_in: Optional[int] = None) -> str:
+        return await generate_presigned_url(self.client, key, expires_in)
+
+    async def list_objects(self, prefix: str = "") -> AsyncIterator[list[StoredObject]]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        async for page in paginator.paginate(Bucket=config.STORAGE_BUCKET_NAME, Prefix=prefix):
+            yield [StoredObject(key=o["Key"], modified_at=o["LastModified"]) for o in page.get("Contents", [])]
+
+    async def delete(self, keys: list[str]) -> None:
+        for i in range(0, len(keys), 1000):
+            await self.client.delete_objects(
+                Bucket=config.STORAGE_BUCKET_NAME,
+                Delete={"Objects": [{"Key": key} for key in keys[i : i + 1000]], "Quiet": True},
+            )
@@ -0,0 +1,169 @@
+"""Payload encoding benchmark.
+
+Builds a realistic query graph in memory (a pool split into sub-queries by
+rooms, with analogs, adjustments and priced output apartments) and measures
+the size and encode time of every response encoding the API can negotiate:
+JSON from pydantic, orjson and MessagePack, each sent as is and compressed
+with gzip, brotli and zstd at the configured levels. Every run appends a JSON
+line to the output file.
+
+    python scripts/benchmark_payload_encodings.py --apartments 5000 --label baseline
+
+No database is needed; the BACKEND_COMPRESSION_* settings are read from .env.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.middleware.compression import compressors  # noqa: E402
+from app.models import AdjustmentGet, ApartmentGet, QueryGet, SubQueryGet  # noqa: E402
+from app.models.utils import dump_json, dump_msgpack  # noqa: E402
+
+SEGMENTS = ("новостройка", "современное жилье", "старый жилой фонд")
+WALLS = ("кирпич", "панель", "монолит")
+QUALITIES = ("без отделки", "муниципальный ремонт", "современная отделка")
+STREETS = ("Тверская", "Арбат", "Профсоюзная", "Ленинский проспект", "Мичуринский проспект")
+
+
+def adjustment(rng: random.Random, price: int) -> AdjustmentGet:
+    corrections = [round(rng.uniform(-10, 10), 1) for _ in range(7)]
+    prices = [int(price * (1 + sum(corrections[: n + 1]) / 100)) for n in range(7)]
+    return AdjustmentGet(
+        guid=uuid.uuid4(),
+        trade=-4.5,
+        floor=corrections[1],
+        apt_area=corrections[2],
+        kitchen_area=corrections[3],
+        has_balcony=corrections[4],
+        distance_to_metro=corrections[5],
+        quality=corrections[6],
+        price_trade=prices[0],
+        price_floor=prices[1],
+        price_area=prices[2],
+        price_kitchen=prices[3],
+        price_balcony=prices[4],
+        price_metro=prices[5],
+        price_final=prices[6],
+    )
+
+
+def apartment(rng: random.Random, rooms: int, adjusted: bool) -> ApartmentGet:
+    area = round(rng.uniform(25, 40) + rooms * rng.uniform(12, 20), 1)
+    m2price = rng.randrange(180_000, 450_000)
+    price = int(area * m2price)
+    floors = rng.randrange(5, 30)
+    return ApartmentGet(
+        guid=uuid.uuid4(),
+        address=f"Москва, {rng.choice(STREETS)}, д. {rng.randrange(1, 120)}",
+        link=f"https://www.cian.ru/sale/flat/{rng.randrange(10 ** 8, 10 ** 9)}/",
+        lat=round(rng.uniform(55.55, 55.9), 6),
+        lon=round(rng.uniform(37.35, 37.85), 6),
+        rooms=rooms,
+        segment=rng.choice(SEGMENTS),
+        floors=floors,
+        walls=rng.choice(WALLS),
+        floor=rng.randrange(1, floors + 1),
+        apartment_area=area,
+        kitchen_area=round(rng.uniform(6, 18), 1),
+        has_balcony=rng.random() < 0.6,
+        distance_to_metro=rng.randrange(2, 60),
+        quality=rng.choice(QUALITIES),
+        m2price=m2price,
+        price=price,
+        adjustment=adjustment(rng, price) if adjusted else None,
+    )
+
+
+def pool(apartments: int, analogs: int, seed: int) -> QueryGet:
+    rng = random.Random(seed)
+    sub_queries = []
+    for rooms in range(6):
+        count = apartments // 6 + (rooms < apartments % 6)
+        found = [apartment(rng, rooms, adjusted=True) for _ in range(analogs)]
+        sub_queries.append(
+            SubQueryGet(
+                guid=uuid.uuid4(),
+                rooms=rooms,
+                input_apartments=[apartment(rng, rooms, adjusted=False) for _ in range(count)],
+                standart_object=apartment(rng, rooms, adjusted=False),
+                analogs=found,
+                selected_analogs=found[: analogs // 2],
+                adjustments_analog_calculated=[a.adjustment for a in found],
+                adjustments_analog_user=[],
+                adjustments_pool_calculated=[],
+                adjustments_pool_user=[],
+                output_apartments=[apartment(rng, rooms, adjusted=True) for _ in range(count)],
+            )
+        )
+    now = datetime.utcnow()
+    user = uuid.uuid4()
+    return QueryGet(
+        guid=uuid.uuid4(),
+        name="benchmark",
+        input_file="https://example.com/benchmark.xlsx",
+        sub_queries=sub_queries,
+        created_by=user,
+        updated_by=user,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def timed(repeat: int, action) -> tuple[bytes, float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = action()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, round(statistics.median(timings), 2)
+
+
+def main(args: argparse.Namespace) -> None:
+    query = pool(args.apartments, args.analogs, args.seed)
+    encoders = {
+        "json": lambda: query.json(by_alias=True).encode(),
+        "orjson": lambda: dump_json(query),
+        "msgpack": lambda: dump_msgpack(query),
+    }
+
+    results = {
+        "label": args.label,
+        "apartments": args.apartments,
+        "created_at": datetime.utcnow().isoformat(),
+        "encodings": {},
+    }
+    for name, encoder in encoders.items():
+        body, encode_ms = timed(args.repeat, encoder)
+        results["encodings"][name] = {"bytes": len(body), "encode_ms": encode_ms}
+        for encoding, compressor in compressors.items():
+            compressed, compress_ms = timed(args.repeat, lambda: compressor().finish(body))
+            results["encodings"][f"{name}+{encoding}"] = {
+                "bytes": len(compressed),
+                "encode_ms": round(encode_ms + compress_ms, 2),
+                "ratio": round(len(body) / len(compressed), 1),
+            }
+
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    with open(args.output, "a") as output:
+        output.write(json.dumps(results, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--label", required=True, help="Name of the run, e.g. baseline")
+    parser.add_argument("--apartments", type=int, default=5000)
+    parser.add_argument("--analogs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="benchmark_payload_encodings.jsonl")
+    main(parser.parse_args())
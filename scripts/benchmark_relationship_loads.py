@@ -0,0 +1,209 @@
+"""Relationship load benchmark.
+
+Seeds a large pool into the database configured by the POSTGRES_* settings and
+times the reads and deletes that go through the apartment and adjustment
+foreign keys. Run it once before and once after the foreign key indexes
+(9a4d6e2c7b18) to compare index layouts; every run appends a JSON line to the
+output file.
+
+    alembic downgrade 5e2b8c4d1f07
+    python scripts/benchmark_relationship_loads.py --apartments 1000000 --label before
+    alembic upgrade head
+    python scripts/benchmark_relationship_loads.py --label after --skip-seed
+
+The loads are issued as raw SQL that mirrors the statements of the ORM
+selectin loaders, and only touch columns that exist since the initial
+migration, so the same checkout can benchmark any revision.
+
+Use a throwaway database: the seeded rows are left in place between runs.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import text
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.database.connection import async_session  # noqa: E402
+
+BENCHMARK_NAME = "relationship-load-benchmark"
+APARTMENT_COLUMNS = ("input_apartments_guid", "analogs_guid", "selected_analogs_guid", "output_apartments_guid")
+APARTMENT_RELATIONS = APARTMENT_COLUMNS + ("standart_object_guid",)
+ADJUSTMENT_RELATIONS = ("analog_calculated_guid", "analog_user_guid", "pool_calculated_guid", "pool_user_guid")
+APARTMENT_OWNERS = ", ".join(
+    f"CASE WHEN i % {len(APARTMENT_COLUMNS)} = {n} THEN s.guid END" for n in range(len(APARTMENT_COLUMNS))
+)
+
+SEED_QUERY = text(
+    """
+    INSERT INTO query (guid, name, input_file, created_by, updated_by)
+    VALUES (:guid, :name, 'http://127.0.0.1/benchmark.xlsx', :user, :user)
+    """
+)
+SEED_SUB_QUERIES = text(
+    """
+    INSERT INTO sub_query (guid, query_guid)
+    SELECT gen_random_uuid(), :query FROM generate_series(1, CAST(:count AS integer))
+    """
+)
+SEED_APARTMENTS = text(
+    f"""
+    WITH sub_queries AS (
+        SELECT guid, row_number() OVER (ORDER BY guid) - 1 AS n, count(*) OVER () AS total
+        FROM sub_query WHERE query_guid = :query
+    )
+    INSERT INTO apartment (
+        guid, address, lat, lon, rooms, segment, floors, walls, floor, apartment_area, kitchen_area,
+        has_balcony, distance_to_metro, quality, m2price, price, {", ".join(APARTMENT_COLUMNS)}
+    )
+    SELECT
+        gen_random_uuid(), 'Москва, ул. Тестовая, ' || i, 55.7, 37.6, i % 4,
+        (ARRAY['новостройка', 'современное жилье', 'старый жилой фонд'])[i % 3 + 1], 5 + i % 20,
+        (ARRAY['кирпич', 'панель', 'монолит'])[i % 3 + 1], 1 + i % 20, 30 + i % 70, 5 + i % 10,
+        i % 2 = 0, 5 + i % 30, 'современная отделка', 200000 + i % 50000, 10000000 + i % 5000000,
+        {APARTMENT_OWNERS}
+    FROM generate_series(CAST(:start AS integer), CAST(:stop AS integer)) AS i
+    JOIN sub_queries AS s ON s.n = i % s.total
+    """
+)
+SEED_ADJUSTMENTS = text(
+    """
+    INSERT INTO adjustment (
+        guid, apartment_guid, trade, price_trade, floor, price_floor, apt_area, price_area, kitchen_area,
+        price_kitchen, has_balcony, price_balcony, distance_to_metro, price_metro, quality, price_final,
+        analog_calculated_guid
+    )
+    SELECT gen_random_uuid(), a.guid, -4.5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, a.price, a.analogs_guid
+    FROM apartment AS a
+    JOIN sub_query AS s ON s.guid = a.analogs_guid
+    WHERE s.query_guid = :query
+    """
+)
+
+
+async def seed(apartments: int, sub_queries: int, batch: int) -> uuid.UUID:
+    async with async_session() as db:
+        existing = await db.execute(text("SELECT guid FROM query WHERE name = :name"), {"name": BENCHMARK_NAME})
+        guid = existing.scalar()
+        if guid is not None:
+            return guid
+
+        guid = uuid.uuid4()
+        await db.execute(SEED_QUERY, {"guid": guid, "name": BENCHMARK_NAME, "user": uuid.uuid4()})
+        await db.execute(SEED_SUB_QUERIES, {"query": guid, "count": sub_queries})
+        for start in range(0, apartments, batch):
+            stop = min(start + batch, apartments) - 1
+            await db.execute(SEED_APARTMENTS, {"query": guid, "start": start, "stop": stop})
+            await db.commit()
+            print(f"seeded {stop + 1}/{apartments} apartments", file=sys.stderr)
+        await db.execute(SEED_ADJUSTMENTS, {"query": guid})
+        await db.commit()
+        await db.execute(text("ANALYZE"))
+        return guid
+
+
+async def seed_probe(sub_queries: int) -> uuid.UUID:
+    async with async_session() as db:
+        guid = uuid.uuid4()
+        await db.execute(SEED_QUERY, {"guid": guid, "name": f"{BENCHMARK_NAME}-probe", "user": uuid.uuid4()})
+        await db.execute(SEED_SUB_QUERIES, {"query": guid, "count": sub_queries})
+        await db.execute(SEED_APARTMENTS, {"query": guid, "start": 0, "stop": sub_queries * 40 - 1})
+        await db.execute(SEED_ADJUSTMENTS, {"query": guid})
+        await db.commit()
+        return guid
+
+
+async def timed(repeat: int, action) -> dict:
+    timings = []
+    for _ in range(repeat):
+        async with async_session() as db:
+            started = time.perf_counter()
+            await action(db)
+            timings.append((time.perf_counter() - started) * 1000)
+            await db.rollback()
+    return {"median_ms": round(statistics.median(timings), 2), "max_ms": round(max(timings), 2)}
+
+
+async def load_apartments(db, column: str, sub_queries: list) -> None:
+    statement = f"""
+        SELECT apartment.*, adjustment.* FROM apartment
+        LEFT OUTER JOIN adjustment ON adjustment.apartment_guid = apartment.guid
+        WHERE apartment.{column} = ANY(:sub_queries)
+    """
+    (await db.execute(text(statement), {"sub_queries": sub_queries})).all()
+
+
+async def load_query_graph(db, guid: uuid.UUID) -> None:
+    (await db.execute(text("SELECT * FROM query WHERE guid = :guid"), {"guid": guid})).all()
+    rows = (await db.execute(text("SELECT * FROM sub_query WHERE query_guid = :guid"), {"guid": guid})).all()
+    sub_queries = [row.guid for row in rows]
+    for column in APARTMENT_RELATIONS:
+        await load_apartments(db, column, sub_queries)
+    for column in ADJUSTMENT_RELATIONS:
+        statement = f"SELECT * FROM adjustment WHERE {column} = ANY(:sub_queries)"
+        (await db.execute(text(statement), {"sub_queries": sub_queries})).all()
+
+
+async def load_sub_query_analogs(db, guid: uuid.UUID) -> None:
+    (await db.execute(text("SELECT * FROM sub_query WHERE guid = :guid"), {"guid": guid})).all()
+    await load_apartments(db, "analogs_guid", [guid])
+
+
+async def delete_query(db, guid: uuid.UUID) -> None:
+    sub_queries = "SELECT guid FROM sub_query WHERE query_guid = :guid"
+    await db.execute(text(f"DELETE FROM adjustment WHERE analog_calculated_guid IN ({sub_queries})"), {"guid": guid})
+    for column in APARTMENT_COLUMNS:
+        await db.execute(text(f"DELETE FROM apartment WHERE {column} IN ({sub_queries})"), {"guid": guid})
+    await db.execute(text("DELETE FROM sub_query WHERE query_guid = :guid"), {"guid": guid})
+    await db.execute(text("DELETE FROM query WHERE guid = :guid"), {"guid": guid})
+
+
+async def main(args: argparse.Namespace) -> None:
+    if not args.skip_seed:
+        await seed(args.apartments, args.sub_queries, args.batch)
+    probe = await seed_probe(args.probe_sub_queries)
+
+    async with async_session() as db:
+        revision = (await db.execute(text("SELECT version_num FROM alembic_version"))).scalar()
+        apartments = (await db.execute(text("SELECT count(*) FROM apartment"))).scalar()
+        sub_query = (await db.execute(text("SELECT guid FROM sub_query WHERE query_guid = :q"), {"q": probe})).scalar()
+
+    results = {
+        "label": args.label,
+        "revision": revision,
+        "apartments": apartments,
+        "created_at": datetime.utcnow().isoformat(),
+        "query_graph": await timed(args.repeat, lambda db: load_query_graph(db, probe)),
+        "sub_query_analogs": await timed(args.repeat, lambda db: load_sub_query_analogs(db, sub_query)),
+        "delete_query": await timed(args.repeat, lambda db: delete_query(db, probe)),
+    }
+
+    async with async_session() as db:
+        await delete_query(db, probe)
+        await db.commit()
+
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    with open(args.output, "a") as output:
+        output.write(json.dumps(results, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--label", required=True, help="Name of the run, e.g. before/after")
+    parser.add_argument("--apartments", type=int, default=1_000_000)
+    parser.add_argument("--sub-queries", type=int, default=1000)
+    parser.add_argument("--probe-sub-queries", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--output", default="benchmark_relationship_loads.jsonl")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,45 @@
+"""Orphan purge.
+
+Deletes apartments that belong to no sub-query and adjustments that belong to
+neither an apartment nor a sub-query. Rows are removed in small batches, each
+in its own transaction, so the command can run against a live database.
+
+    python scripts/purge_orphans.py --batch 1000 --pause 0.1
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.database.connection import async_session  # noqa: E402
+from app.repositories import AdjustmentRepository, ApartmentRepository  # noqa: E402
+
+
+async def purge(delete_orphans, name: str, batch: int, pause: float) -> int:
+    total = 0
+    while True:
+        async with async_session() as db, db.begin():
+            deleted = await delete_orphans(db, batch)
+        total += deleted
+        if deleted:
+            print(f"deleted {total} orphaned {name}", file=sys.stderr)
+        if deleted < batch:
+            return total
+        await asyncio.sleep(pause)
+
+
+async def main(args: argparse.Namespace) -> None:
+    apartments = await purge(ApartmentRepository.delete_orphans, "apartments", args.batch, args.pause)
+    adjustments = await purge(AdjustmentRepository.delete_orphans, "adjustments", args.batch, args.pause)
+    print(f"purged {apartments} apartments and {adjustments} adjustments")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", type=int, default=1000, help="Rows deleted per transaction")
+    parser.add_argument("--pause", type=float, default=0.1, help="Seconds to wait between batches")
+    asyncio.run(main(parser.parse_args()))
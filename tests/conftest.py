@@ -0,0 +1,168 @@
+import os
+
+from dotenv import find_dotenv, load_dotenv
+
+load_dotenv(find_dotenv(".env"))
+for name, value in {
+    "DEBUG": "False",
+    "BACKEND_TTILE": "lct-hack-backend",
+    "BACKEND_DESCRIPTION": "lct-hack-backend",
+    "BACKEND_PREFIX": "/api",
+    "BACKEND_HOST": "127.0.0.1",
+    "BACKEND_PORT": "8080",
+    "BACKEND_RELOAD": "False",
+    "BACKEND_JWT_SECRET": "test",
+    "BACKEND_JWT_ALGORITHM": "HS256",
+    "BACKEND_JWT_ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+    "BACKEND_BCRYPT_ROUNDS": "4",
+    "BACKEND_DADATA_TOKEN": "test",
+    "BACKEND_DISABLE_AUTH": "False",
+    "BACKEND_DISABLE_FILE_SENDING": "False",
+    "BACKEND_DISABLE_REGISTRATION": "False",
+    "STORAGE_BACKEND": "local",
+    "STORAGE_LOCAL_DIRECTORY": "/tmp/lct-hack-tests",
+    "STORAGE_REGION": "us-east-1",
+    "STORAGE_ENDPOINT": "http://127.0.0.1:9000",
+    "STORAGE_ACCESS_KEY": "test",
+    "STORAGE_ACCESS_KEY_ID": "test",
+    "STORAGE_BUCKET_NAME": "test",
+    "STORAGE_FOLDER_NAME": "test",
+    "POSTGRES_SERVER": "127.0.0.1",
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_DB": "postgres",
+}.items():
+    os.environ.setdefault(name, value)
+
+import io  # noqa: E402
+import random  # noqa: E402
+import uuid  # noqa: E402
+
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from app.config import config  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def database():
+    from app.database.connection import engine
+
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(text("select 1"))
+    except Exception as e:
+        await engine.dispose()
+        pytest.skip(f"PostgreSQL is not available: {e}")
+    yield engine
+    await engine.dispose()
+
+
+async def _load_revocations() -> None:
+    from app.database.connection import async_session, engine
+    from app.services import RevocationService
+
+    async with engine.connect() as connection:
+        await connection.execute(text("select 1"))
+    async with async_session() as db:
+        await RevocationService.load(db)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    from app.database.connection import engine
+    from app.main import app
+
+    monkeypatch.setattr(config, "STORAGE_BACKEND", "local")
+    monkeypatch.setattr(config, "STORAGE_LOCAL_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(
+        config, "STORAGE_LOCAL_URL", f"http://127.0.0.1:{config.BACKEND_PORT}{config.BACKEND_PREFIX}/files"
+    )
+    with TestClient(app) as client:
+        try:
+            client.portal.call(_load_revocations)
+        except Exception as e:
+            pytest.skip(f"PostgreSQL is not available: {e}")
+        yield client
+        client.portal.call(engine.dispose)
+
+
+def signup(client) -> dict:
+    res = client.post(
+        f"{config.BACKEND_PREFIX}/signup",
+        json={
+            "email": f"{uuid.uuid4().hex}@example.com",
+            "password": "password",
+            "firstName": "Test",
+            "lastName": "User",
+        },
+    )
+    assert res.status_code == 200, res.text
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+@pytest.fixture
+def auth_headers(client):
+    return signup(client)
+
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def pool_file(rows: int) -> bytes:
+    df = pd.DataFrame(
+        {
+            "Местоположение": f"Москва, ул. Тестовая, {i % 7}",
+            "Количество комнат": ["Студия", 1, 2, 3][i % 4],
+            "Сегмент (Новостройка, современное жилье, старый жилой фонд)": ["новостройка", "современное жилье"][i % 2],
+            "Этажность дома": 10 + i % 5,
+            "Материал стен (Кипич, панель, монолит)": ["кирпич", "панель", "монолит"][i % 3],
+            "Этаж расположения": 1 + i % 9,
+            "Площадь квартиры, кв.м": 30 + i,
+            "Площадь кухни, кв.м": 5 + i % 9,
+            "Наличие балкона/лоджии": ["Да", "Нет"][i % 2],
+            "Удаленность от станции метро, мин. пешком": 3 + i % 50,
+            "Состояние (без отделки, муниципальный ремонт, современная отделка)": [
+                "без отделки",
+                "муниципальный ремонт",
+                "современная отделка",
+            ][i % 3],
+        }
+        for i in range(rows)
+    )
+    stream = io.BytesIO()
+    df.to_excel(stream, index=False)
+    return stream.getvalue()
+
+
+@pytest.fixture
+def create_pool(client, auth_headers, monkeypatch):
+    from app.services.pool import PoolService
+
+    async def convert_address(address):
+        return 55.7 + random.random() / 10, 37.6 + random.random() / 10
+
+    monkeypatch.setattr(PoolService, "_convert_address", staticmethod(convert_address))
+    created = []
+
+    def create_pool(rows: int = 20) -> dict:
+        res = client.post(
+            f"{config.BACKEND_PREFIX}/pool",
+            params={"name": "test"},
+            files={"file": ("pool.xlsx", pool_file(rows), XLSX_MEDIA_TYPE)},
+            headers=auth_headers,
+        )
+        assert res.status_code == 201, res.text
+        created.append(res.json()["guid"])
+        return res.json()
+
+    yield create_pool
+    for guid in created:
+        client.delete(f"{config.BACKEND_PREFIX}/query/{guid}", headers=auth_headers)
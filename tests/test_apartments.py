@@ -0,0 +1,83 @@
+import itertools
+import uuid
+
+import pytest
+from sqlalchemy import text, update
+from sqlalchemy.dialects import postgresql
+
+from app.config import config
+from app.database.connection import async_session, engine
+from app.database.tables import Apartment
+from app.models.enums import ApartmentRole, ApartmentSortField, SortByEnum
+from app.repositories.apartment import ApartmentRepository, apartment_roles, apartment_sort_fields
+from tests.test_query_filters import plan_nodes
+
+
+async def explain(
+    subid: str, role: ApartmentRole, sort: ApartmentSortField, order: SortByEnum, after: tuple
+) -> list[dict]:
+    column = apartment_sort_fields[sort]
+    query = ApartmentRepository._select(subid, role, sort, order, *[None] * 8)
+    query = ApartmentRepository._page(query, column, order, after, 100)
+    compiled = query.compile(
+        dialect=postgresql.dialect(paramstyle="named"), compile_kwargs={"render_postcompile": True}
+    )
+    async with engine.connect() as connection:
+        await connection.execute(text("analyze apartment"))
+        # a test pool is too small for the planner to prefer an ordered index range on its own
+        await connection.execute(text("set local enable_seqscan = off"))
+        await connection.execute(text("set local enable_bitmapscan = off"))
+        await connection.execute(text("set local enable_sort = off"))
+        res = await connection.execute(text(f"explain (format json) {compiled}"), compiled.params)
+        return list(plan_nodes(res.scalar()[0]["Plan"]))
+
+
+@pytest.mark.parametrize(
+    "order, value", [(SortByEnum.ASC, 10**9), (SortByEnum.ASC, None), (SortByEnum.DESC, -1), (SortByEnum.DESC, None)]
+)
+def test_apartment_pages_are_read_by_index_ranges(client, create_pool, order, value):
+    subid = create_pool(200)["subQueries"][0]["guid"]
+
+    for role, sort in itertools.product(ApartmentRole, ApartmentSortField):
+        nodes = client.portal.call(explain, subid, role, sort, order, (value, uuid.uuid4()))
+
+        index = f"ix_apartment_{apartment_roles[role].key}_{apartment_sort_fields[sort].key}"
+        scans = [node for node in nodes if node.get("Relation Name") == "apartment"]
+        assert scans and all(node.get("Index Name") == index for node in scans), (role, sort)
+        assert not any("ROW(" in node.get("Filter", "") or "IS NULL" in node.get("Filter", "") for node in scans)
+        if value is not None:
+            assert any("ROW(" in node["Index Cond"] for node in scans)
+
+
+def page_through(client, auth_headers, url: str, sort: str, order: str) -> list[str]:
+    guids, cursor = [], None
+    while True:
+        params = {"sort": sort, "order": order, "limit": 3, **({"cursor": cursor} if cursor else {})}
+        res = client.get(url, params=params, headers=auth_headers)
+        assert res.status_code == 200, res.text
+        guids += [item["guid"] for item in res.json()["items"]]
+        cursor = res.json()["nextCursor"]
+        if not cursor:
+            return guids
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_apartment_pages_cross_null_sort_values(client, auth_headers, create_pool, order):
+    query = create_pool(20)
+    sub_query = max(query["subQueries"], key=lambda sub_query: len(sub_query["input_apartments"]))
+    apartments = sorted(apartment["guid"] for apartment in sub_query["input_apartments"])
+
+    async def clear_prices():
+        async with async_session() as db:
+            await db.execute(update(Apartment).where(Apartment.guid.in_(apartments[::2])).values(price=None))
+            await db.commit()
+
+    client.portal.call(clear_prices)
+    url = f"{config.BACKEND_PREFIX}/query/{query['guid']}/subquery/{sub_query['guid']}/apartment"
+
+    full = client.get(url, params={"sort": "price", "order": order, "limit": 100}, headers=auth_headers).json()
+    prices = [item["price"] for item in full["items"]]
+    nulls = [price is None for price in prices]
+    assert len(prices) == len(apartments) and any(nulls) and not all(nulls)
+    assert nulls == sorted(nulls, reverse=order == "desc")
+    assert page_through(client, auth_headers, url, "price", order) == [item["guid"] for item in full["items"]]
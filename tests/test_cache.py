@@ -0,0 +1,123 @@
+import pytest
+from fakeredis import aioredis as fakeredis
+from redis import asyncio as aioredis
+
+from app.cache import MemoryCache, RedisCache
+from app.config import config
+
+
+@pytest.fixture
+def unreachable_redis(monkeypatch):
+    monkeypatch.setattr(config, "CACHE_BACKEND", "redis")
+    monkeypatch.setattr(config, "CACHE_REDIS_URI", "redis://127.0.0.1:6379/0")
+    monkeypatch.setattr(aioredis, "from_url", lambda url, **kwargs: fakeredis.FakeRedis(connected=False))
+
+
+@pytest.fixture(params=["memory", "redis"])
+async def cache(request, monkeypatch):
+    if request.param == "redis":
+        server = fakeredis.FakeRedis()
+        monkeypatch.setattr(config, "CACHE_REDIS_URI", "redis://127.0.0.1:6379/0")
+        monkeypatch.setattr(aioredis, "from_url", lambda url, **kwargs: server)
+        cache = RedisCache()
+    else:
+        cache = MemoryCache()
+    await cache.open()
+    yield cache
+    await cache.close()
+
+
+@pytest.mark.anyio
+async def test_entries_are_keyed_by_version(cache):
+    await cache.set("query:1", 3, b'{"guid": 1}')
+
+    assert await cache.get("query:1", 3) == b'{"guid": 1}'
+    assert await cache.get("query:1", 4) is None
+    assert await cache.get("query:2", 3) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+@pytest.mark.anyio
+async def test_delete_invalidates_entries(cache):
+    await cache.set("query:1", 1, b"first")
+    await cache.set("query:2", 1, b"second")
+
+    await cache.delete(["query:1"])
+
+    assert await cache.get("query:1", 1) is None
+    assert await cache.get("query:2", 1) == b"second"
+
+
+@pytest.mark.anyio
+async def test_redis_entries_are_prefixed_and_expire(monkeypatch):
+    server = fakeredis.FakeRedis()
+    monkeypatch.setattr(config, "CACHE_REDIS_URI", "redis://127.0.0.1:6379/0")
+    monkeypatch.setattr(aioredis, "from_url", lambda url, **kwargs: server)
+    cache = RedisCache()
+    await cache.open()
+
+    await cache.set("query:1", 7, b"payload")
+
+    assert await server.get(f"{config.CACHE_REDIS_PREFIX}query:1") == b"7\npayload"
+    assert 0 < await server.ttl(f"{config.CACHE_REDIS_PREFIX}query:1") <= config.CACHE_TTL_SECONDS
+    await cache.close()
+
+
+@pytest.mark.anyio
+async def test_memory_cache_evicts_least_recently_used_entries(monkeypatch):
+    monkeypatch.setattr(config, "CACHE_MAX_BYTES", 10)
+    cache = MemoryCache()
+
+    await cache.set("query:1", 1, b"12345")
+    await cache.set("query:2", 1, b"12345")
+    await cache.get("query:1", 1)
+    await cache.set("query:3", 1, b"12345")
+
+    assert cache.size() == 10
+    assert cache.evictions == 1
+    assert await cache.get("query:2", 1) is None
+    assert await cache.get("query:1", 1) == b"12345"
+
+
+@pytest.mark.anyio
+async def test_redis_outage_degrades_to_misses(unreachable_redis):
+    cache = RedisCache()
+    await cache.open()
+
+    await cache.set("query:1", 1, b"payload")
+    await cache.delete(["query:1"])
+
+    assert await cache.get("query:1", 1) is None
+    assert (cache.hits, cache.misses) == (0, 1)
+    await cache.close()
+
+
+@pytest.mark.anyio
+async def test_redis_skips_entries_larger_than_the_cache(monkeypatch):
+    server = fakeredis.FakeRedis()
+    monkeypatch.setattr(config, "CACHE_REDIS_URI", "redis://127.0.0.1:6379/0")
+    monkeypatch.setattr(config, "CACHE_MAX_BYTES", 4)
+    monkeypatch.setattr(aioredis, "from_url", lambda url, **kwargs: server)
+    cache = RedisCache()
+    await cache.open()
+
+    await cache.set("query:1", 1, b"12345")
+
+    assert await server.get(f"{config.CACHE_REDIS_PREFIX}query:1") is None
+    await cache.close()
+
+
+def test_queries_are_served_and_written_while_redis_is_down(unreachable_redis, client, auth_headers, create_pool):
+    query = create_pool()
+    sub_query = query["subQueries"][0]
+    apartment = sub_query["input_apartments"][0]
+    url = f"{config.BACKEND_PREFIX}/query/{query['guid']}"
+
+    for _ in range(2):
+        assert client.get(url, headers=auth_headers).status_code == 200
+    res = client.put(
+        f"{url}/subquery/{sub_query['guid']}/apartment/{apartment['guid']}",
+        json={**apartment, "price": 1},
+        headers=auth_headers,
+    )
+    assert res.status_code == 200, res.text
@@ -0,0 +1,154 @@
+import json
+import zlib
+
+import anyio
+import brotli
+import pytest
+import zstandard
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app.middleware import CompressionMiddleware
+from app.middleware.compression import negotiate_encoding
+
+ITEMS = [{"guid": i, "address": f"Москва, ул. Тестовая, {i}", "price": 10000000 + i} for i in range(200)]
+MINIMUM_SIZE = 500
+
+
+async def items_stream():
+    for start in range(0, len(ITEMS), 20):
+        yield b"".join(json.dumps(item).encode() + b"\n" for item in ITEMS[start : start + 20])
+
+
+app = CompressionMiddleware(
+    Starlette(
+        routes=[
+            Route("/json", lambda request: JSONResponse(ITEMS, headers={"ETag": '"7"'})),
+            Route("/small", lambda request: JSONResponse({"guid": 1}, headers={"ETag": '"7"'})),
+            Route("/ndjson", lambda request: StreamingResponse(items_stream(), media_type="application/x-ndjson")),
+            Route("/binary", lambda request: Response(b"\0" * 5000, media_type="application/octet-stream")),
+            Route("/not-modified", lambda request: Response(status_code=304, headers={"ETag": '"7"'})),
+            Route("/empty", lambda request: Response(status_code=204)),
+        ]
+    ),
+    minimum_size=MINIMUM_SIZE,
+)
+
+decompressors = {
+    "gzip": lambda: zlib.decompressobj(16 + zlib.MAX_WBITS).decompress,
+    "br": lambda: brotli.Decompressor().process,
+    "zstd": lambda: zstandard.ZstdDecompressor().decompressobj().decompress,
+}
+
+
+async def get(path: str, accept_encoding: str = None) -> tuple[int, dict, list[bytes]]:
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding is not None else []
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+    }
+    requested = False
+    messages = []
+
+    async def receive():
+        nonlocal requested
+        if requested:
+            await anyio.sleep_forever()
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    start, bodies = messages[0], [message.get("body", b"") for message in messages[1:]]
+    return start["status"], {k.decode(): v.decode() for k, v in start["headers"]}, bodies
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, encoding",
+    [
+        ("gzip", "gzip"),
+        ("gzip, deflate, br", "br"),
+        ("gzip;q=0.5, zstd;q=0.8", "zstd"),
+        ("br;q=0, gzip", "gzip"),
+        ("*", "br"),
+        ("*, br;q=0", "zstd"),
+        ("br;q=0, zstd;q=0, *;q=0.1", "gzip"),
+        ("gzip;q=0", None),
+        ("*;q=0", None),
+        ("identity", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, encoding):
+    assert negotiate_encoding(accept_encoding) == encoding
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("encoding", list(decompressors))
+async def test_json_is_compressed_with_the_negotiated_encoding(encoding):
+    status, headers, bodies = await get("/json", encoding)
+
+    assert status == 200
+    assert headers["content-encoding"] == encoding
+    assert headers["vary"] == "Accept-Encoding"
+    assert headers["etag"] == 'W/"7"'
+    assert int(headers["content-length"]) == len(bodies[0])
+    assert json.loads(decompressors[encoding]()(b"".join(bodies))) == ITEMS
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("path, accept_encoding", [("/small", "gzip"), ("/json", None), ("/json", "gzip;q=0")])
+async def test_uncompressed_responses_still_vary_on_accept_encoding(path, accept_encoding):
+    status, headers, bodies = await get(path, accept_encoding)
+
+    assert status == 200
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert headers["etag"] == '"7"'
+    assert int(headers["content-length"]) == len(b"".join(bodies))
+    assert json.loads(b"".join(bodies))
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("encoding", list(decompressors))
+async def test_streamed_ndjson_is_decodable_chunk_by_chunk(encoding):
+    status, headers, bodies = await get("/ndjson", encoding)
+
+    assert status == 200
+    assert headers["content-encoding"] == encoding
+    assert "content-length" not in headers
+    decompress, items = decompressors[encoding](), []
+    for body in bodies[:-1]:
+        lines = decompress(body)
+        assert lines.endswith(b"\n")
+        items += [json.loads(line) for line in lines.splitlines()]
+    decompress(bodies[-1])
+    assert items == ITEMS
+    assert len(bodies) > 2
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("path, status", [("/not-modified", 304), ("/empty", 204), ("/binary", 200)])
+async def test_responses_that_cannot_be_compressed_pass_through(path, status):
+    response_status, headers, bodies = await get(path, "br, gzip")
+
+    assert response_status == status
+    assert "content-encoding" not in headers
+    assert "vary" not in headers
+    if status == 304:
+        assert headers["etag"] == '"7"'
+    if status == 200:
+        assert b"".join(bodies) == b"\0" * 5000
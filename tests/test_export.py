@@ -0,0 +1,92 @@
+import io
+import threading
+import uuid
+
+import openpyxl
+import pytest
+
+from app.config import config
+from app.services.pool import PoolService
+from tests.conftest import signup
+
+JOBS = f"{config.BACKEND_PREFIX}/export/jobs"
+
+
+@pytest.fixture
+def blocked_render(monkeypatch):
+    release = threading.Event()
+    render = PoolService._render_excel
+
+    def blocked(*args, **kwargs):
+        release.wait(30)
+        return render(*args, **kwargs)
+
+    monkeypatch.setattr(PoolService, "_render_excel", staticmethod(blocked))
+    yield release
+    release.set()
+
+
+def create_job(client, headers, guid, **params) -> dict:
+    res = client.post(JOBS, params={"id": guid, **params}, headers=headers)
+    assert res.status_code == 202, res.text
+    return res.json()
+
+
+def wait_job(client, headers, guid) -> dict:
+    res = client.get(f"{JOBS}/{guid}", params={"wait": 30}, headers=headers)
+    assert res.status_code == 200, res.text
+    return res.json()
+
+
+def test_export_job_is_polled_until_done(client, auth_headers, create_pool):
+    query = create_pool(rows=20)
+
+    job = create_job(client, auth_headers, query["guid"], splitByLists="true")
+    assert job["status"] in ("pending", "running")
+
+    job = wait_job(client, auth_headers, job["guid"])
+    assert job["status"] == "done", job
+    assert job["sheetsDone"] == job["sheetsTotal"] == len(query["subQueries"])
+    assert job["rowsWritten"] == 20
+
+    res = client.get(job["link"])
+    assert res.status_code == 200
+    assert openpyxl.load_workbook(io.BytesIO(res.content)).sheetnames
+
+
+def test_export_job_is_hidden_from_other_users(client, auth_headers, create_pool):
+    query = create_pool(rows=5)
+    job = create_job(client, auth_headers, query["guid"])
+
+    res = client.get(f"{JOBS}/{job['guid']}", headers=signup(client))
+    assert res.status_code == 404
+    assert wait_job(client, auth_headers, job["guid"])["status"] == "done"
+
+
+def test_identical_export_jobs_are_coalesced(client, auth_headers, create_pool, blocked_render):
+    query = create_pool(rows=5)
+
+    first = create_job(client, auth_headers, query["guid"])
+    assert create_job(client, auth_headers, query["guid"])["guid"] == first["guid"]
+    assert create_job(client, auth_headers, query["guid"], includeAdjustments="true")["guid"] != first["guid"]
+    assert create_job(client, signup(client), query["guid"])["guid"] != first["guid"]
+
+    blocked_render.set()
+    assert wait_job(client, auth_headers, first["guid"])["status"] == "done"
+    assert create_job(client, auth_headers, query["guid"])["guid"] != first["guid"]
+
+
+def test_export_job_reports_failure(client, auth_headers, create_pool, monkeypatch):
+    job = create_job(client, auth_headers, str(uuid.uuid4()))
+    job = wait_job(client, auth_headers, job["guid"])
+    assert job["status"] == "failed"
+    assert job["error"] and job["link"] is None
+
+    def broken(*args, **kwargs):
+        raise ValueError("broken workbook")
+
+    monkeypatch.setattr(PoolService, "_render_excel", staticmethod(broken))
+    job = create_job(client, auth_headers, create_pool(rows=5)["guid"])
+    job = wait_job(client, auth_headers, job["guid"])
+    assert job["status"] == "failed"
+    assert job["error"] == "Отказано в обработке из-за неизвестной ошибки на сервере"
@@ -0,0 +1,57 @@
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import config
+from app.routers.files import router
+from app.storage import LocalStorage, get_storage
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "STORAGE_LOCAL_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(config, "STORAGE_LOCAL_URL", f"http://testserver{config.BACKEND_PREFIX}/files")
+    storage = LocalStorage()
+    storage.directory.joinpath("export").mkdir()
+    storage.directory.joinpath("export", "report.xlsx").write_bytes(b"report")
+    return storage
+
+
+@pytest.fixture
+def client(storage):
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_storage] = lambda: storage
+    return TestClient(app)
+
+
+@pytest.mark.anyio
+async def test_signed_link_downloads_file(client, storage):
+    res = client.get(await storage.download_url("export/report.xlsx"))
+
+    assert res.status_code == 200
+    assert res.content == b"report"
+
+
+@pytest.mark.anyio
+async def test_expired_link_is_rejected(client, storage):
+    url = await storage.download_url("export/report.xlsx", expires_in=-1)
+
+    assert client.get(url).status_code == 403
+
+
+def test_tampered_link_is_rejected(client, storage):
+    expires = int(time.time()) + 60
+    signature = storage.sign("export/report.xlsx", expires)
+
+    res = client.get(storage.url("export/other.xlsx"), params={"expires": expires, "signature": signature})
+
+    assert res.status_code == 403
+
+
+def test_unsigned_link_requires_authorization(client, storage):
+    res = client.get(storage.url("export/report.xlsx"))
+
+    assert res.status_code == 401
@@ -0,0 +1,16 @@
+import pytest
+from jose import jwt
+
+from app.config import config
+
+
+@pytest.mark.parametrize("path", ["/internal/cache", "/internal/database/pool"])
+def test_internal_metrics_require_an_admin(client, auth_headers, monkeypatch, path):
+    email = jwt.get_unverified_claims(auth_headers["Authorization"].split()[1])["email"]
+    url = f"{config.BACKEND_PREFIX}{path}"
+
+    assert client.get(url).status_code == 403
+    assert client.get(url, headers=auth_headers).status_code == 403
+
+    monkeypatch.setattr(config, "BACKEND_ADMIN_EMAILS", [email.upper()])
+    assert client.get(url, headers=auth_headers).status_code == 200
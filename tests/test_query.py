@@ -0,0 +1,194 @@
+from contextlib import contextmanager
+
+from jose import jwt
+from sqlalchemy import delete, event, update
+
+from app.config import config
+from app.database.connection import async_session, engine
+from app.database.tables import Apartment, SubQuery
+from app.models import QueryCreate
+from app.repositories import QueryRepository
+from app.repositories.query import subquery_graph_options
+
+
+@contextmanager
+def recorded_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_get_query_statement_count_does_not_grow_with_pool_size(client, auth_headers, create_pool):
+    counts = []
+    for rows in (8, 80):
+        query = create_pool(rows)
+        with recorded_statements() as statements:
+            res = client.get(f"{config.BACKEND_PREFIX}/query/{query['guid']}", headers=auth_headers)
+        assert res.status_code == 200
+        counts.append(len(statements))
+
+    # version lookup, the query row, its sub-queries, then one selectin statement per sub-query relationship
+    assert counts == [3 + len(subquery_graph_options)] * 2
+
+
+def test_cached_get_query_only_checks_the_version(client, auth_headers, create_pool):
+    query = create_pool()
+    url = f"{config.BACKEND_PREFIX}/query/{query['guid']}"
+    assert client.get(url, headers=auth_headers).status_code == 200
+
+    with recorded_statements() as statements:
+        res = client.get(url, headers=auth_headers)
+
+    assert res.status_code == 200
+    assert len(statements) == 1
+
+
+def test_summary_of_a_query_without_apartments(client, auth_headers, create_pool):
+    pool = create_pool()
+    user = jwt.get_unverified_claims(auth_headers["Authorization"].split()[1])["sub"]
+
+    async def create_empty_query():
+        async with async_session() as db:
+            model = QueryCreate(
+                name="empty", input_file=pool["inputFile"], sub_queries=[], created_by=user, updated_by=user
+            )
+            query = await QueryRepository.create(db, model)
+            await db.commit()
+            return str(query.guid)
+
+    empty = client.portal.call(create_empty_query)
+    try:
+        res = client.get(f"{config.BACKEND_PREFIX}/query/summary", params={"limit": 2}, headers=auth_headers)
+        assert res.status_code == 200
+        items = {item["guid"]: item for item in res.json()["items"]}
+        assert items[empty]["apartmentsCount"] == 0
+        assert items[empty]["rooms"] == []
+        assert items[pool["guid"]]["rooms"] == [0, 1, 2, 3]
+    finally:
+        client.delete(f"{config.BACKEND_PREFIX}/query/{empty}", headers=auth_headers)
+
+
+def test_query_list_omits_sub_queries(client, auth_headers, create_pool):
+    query = create_pool()
+
+    res = client.get(f"{config.BACKEND_PREFIX}/query", params={"sort": "desc", "limit": 10}, headers=auth_headers)
+
+    assert res.status_code == 200
+    item = next(item for item in res.json() if item["guid"] == query["guid"])
+    assert "subQueries" not in item
+    assert item["inputFile"] == query["inputFile"]
+
+
+def test_only_analogs_of_the_sub_query_can_be_selected(client, auth_headers, create_pool):
+    query, other = create_pool(), create_pool()
+    sub_query, foreign = query["subQueries"][0], other["subQueries"][0]
+    analog, stranger = sub_query["input_apartments"][0]["guid"], foreign["input_apartments"][0]["guid"]
+
+    async def mark_analog():
+        async with async_session() as db:
+            await db.execute(update(Apartment).where(Apartment.guid == analog).values(analogs_guid=sub_query["guid"]))
+            await db.commit()
+
+    client.portal.call(mark_analog)
+    url = f"{config.BACKEND_PREFIX}/query/{query['guid']}"
+
+    res = client.post(
+        f"{url}/subquery/{sub_query['guid']}/user-analogs", json={"guids": [analog, stranger]}, headers=auth_headers
+    )
+    assert res.status_code == 201, res.text
+    assert [apartment["guid"] for apartment in res.json()["selected_analogs"]] == [analog]
+
+    res = client.post(
+        f"{url}/subquery/{foreign['guid']}/user-analogs", json={"guids": [stranger]}, headers=auth_headers
+    )
+    assert res.status_code == 404
+    body = [{"subQueryGuid": sub_query["guid"], "guids": []}, {"subQueryGuid": foreign["guid"], "guids": [stranger]}]
+    assert client.post(f"{url}/user-analogs", json=body, headers=auth_headers).status_code == 404
+
+    res = client.get(f"{config.BACKEND_PREFIX}/query/{query['guid']}", headers=auth_headers)
+    selected = next(item for item in res.json()["subQueries"] if item["guid"] == sub_query["guid"])["selected_analogs"]
+    assert [apartment["guid"] for apartment in selected] == [analog]
+
+
+def etag_of(res) -> str:
+    return res.headers["ETag"].removeprefix("W/")
+
+
+def test_get_query_answers_a_matching_if_none_match_with_304(client, auth_headers, create_pool):
+    url = f"{config.BACKEND_PREFIX}/query/{create_pool()['guid']}"
+    res = client.get(url, headers=auth_headers)
+    assert res.status_code == 200
+    etag = etag_of(res)
+
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        res = client.get(url, headers={**auth_headers, "If-None-Match": if_none_match})
+        assert res.status_code == 304, if_none_match
+        assert res.content == b""
+        assert etag_of(res) == etag
+
+    res = client.get(url, headers={**auth_headers, "If-None-Match": '"other"'})
+    assert res.status_code == 200
+    assert etag_of(res) == etag
+
+
+def test_etag_changes_after_writes(client, auth_headers, create_pool):
+    query = create_pool()
+    sub_query = query["subQueries"][0]
+    apartment = sub_query["input_apartments"][0]["guid"]
+    url = f"{config.BACKEND_PREFIX}/query/{query['guid']}"
+
+    async def mark_analog():
+        async with async_session() as db:
+            await db.execute(
+                update(Apartment).where(Apartment.guid == apartment).values(analogs_guid=sub_query["guid"])
+            )
+            await db.commit()
+
+    client.portal.call(mark_analog)
+    writes = [
+        ("post", f"{url}/subquery/{sub_query['guid']}/base-apartment", {"guid": apartment}),
+        ("post", f"{url}/subquery/{sub_query['guid']}/user-analogs", {"guids": [apartment]}),
+        (
+            "put",
+            f"{url}/subquery/{sub_query['guid']}/apartment/{apartment}",
+            {**sub_query["input_apartments"][0], "price": 1},
+        ),
+    ]
+    etags = [etag_of(client.get(url, headers=auth_headers))]
+    for method, write_url, body in writes:
+        res = client.request(method, write_url, json=body, headers=auth_headers)
+        assert res.status_code in (200, 201), res.text
+
+        res = client.get(url, headers={**auth_headers, "If-None-Match": etags[-1]})
+        assert res.status_code == 200, write_url
+        etags.append(etag_of(res))
+
+    assert len(set(etags)) == len(etags)
+
+
+def test_multi_statement_transaction_bumps_the_version_once(client, create_pool):
+    query = create_pool()
+    sub_query = query["subQueries"][0]
+    apartments = [apartment["guid"] for apartment in sub_query["input_apartments"]]
+
+    async def write():
+        async with async_session() as db:
+            before = await QueryRepository.get_version(db, query["guid"])
+            await db.commit()
+            async with db.begin():
+                await db.execute(update(Apartment).where(Apartment.guid == apartments[0]).values(price=1))
+                await db.execute(update(Apartment).where(Apartment.guid.in_(apartments)).values(m2price=2))
+                await db.execute(update(SubQuery).where(SubQuery.guid == sub_query["guid"]).values(rooms=5))
+                await db.execute(delete(Apartment).where(Apartment.guid == apartments[-1]))
+            after = await QueryRepository.get_version(db, query["guid"])
+            return before, after
+
+    before, after = client.portal.call(write)
+    assert after == before + 1
@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.future import select
+
+from app.database.connection import engine
+from app.database.tables import Query
+from app.repositories import QueryRepository
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def explain(filters: dict) -> list[dict]:
+    query = QueryRepository._filter(
+        select(Query.guid),
+        start=None,
+        end=None,
+        segment=filters.get("segment", []),
+        walls=filters.get("walls", []),
+        floors_min=filters.get("floors_min"),
+        floors_max=filters.get("floors_max"),
+    )
+    compiled = query.compile(
+        dialect=postgresql.dialect(paramstyle="named"), compile_kwargs={"render_postcompile": True}
+    )
+    async with engine.connect() as connection:
+        await connection.execute(text("analyze apartment"))
+        await connection.execute(text("analyze sub_query"))
+        await connection.execute(text("set local enable_seqscan = off"))
+        res = await connection.execute(text(f"explain (format json) {compiled}"), compiled.params)
+        return list(plan_nodes(res.scalar()[0]["Plan"]))
+
+
+@pytest.mark.parametrize(
+    "filters, column",
+    [
+        ({"segment": ["новостройка"]}, "segment"),
+        ({"walls": ["панель", "монолит"]}, "walls"),
+        ({"floors_min": 12}, "floors"),
+        ({"floors_min": 11, "floors_max": 13}, "floors"),
+    ],
+)
+def test_apartment_filters_use_the_filter_indexes(client, create_pool, filters, column):
+    create_pool(200)
+
+    nodes = client.portal.call(explain, filters)
+
+    index_conds = {node["Index Name"]: node.get("Index Cond", "") for node in nodes if "Index Name" in node}
+    assert column in index_conds[f"ix_apartment_input_apartments_guid_{column}"]
+    assert not any(node["Node Type"] == "Seq Scan" for node in nodes)
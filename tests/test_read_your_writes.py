@@ -0,0 +1,54 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from jose import jwt
+from starlette.requests import Request
+
+from app.config import config
+from app.database import connection
+from app.models import Principal
+
+
+@pytest.fixture(autouse=True)
+def last_writes(monkeypatch):
+    monkeypatch.setattr(connection, "_last_writes", {})
+
+
+def token(sub: uuid.UUID) -> str:
+    claims = {"sub": str(sub), "jti": str(uuid.uuid4()), "exp": datetime.utcnow() + timedelta(minutes=5)}
+    return jwt.encode(claims, config.BACKEND_JWT_SECRET, algorithm=config.BACKEND_JWT_ALGORITHM)
+
+
+def request(method: str, authorization: str = None) -> Request:
+    headers = [(b"authorization", authorization.encode())] if authorization else []
+    return Request({"type": "http", "method": method, "headers": headers})
+
+
+def test_writes_are_tracked_per_user_across_tokens():
+    user, other = uuid.uuid4(), uuid.uuid4()
+
+    connection._mark_write(request("POST", f"Bearer {token(user)}"))
+
+    assert connection._wrote_recently(request("GET", f"Bearer {token(user)}"))
+    assert not connection._wrote_recently(request("GET", f"Bearer {token(other)}"))
+    assert not connection._wrote_recently(request("GET"))
+
+
+def test_verified_principal_is_preferred_over_the_header():
+    user = uuid.uuid4()
+    write = request("PATCH", "Bearer not-a-jwt")
+    write.state.principal = Principal(sub=user, jti=None, exp=datetime.utcnow() + timedelta(minutes=5))
+
+    connection._mark_write(write)
+
+    assert connection._wrote_recently(request("GET", f"Bearer {token(user)}"))
+    assert connection._writer(request("GET", "Bearer not-a-jwt")) is None
+
+
+def test_reads_do_not_count_as_writes():
+    user = uuid.uuid4()
+
+    connection._mark_write(request("GET", f"Bearer {token(user)}"))
+
+    assert not connection._wrote_recently(request("GET", f"Bearer {token(user)}"))
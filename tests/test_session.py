@@ -0,0 +1,23 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import config
+
+
+def test_logout_is_committed_before_the_response(client, auth_headers):
+    res = client.post(f"{config.BACKEND_PREFIX}/logout", headers=auth_headers)
+
+    assert res.status_code == 204
+    assert client.get(f"{config.BACKEND_PREFIX}/query", headers=auth_headers).status_code == 401
+
+
+def test_failed_commit_returns_server_error(client, auth_headers, monkeypatch):
+    async def commit(self):
+        raise ConnectionResetError("connection lost during commit")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(AsyncSession, "commit", commit)
+        res = client.post(f"{config.BACKEND_PREFIX}/logout", headers=auth_headers)
+
+    assert res.status_code == 500
+    assert res.json()["message"] == "Ошибка выхода из системы"
+    assert client.get(f"{config.BACKEND_PREFIX}/query", headers=auth_headers).status_code == 200
@@ -0,0 +1,81 @@
+import socket
+
+import pytest
+from moto.server import ThreadedMotoServer
+
+from app.config import config
+from app.storage import files
+from app.storage.s3 import S3Storage
+
+PART_SIZE = 5 * 1024 * 1024
+
+
+@pytest.fixture
+def s3_endpoint(monkeypatch):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=port, verbose=False)
+    server.start()
+    monkeypatch.setattr(config, "STORAGE_REGION", "us-east-1")
+    monkeypatch.setattr(config, "STORAGE_ENDPOINT", f"http://127.0.0.1:{port}")
+    monkeypatch.setattr(config, "STORAGE_MULTIPART_THRESHOLD", PART_SIZE)
+    monkeypatch.setattr(config, "STORAGE_MULTIPART_CHUNK_SIZE", PART_SIZE)
+    yield config.STORAGE_ENDPOINT
+    server.stop()
+
+
+@pytest.fixture
+async def storage(s3_endpoint):
+    storage = S3Storage()
+    await storage.open()
+    await storage.client.create_bucket(Bucket=config.STORAGE_BUCKET_NAME)
+    yield storage
+    await storage.close()
+
+
+@pytest.mark.anyio
+async def test_small_body_is_uploaded_in_one_request(storage):
+    await storage.upload("input/small.xlsx", b"small")
+
+    res = await storage.client.get_object(Bucket=config.STORAGE_BUCKET_NAME, Key="input/small.xlsx")
+    assert await res["Body"].read() == b"small"
+
+
+@pytest.mark.anyio
+async def test_large_body_is_uploaded_in_parts(storage):
+    body = bytes(range(256)) * (PART_SIZE * 2 // 256) + b"tail"
+
+    await storage.upload("export/large.xlsx", body)
+
+    res = await storage.client.get_object(Bucket=config.STORAGE_BUCKET_NAME, Key="export/large.xlsx")
+    assert await res["Body"].read() == body
+    assert res["ETag"].strip('"').endswith("-3")
+
+
+@pytest.mark.anyio
+async def test_failed_part_aborts_multipart_upload(storage, monkeypatch):
+    upload_part = files._upload_part
+    aborted = []
+
+    async def failing_upload_part(client, key, upload_id, number, chunk):
+        if number == 2:
+            raise ConnectionError("part upload failed")
+        return await upload_part(client, key, upload_id, number, chunk)
+
+    async def abort_multipart_upload(**kwargs):
+        aborted.append(kwargs["UploadId"])
+        return await client_abort(**kwargs)
+
+    client_abort = storage.client.abort_multipart_upload
+    monkeypatch.setattr(files, "_upload_part", failing_upload_part)
+    monkeypatch.setattr(storage.client, "abort_multipart_upload", abort_multipart_upload)
+
+    with pytest.raises(ConnectionError):
+        await storage.upload("export/failed.xlsx", b"x" * (PART_SIZE * 3))
+
+    uploads = await storage.client.list_multipart_uploads(Bucket=config.STORAGE_BUCKET_NAME)
+    assert len(aborted) == 1
+    assert not uploads.get("Uploads")
+    with pytest.raises(storage.client.exceptions.NoSuchKey):
+        await storage.client.get_object(Bucket=config.STORAGE_BUCKET_NAME, Key="export/failed.xlsx")
@@ -0,0 +1,58 @@
+import os
+import time
+
+import pytest
+from sqlalchemy import func, select, text
+
+from app.config import config
+from app.services.storage import STORAGE_SWEEPER_LOCK_ID, StorageService
+from app.storage import LocalStorage
+
+
+@pytest.fixture
+async def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "STORAGE_LOCAL_DIRECTORY", str(tmp_path))
+    storage = LocalStorage()
+    await storage.upload("export/stale.xlsx", b"stale")
+    await storage.upload("export/fresh.xlsx", b"fresh")
+    stale = time.time() - (config.STORAGE_GC_EXPORT_RETENTION_HOURS + 1) * 3600
+    os.utime(storage.path("export/stale.xlsx"), (stale, stale))
+    return storage
+
+
+@pytest.mark.anyio
+async def test_sweep_deletes_without_an_open_transaction(database, storage, monkeypatch):
+    states = []
+    delete = storage.delete
+
+    async def observed_delete(keys):
+        async with database.connect() as connection:
+            res = await connection.execute(
+                text(
+                    "select a.state from pg_locks l join pg_stat_activity a using (pid) "
+                    "where l.locktype = 'advisory' and l.objid = :lock_id and l.granted"
+                ),
+                {"lock_id": STORAGE_SWEEPER_LOCK_ID},
+            )
+            states.extend(res.scalars())
+        await delete(keys)
+
+    monkeypatch.setattr(storage, "delete", observed_delete)
+
+    assert await StorageService.sweep(storage) == 1
+    assert states == ["idle"]
+    assert not storage.path("export/stale.xlsx").exists()
+    assert storage.path("export/fresh.xlsx").exists()
+
+
+@pytest.mark.anyio
+async def test_sweep_skips_when_another_worker_holds_the_lock(database, storage):
+    async with database.connect() as connection:
+        await connection.execute(select(func.pg_advisory_lock(STORAGE_SWEEPER_LOCK_ID)))
+        try:
+            assert await StorageService.sweep(storage) == 0
+        finally:
+            await connection.execute(select(func.pg_advisory_unlock(STORAGE_SWEEPER_LOCK_ID)))
+
+    assert storage.path("export/stale.xlsx").exists()
+    assert await StorageService.sweep(storage) == 1